@@ -0,0 +1,326 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+# Columns of the table returned by statistics
+STATISTICS_COLUMNS = ['min', 'max', 'mean', 'std', 'rms', 'missing']
+
+
+def statistics(labels, series):
+    """Return a table with the minimum, maximum, mean, standard deviation, RMS and
+    number of missing values of each series, with a row for each label. Anything
+    that cannot be treated as a number counts as missing.
+
+    Series of the same length, such as the columns of a single file, are stacked
+    into one array so that each statistic is computed for all of them at once."""
+
+    arrays = [np.asarray(pd.to_numeric(values, errors='coerce'), dtype=float)
+              for values in series]
+    if not arrays: return pd.DataFrame(columns=STATISTICS_COLUMNS)
+
+    # Stack the series if possible, otherwise treat each one as its own stack
+    if len(set(len(array) for array in arrays)) == 1:
+        stacks = [np.vstack(arrays)]
+    else:
+        stacks = [array.reshape(1, -1) for array in arrays]
+
+    rows = []
+    for stack in stacks:
+        # Series that are entirely missing produce NaN without warning about it
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            rows.append(np.column_stack([
+                np.nanmin(stack, axis=1) if stack.shape[1] else np.full(len(stack), np.nan),
+                np.nanmax(stack, axis=1) if stack.shape[1] else np.full(len(stack), np.nan),
+                np.nanmean(stack, axis=1),
+                np.nanstd(stack, axis=1),
+                np.sqrt(np.nanmean(stack ** 2, axis=1)),
+                np.isnan(stack).sum(axis=1),
+            ]))
+
+    table = pd.DataFrame(np.vstack(rows), index=labels, columns=STATISTICS_COLUMNS)
+    table['missing'] = table['missing'].astype(int)
+    return table
+
+
+def _rolling(values, window, ufunc, fill):
+    """Apply the ufunc (np.maximum or np.minimum) over a trailing window of the
+    specified number of samples, so that each result covers the current sample
+    and the window-1 samples before it. Samples without a complete window are NaN.
+
+    Uses the van Herk/Gil-Werman algorithm: the data is split into blocks the
+    size of the window, and each window spans the end of one block and the start
+    of the next. Combining a running result from the start of each block with a
+    running result from the end of each block takes three passes over the data,
+    regardless of the size of the window."""
+
+    values = np.asarray(values, dtype=float)
+    length = len(values)
+    result = np.full(length, np.nan)
+    if window < 1 or window > length: return result
+
+    # Missing values should never be picked, so replace them with the fill value
+    clean = np.where(np.isnan(values), fill, values)
+
+    # Pad the data to a whole number of blocks
+    blocks = -(-length // window)
+    padded = np.full(blocks * window, fill)
+    padded[:length] = clean
+    padded = padded.reshape(blocks, window)
+
+    # Accumulate from the start and from the end of each block
+    prefix = ufunc.accumulate(padded, axis=1).ravel()
+    suffix = ufunc.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    # Each window combines the end of one block with the start of the next
+    result[window-1:] = ufunc(suffix[:length-window+1], prefix[window-1:length])
+
+    # Windows that only held missing values are left missing
+    result[result == fill] = np.nan
+    return result
+
+
+def rolling_max(values, window):
+    """Return the maximum of each trailing window of the specified number of
+    samples as a float array, which is NaN where the window is incomplete."""
+
+    return _rolling(values, window, np.maximum, -np.inf)
+
+
+def rolling_min(values, window):
+    """Return the minimum of each trailing window of the specified number of
+    samples as a float array, which is NaN where the window is incomplete."""
+
+    return _rolling(values, window, np.minimum, np.inf)
+
+
+def _windowed(x, values, lag, ufunc, fill):
+    """Apply the ufunc (np.maximum or np.minimum) over a trailing window that spans
+    the specified distance along x, so that each result covers every sample whose
+    x-value lies within lag of the current sample's. Samples whose window would
+    reach back past the start of the data are NaN, as are samples without an
+    x-value.
+
+    The start of every window is found at once with a binary search over the
+    sorted x-values, which is the vectorized equivalent of sweeping a trailing
+    pointer along the data. Evenly sampled data is then handed to the rolling
+    extrema above. Otherwise, the windows are answered with a sparse table that
+    is built one level at a time, each level covering windows twice as long as
+    the last, so only as many levels are built as the longest window needs."""
+
+    x = np.asarray(x, dtype=float)
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(values), np.nan)
+    lag = max(lag, 0)
+
+    # Sort the samples by their x-values, leaving out any that do not have one
+    valid = np.flatnonzero(np.isfinite(x))
+    if not len(valid): return result
+    if np.any(np.diff(x[valid]) < 0):
+        valid = valid[np.argsort(x[valid], kind='mergesort')]
+    xs = x[valid]
+    ys = values[valid]
+
+    # Evenly sampled data has the same number of samples in every window, namely
+    # the samples that lie within lag of the current one, just as below
+    steps = np.diff(xs)
+    if len(steps) and steps[0] > 0 and np.allclose(steps, steps[0]):
+        window = int(np.floor(lag / steps[0] + 1e-9)) + 1
+        extrema = _rolling(ys, window, ufunc, fill)
+    else:
+        # Find the first sample of each sample's window, and the size of the window
+        length = len(xs)
+        ends = np.arange(length)
+        starts = np.searchsorted(xs, xs - lag, side='left')
+        levels = np.floor(np.log2(ends - starts + 1)).astype(int)
+
+        # Each level of the table holds the result over 2**level samples starting
+        # at each position, and every window is covered by two overlapping entries
+        table = np.where(np.isnan(ys), fill, ys)
+        extrema = np.empty(length)
+        for level in range(levels.max() + 1):
+            if level:
+                half = 1 << (level - 1)
+                table = ufunc(table[:-half], table[half:])
+            selected = levels == level
+            extrema[selected] = ufunc(table[starts[selected]],
+                                      table[ends[selected] - (1 << level) + 1])
+
+    # Windows that reach back past the data, or only held missing values, are missing
+    extrema[xs - lag < xs[0]] = np.nan
+    extrema[extrema == fill] = np.nan
+    result[valid] = extrema
+    return result
+
+
+def windowed_max(x, values, lag):
+    """Return the maximum of each trailing window that spans lag along x as a float
+    array, which is NaN where the window is incomplete."""
+
+    return _windowed(x, values, lag, np.maximum, -np.inf)
+
+
+def windowed_min(x, values, lag):
+    """Return the minimum of each trailing window that spans lag along x as a float
+    array, which is NaN where the window is incomplete."""
+
+    return _windowed(x, values, lag, np.minimum, np.inf)
+
+
+# Columns of the table returned by excursions
+EXCURSION_COLUMNS = ['side', 'start', 'end', 'duration', 'peak excursion']
+
+
+def excursions(x, y, plus, minus):
+    """Find every stretch of samples where y rises above the plus band or falls
+    below the minus band, and return them as a table with one row per excursion.
+    Each row holds the side of the band that was crossed, the x-values where the
+    excursion starts and ends, its duration, and the furthest that y went past the
+    band. Samples where y or the band is missing never count as excursions.
+
+    Excursions are found from the edges of a boolean mask, so the cost grows with
+    the number of samples but not with the number of excursions."""
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    tables = []
+    for side, excess in [('above', y - plus), ('below', minus - y)]:
+        # Find where the samples move outside of the band and back inside of it
+        with np.errstate(invalid='ignore'):
+            outside = excess > 0
+        edges = np.diff(np.concatenate(([0], outside.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        if not len(starts): continue
+
+        # Find the largest excess within each excursion; samples between excursions
+        # are zeroed so that they never win
+        peaks = np.maximum.reduceat(np.where(outside, excess, 0), starts)
+
+        tables.append(pd.DataFrame({
+            'side': side,
+            'start': x[starts],
+            'end': x[ends],
+            'duration': x[ends] - x[starts],
+            'peak excursion': peaks,
+        }, columns=EXCURSION_COLUMNS))
+
+    if not tables: return pd.DataFrame(columns=EXCURSION_COLUMNS)
+    return pd.concat(tables).sort_values('start', kind='mergesort') \
+                            .reset_index(drop=True)
+
+
+def align(reference_x, reference_y, x):
+    """Interpolate the reference data onto the specified x-values, so that it can be
+    compared sample-for-sample with data that was recorded on a different grid.
+    Values outside of the reference's x-range are NaN rather than extrapolated."""
+
+    reference_x = np.asarray(reference_x, dtype=float)
+    reference_y = np.asarray(reference_y, dtype=float)
+
+    # Interpolation requires the reference to be sorted and free of missing values
+    valid = np.isfinite(reference_x) & np.isfinite(reference_y)
+    reference_x, reference_y = reference_x[valid], reference_y[valid]
+    if np.any(np.diff(reference_x) < 0):
+        order = np.argsort(reference_x, kind='mergesort')
+        reference_x, reference_y = reference_x[order], reference_y[order]
+
+    if not len(reference_x): return np.full(len(x), np.nan)
+    return np.interp(np.asarray(x, dtype=float), reference_x, reference_y,
+                     left=np.nan, right=np.nan)
+
+
+def envelope(x, reference, plus, minus, lag):
+    """Return the upper and lower bounds of the tolerance envelope around the
+    reference, which is built the same way as the tolerance bands of a series."""
+
+    upper = windowed_max(x, reference, lag) + plus
+    lower = windowed_min(x, reference, lag) - minus
+    return upper, lower
+
+
+def estimate_lag(x, command, response):
+    """Estimate how far along x the response lags behind the command, using the
+    peak of their cross-correlation. A negative lag means that the response leads.
+
+    Both series are first interpolated onto an evenly spaced grid, since the
+    correlation is computed with FFTs, which take O(n log n) time instead of the
+    O(n^2) of correlating directly. Returns None if there is not enough data."""
+
+    x = np.asarray(x, dtype=float)
+    command = np.asarray(command, dtype=float)
+    response = np.asarray(response, dtype=float)
+
+    # Only use the samples where everything is present, sorted by x
+    valid = np.isfinite(x) & np.isfinite(command) & np.isfinite(response)
+    x, command, response = x[valid], command[valid], response[valid]
+    if np.any(np.diff(x) < 0):
+        order = np.argsort(x, kind='mergesort')
+        x, command, response = x[order], command[order], response[order]
+    if len(x) < 2: return None
+
+    # Resample onto an even grid with the data's typical spacing
+    steps = np.diff(x)
+    step = np.median(steps[steps > 0]) if np.any(steps > 0) else 0
+    if not step: return None
+    grid = np.arange(x[0], x[-1] + step / 2, step)
+    command = np.interp(grid, x, command)
+    response = np.interp(grid, x, response)
+
+    # Remove the means so that the offsets between the series do not dominate
+    command -= command.mean()
+    response -= response.mean()
+
+    # Correlate with zero padding, so that the correlation does not wrap around
+    length = len(grid)
+    size = 1 << int(2 * length - 1).bit_length()
+    correlation = np.fft.irfft(np.fft.rfft(response, size) *
+                               np.conj(np.fft.rfft(command, size)), size)
+
+    # The second half of the correlation holds the negative lags
+    shifts = np.arange(size)
+    shifts[shifts > size // 2] -= size
+    return float(shifts[np.argmax(correlation)] * step)
+
+
+def exceedance(x, y, value):
+    """Return statistics on how y behaves relative to a horizontal limit: the number
+    of times it crosses the limit, the total distance along x that it spends above
+    and below the limit, and the longest single stretch that it spends above and
+    below the limit. Each sample is taken to hold its value until the next sample.
+    Missing samples are neither above nor below the limit."""
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Determine which side of the limit each sample is on
+    with np.errstate(invalid='ignore'):
+        side = np.sign(y - value)
+    side[np.isnan(side)] = 0
+
+    # Count the changes of side, skipping samples that are on the limit or missing
+    sides = side[side != 0]
+    crossings = int(np.count_nonzero(sides[1:] != sides[:-1]))
+
+    # Each sample lasts until the next one
+    steps = np.diff(x)
+    steps[~np.isfinite(steps)] = 0
+
+    statistics = {'crossings': crossings}
+    for name, which in [('above', 1), ('below', -1)]:
+        inside = side[:-1] == which
+        durations = np.where(inside, steps, 0)
+        statistics[f'time {name}'] = float(durations.sum())
+
+        # Sum the durations within each stretch from the edges of the mask
+        edges = np.diff(np.concatenate(([0], inside.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        totals = np.concatenate(([0], np.cumsum(durations)))
+        stretches = totals[ends] - totals[starts]
+        statistics[f'longest {name}'] = float(stretches.max()) if len(stretches) else 0.0
+
+    return statistics
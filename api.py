@@ -0,0 +1,276 @@
+from types import SimpleNamespace
+
+import configobj
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import interaction
+import parsing
+import styles
+from basicplot import BasicPlot
+from peakvalleyplot import PeakValleyPlot
+
+
+# The types of files that can be loaded
+TYPES = ['Basic', 'Peak Valley']
+
+
+class BasicSource:
+    """A basic data file along with the plots that are defined on it. Reads the
+    file and generates the plots without any widgets, so that it can be used from
+    scripts, benchmarks and worker processes as well as by the basic file tabs."""
+
+    def __init__(self, filepath, label_row=1, data_start=2, unit_row=None):
+        """Store where the labels, data and units are within the file."""
+
+        self.filepath = filepath
+        self.filename = filepath.split('/')[-1]
+        self.label_row = label_row
+        self.data_start = data_start
+        self.unit_row = unit_row
+
+        # Initialize the contents of the file, which are filled in when it is read
+        self.kind = None
+        self.labels = None
+        self.units = None
+        self.data = None
+
+        # Keep track of the plots along with the columns and labels of each one
+        self.definitions = []
+        self.plots = []
+
+    def add_plot(self, x_column, y1_columns, y2_columns=None, title=None,
+                 x_label=None, y1_label=None, y2_label=None, plot=None):
+        """Define a plot of the file and return it. Columns are numbered from 1.
+        The plot has no data until the file is generated. An existing plot can be
+        passed in to keep its settings, otherwise a new plot is created."""
+
+        self.definitions.append({
+            'x_column': x_column,
+            'y1_columns': y1_columns,
+            'y2_columns': y2_columns,
+            'title': title,
+            'x_label': x_label,
+            'y1_label': y1_label,
+            'y2_label': y2_label,
+        })
+        if plot is None: plot = BasicPlot()
+        self.plots.append(plot)
+        return plot
+
+    def read(self):
+        """Read the labels, units and data of the file."""
+
+        self.kind = parsing.filetype(self.filepath)
+        self.labels = parsing.labels(self.filepath, self.kind, self.label_row)
+        self.units = parsing.units(self.filepath, self.kind, self.unit_row)
+        self.data = parsing.data(self.filepath, self.kind, self.data_start,
+                                 self.labels)
+
+    def generate(self):
+        """Pass each plot its data, reading the file first if it hasn't been read
+        yet."""
+
+        if self.data is None: self.read()
+        for plot, definition in zip(self.plots, self.definitions):
+            plot.generate(self.data, self.labels, units=self.units, **definition)
+
+
+class PeakValleySource:
+    """A peak valley file along with the plots that are defined on its sections,
+    which can be read and generated without any widgets."""
+
+    def __init__(self, filepath, delimiter=',', convert=False, zero=False,
+                 split=False, valley=None, peak=None):
+        """Store how the file is delimited and how its plots are processed. The
+        valley and peak criteria are lists of one number (a threshold) or two
+        numbers (a range), or None to skip determining failures."""
+
+        self.filepath = filepath
+        self.filename = filepath.split('/')[-1]
+        self.delimiter = delimiter
+        self.options = {'convert': convert, 'zero': zero, 'split': split,
+                        'valley': valley, 'peak': peak}
+
+        # Initialize the sections of the file, which are filled in when it is read
+        self.sections = None
+
+        # Keep track of the plots along with the section and columns of each one
+        self.definitions = []
+        self.plots = []
+
+    def add_plot(self, section, counter, label_row, x_column, y_column,
+                 unit_row=None, plot=None):
+        """Define a plot of one of the file's sections and return it. Sections,
+        rows and columns are numbered from 1. The plot has no data until the file
+        is generated. An existing plot can be passed in to keep its settings,
+        otherwise a new plot is created."""
+
+        self.definitions.append({
+            'section': section,
+            'counter': counter,
+            'label_row': label_row,
+            'x_column': x_column,
+            'y_column': y_column,
+            'unit_row': unit_row,
+        })
+        if plot is None: plot = PeakValleyPlot()
+        self.plots.append(plot)
+        return plot
+
+    def read(self):
+        """Read the file and split it into its sections."""
+
+        self.sections = parsing.sections(self.filepath, self.delimiter)
+
+    def generate(self):
+        """Pass each plot its section, reading the file first if it hasn't been
+        read yet."""
+
+        if self.sections is None: self.read()
+        for plot, definition in zip(self.plots, self.definitions):
+            definition = dict(definition)
+            section = self.sections[definition.pop('section')-1]
+            plot.generate(section, **definition, **self.options)
+
+
+def preset_source(info):
+    """Return a source for a file's section of a preset, with a plot for each of
+    its plot subsections."""
+
+    definitions = [value for value in info.values()
+                   if isinstance(value, configobj.Section)]
+
+    if info['type'] == 'Basic':
+        unit_row = int(info['unit row']) if info['unit row'] else None
+        source = BasicSource(info['filepath'], int(info['label row']),
+                             int(info['data start']), unit_row)
+        for definition in definitions:
+            source.add_plot(int(definition['x column']),
+                            parsing.columns(definition['y1 columns']),
+                            parsing.columns(definition['y2 columns']),
+                            definition['title'], definition['x label'],
+                            definition['y1 label'], definition['y2 label'])
+
+    elif info['type'] == 'Peak Valley':
+        source = PeakValleySource(info['filepath'],
+                                  parsing.delimiter_character(info['delimiter']),
+                                  convert=info.as_bool('convert'),
+                                  zero=info.as_bool('zero'),
+                                  split=info.as_bool('split'),
+                                  valley=parsing.criteria(info['valley maximum']),
+                                  peak=parsing.criteria(info['peak minimum']))
+        for definition in definitions:
+            source.add_plot(int(definition['section']), definition['counter'],
+                            int(definition['label row']),
+                            int(definition['x column']),
+                            int(definition['y column']),
+                            parsing.unit_row(definition['unit row']))
+
+    else:
+        raise ValueError(f'{info["type"]} is not a valid type')
+
+    return source
+
+
+def analyze(plot):
+    """Return the analysis of a generated plot: a table of the statistics of each
+    series of a basic plot, or the pass/fail summary of a peak valley plot."""
+
+    if isinstance(plot, PeakValleyPlot): return plot.summary()
+    return plot.statistics
+
+
+class Label:
+    """Stands in for the flipbook's filename label, which plots set the text of."""
+
+    def __init__(self):
+        self.text = ''
+
+    def get(self):
+        return self.text
+
+    def set(self, text):
+        self.text = text
+
+
+class OffscreenFlipbook:
+    """A flipbook that draws its pages onto an Agg canvas instead of a window. It
+    has the attributes that the plots draw themselves with, so every page looks
+    just as it does in the flipbook."""
+
+    def __init__(self, info, figsize=(12, 7), dpi=100):
+        """Create the figure and list the pages of every source."""
+
+        # Keep track of the plots along with their files and plot numbers
+        self.info = info
+        self.plots = [plot for file in self.info for plot in file.plots]
+        self.files = [f for f, file in enumerate(self.info)
+                      for _ in range(len(file.plots))]
+        self.numbers = [p for f, file in enumerate(self.info)
+                        for p in range(len(file.plots))]
+        self.page = 0
+        self.pages = len(self.plots)
+
+        # Initialize the attributes that the plots expect the flipbook to have
+        self.secondary = None
+        self.background = None
+        self.controls = None
+        self.filename = Label()
+
+        # Create a figure and the primary axis, laid out just like the flipbook's
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.primary = self.figure.add_subplot(111)
+        self.figure.subplots_adjust(top=0.90, bottom=0.15)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.blitter = interaction.Blitter(self.canvas)
+
+    def _coordinates(self, current, other, secondary_exists):
+        """Return the coordinate format for the number of axes."""
+
+        return interaction.coordinates(current, other, secondary_exists)
+
+    def render(self, page, output):
+        """Draw the page with its style, then pass the figure to the output
+        function, e.g. to save the figure."""
+
+        current = self.plots[page]
+        self.page = page
+        self.blitter.reset()
+
+        # Remove the previous page's secondary axis rather than hiding it, so that
+        # they don't pile up in the figure over hundreds of pages
+        if self.secondary:
+            self.figure.delaxes(self.secondary)
+            self.secondary = None
+
+        current.update_plot(self, self.files[page], self.numbers[page])
+        styles.apply(current.style, self.figure)
+        output(self.figure)
+
+    def save(self, page, paths):
+        """Draw the page and save it to each of the paths, whose extensions
+        determine the formats."""
+
+        def output(figure):
+            for path in paths:
+                figure.savefig(path)
+
+        self.render(page, output)
+
+
+def render(plot, figsize=(12, 7), dpi=100):
+    """Draw a generated plot just as the flipbook shows it, and return the figure."""
+
+    info = [SimpleNamespace(filename='', plots=[plot])]
+    flipbook = OffscreenFlipbook(info, figsize=figsize, dpi=dpi)
+    flipbook.render(0, lambda figure: None)
+    return flipbook.figure
+
+
+def save(plot, paths, figsize=(12, 7), dpi=100):
+    """Draw a generated plot just as the flipbook shows it, and save it to each of
+    the paths, whose extensions determine the formats."""
+
+    info = [SimpleNamespace(filename='', plots=[plot])]
+    OffscreenFlipbook(info, figsize=figsize, dpi=dpi).save(0, paths)
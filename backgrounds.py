@@ -0,0 +1,109 @@
+import os
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.image import BboxImage
+from PIL import Image
+
+
+# Decoded images, keyed by (path, modification time)
+_decoded = {}
+# Decoded images that have been scaled to a size, keyed by
+# (path, modification time, width, height)
+_scaled = {}
+
+
+def _modified(path):
+    """Return the modification time of the file, or None if it cannot be found."""
+
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _forget(cache, path):
+    """Remove every entry of the specified path from the cache. This keeps stale
+    copies of an image from piling up after the file is modified on disk."""
+
+    for key in [key for key in cache if key[0] == path]:
+        del(cache[key])
+
+
+def resource(path):
+    """Return the full path of a bundled resource, such as one of the preset
+    backgrounds. The executable unpacks its resources to a temporary folder, so
+    they are found there instead of in the working directory."""
+
+    base = getattr(sys, '_MEIPASS', os.path.abspath('.'))
+    return os.path.join(base, path)
+
+
+def decode(path):
+    """Read and decode the image at the specified path. The decoded image is cached
+    and only read again if the file has been modified since."""
+
+    key = (path, _modified(path))
+    if key not in _decoded:
+        _forget(_decoded, path)
+        image = plt.imread(path)
+        # Images such as PNGs are decoded as floats between 0 and 1; convert them
+        # to 8-bit integers so that every image can be scaled the same way
+        if image.dtype.kind == 'f':
+            image = (np.clip(image, 0, 1) * 255).astype(np.uint8)
+        _decoded[key] = image
+    return _decoded[key]
+
+
+def scale(path, width, height):
+    """Return the image at the specified path scaled to the specified size in
+    pixels. Scaled images are cached per size, so an image is only resampled the
+    first time it is shown at a particular size."""
+
+    key = (path, _modified(path), width, height)
+    if key not in _scaled:
+        _forget(_scaled, path)
+        image = Image.fromarray(decode(path))
+        _scaled[key] = np.asarray(image.resize((width, height), Image.BILINEAR))
+    return _scaled[key]
+
+
+def draw(figure, axis, path, layer=None):
+    """Draw the image at the specified path as a figure-level layer that fills the
+    area of the axis, directly behind it, and return the layer.
+
+    Since the layer belongs to the figure instead of the axis, clearing the axis
+    to redraw the data leaves it alone. The layer is bound to the axis's bounding
+    box rather than to pixel offsets, so it stays in place when the figure is saved
+    at a different dpi. The image is pre-scaled to the size of the axis on screen,
+    so it only needs to be resampled when the figure is drawn at another size. If
+    the layer that is passed in already shows the same image at the same size, it
+    is returned without being redrawn. Passing None as the path, or the path of an
+    image that cannot be found, removes the layer."""
+
+    # With no background selected, remove the current layer if there is one
+    if path is None or _modified(path) is None:
+        if layer is not None: layer.remove()
+        axis.patch.set_visible(True)
+        return None
+
+    # Determine the size of the axis on the figure, in pixels
+    bbox = axis.get_window_extent()
+    width, height = int(round(bbox.width)), int(round(bbox.height))
+    key = (path, _modified(path), width, height)
+
+    # The axis patch would otherwise hide the layer behind it
+    axis.patch.set_visible(False)
+
+    # Reuse the current layer if nothing about it has changed
+    if layer is not None and getattr(layer, 'key', None) == key:
+        return layer
+    if layer is not None: layer.remove()
+
+    # Place the pre-scaled image on the figure within the axis, behind all of the axes
+    layer = BboxImage(axis.bbox, origin='upper', zorder=-1)
+    layer.set_data(scale(path, width, height))
+    figure.add_artist(layer)
+    layer.key = key
+    return layer
@@ -1,31 +1,72 @@
-import math
-import os
 import re
 import tkinter as tk
-from tkinter import filedialog as fd
 from tkinter import messagebox as msg
 from tkinter import ttk
 
 import configobj
 import lemons.gui as gui
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
 
-from controls import (AxisLimits, AxisTicks, GeneralAppearance,
-                      LabelProperties, LimitLines, ToleranceBands)
-from settings import plot_colors
+import api
+import parsing
+import reference
+from basicplot import BasicPlot
+from controls import (AxisLimits, AxisScaling, AxisTicks, Decimation,
+                      GeneralAppearance, LabelProperties, LimitLines,
+                      ReferenceBands, SeriesStatistics, ToleranceBands)
+
+
+# The fields of each row/plot, along with the keys that they are saved under in
+# presets and on the clipboard
+FIELDS = [
+    ('title', 'title'),
+    ('x_column', 'x column'),
+    ('y1_columns', 'y1 columns'),
+    ('y2_columns', 'y2 columns'),
+    ('x_label', 'x label'),
+    ('y1_label', 'y1 label'),
+    ('y2_label', 'y2 label'),
+]
+
+
+class PlotRow:
+    """The fields of a single row/plot of a basic file, stored as the text that was
+    entered. Rows are kept apart from the widgets that show them, so a file can have
+    hundreds of rows while only the ones scrolled into view have any widgets."""
+
+    __slots__ = [attribute for attribute, _ in FIELDS]
+
+    def __init__(self, **values):
+        """Store the fields, leaving out any that aren't specified."""
+
+        for attribute, _ in FIELDS:
+            setattr(self, attribute, values.get(attribute, ''))
+
+    @classmethod
+    def from_section(cls, section):
+        """Create a row from a plot subsection of a preset or from the clipboard,
+        both of which are keyed the same way."""
+
+        return cls(**{attribute: section.get(key) or '' for attribute, key in FIELDS})
+
+    def section(self):
+        """Return the fields keyed the same way as presets and the clipboard."""
+
+        return {key: getattr(self, attribute) for attribute, key in FIELDS}
 
 
 class BasicFile(gui.ScrollableTab):
     """A scrollable notebook tab that supports dynamically creating and deleting basic
-    rows (plots), and stores all of the user-specified information about each plot."""
+    rows (plots), and stores all of the user-specified information about each plot.
+
+    The rows are stored as PlotRow objects, and only the rows that are scrolled into
+    view are shown, each on one of a handful of BasicRow widgets that are reused as
+    the tab scrolls. Loading presets and pasting or clearing every row only changes
+    the stored rows, no matter how many there are."""
 
     def __init__(self, notebook, filepath, app):
         """Initialize the scrollable notebook tab as well as the lists that will hold
-        references to each field in each row. Creates the data start row, label row,
-        and unit row entry fields for the file and adds a single row by default."""
+        each row and the widgets that show them. Creates the data start row, label
+        row, and unit row entry fields for the file and adds a single row by default."""
 
         self.filepath = filepath
         self.filename = self.filepath.split('/')[-1]
@@ -35,16 +76,12 @@ class BasicFile(gui.ScrollableTab):
         self.app = app
         # self.app = self.nametowidget(self.winfo_toplevel())
 
-        # Initialize internal variables and field-reference storage lists
-        self._count = 0
-        self._rows = []
-        self._titles = []
-        self._x_columns = []
-        self._y1_columns = []
-        self._y2_columns = []
-        self._x_labels = []
-        self._y1_labels = []
-        self._y2_labels = []
+        # Initialize the rows, the widgets that show them, and the fields that
+        # failed validation as (row, attribute) pairs
+        self.rows = []
+        self._views = []
+        self._invalid = set()
+        self._row_height = None
 
         # Hold a reference to each row/plot in order to be used outside of the class
         self.plots = []
@@ -81,145 +118,139 @@ class BasicFile(gui.ScrollableTab):
         self.label_row_entry.bind('<FocusIn>', self._scroll_into_view)
         self.unit_row_entry.bind('<FocusIn>', self._scroll_into_view)
 
-        # Add a row/plot by default
-        self.add_row()
-
-    def add_row(self):
-        """Add a row/plot to the current file."""
-
-        # Define padding constants
-        MARGIN = 8
-        TOOLS = 2
-        PADDING = 5
-
-        # Create a label frame that will hold the contents of each row
-        frame = tk.LabelFrame(self, text=f'Plot {self._count + 1}')
-        frame.grid(row=self._count + 1, column=0, padx=MARGIN, pady=(0, MARGIN*2), sticky='NSEW')
-        frame.columnconfigure(0, weight=1)
-
-        # Create a frame that everything else will be placed inside of
-        inner = tk.Frame(frame)
-        inner.grid(row=0, column=0, padx=MARGIN*2, pady=MARGIN*2, sticky='NSEW')
-        inner.columnconfigure(0, weight=1)
-        inner.columnconfigure(1, weight=1)
-        inner.columnconfigure(2, weight=1)
-        inner.columnconfigure(3, weight=10)
-
-        # Create a frame that will hold all of the tools for the row
-        tools = tk.Frame(inner)
-        tools.grid(row=0, column=0, columnspan=4, padx=PADDING, sticky='NSEW')
-        tools.columnconfigure(1, weight=1)
-
-        # Create label and entry fields where the user can enter the title
-        title_label = tk.Label(tools, text='Title:')
-        title_label.grid(row=0, column=0, sticky='NSEW')
-
-        title_entry = ttk.Entry(tools)
-        title_entry.grid(row=0, column=1, padx=PADDING, sticky='NSEW')
-        self._titles.append(title_entry)
-
-        # Create a copy button
-        copy_image = gui.RenderImage('assets\\copy.png', downscale=12)
-        copy_button = ttk.Button(tools, takefocus=0, width=3, image=copy_image, text='C')
-        copy_button['command'] = lambda ID=self._count: self.copy(ID)
-        copy_button.image = copy_image
-        copy_button.grid(row=0, column=2, padx=TOOLS, sticky='NSEW')
-
-        # Create a paste button
-        paste_image = gui.RenderImage('assets\\paste.png', downscale=12)
-        paste_button = ttk.Button(tools, takefocus=0, width=3, image=paste_image, text='P')
-        paste_button['command'] = lambda ID=self._count: self.paste(ID)
-        paste_button.image = paste_image
-        paste_button.grid(row=0, column=3, padx=TOOLS, sticky='NSEW')
-
-        # Create a clear button
-        clear_image = gui.RenderImage('assets\\clear.png', downscale=12)
-        clear_button = ttk.Button(tools, takefocus=0, width=3, image=clear_image, text='X')
-        clear_button['command'] = lambda ID=self._count: self.clear(ID)
-        clear_button.image = clear_image
-        clear_button.grid(row=0, column=4, padx=TOOLS, sticky='NSEW')
-
-        # Add spacing between the tools and the next row of fields
-        gui.Space(inner, row=1, column=0, columnspan=4, padding=PADDING)
-
-        # Create label and entry fields where the user can enter the x-axis columns
-        x_column_label = tk.Label(inner, text='x column:')
-        x_column_label.grid(row=2, column=0, padx=PADDING, sticky='NSEW')
-
-        x_column_entry = ValidatableEntry(inner, width=10)
-        x_column_entry.grid(row=3, column=0, padx=PADDING, sticky='NSEW')
-        self._x_columns.append(x_column_entry)
-
-        # Create label and entry fields where the user can enter the primary axis columns
-        y1_column_label = tk.Label(inner, text='y1 columns:')
-        y1_column_label.grid(row=2, column=1, padx=PADDING, sticky='NSEW')
+        # Read the labels in the background once the label row has been entered
+        self.label_row_entry.bind('<FocusOut>', self.scan, add='+')
 
-        y1_column_entry = ValidatableEntry(inner, width=10)
-        y1_column_entry.grid(row=3, column=1, padx=PADDING, sticky='NSEW')
-        self._y1_columns.append(y1_column_entry)
+        # Create a frame that is as tall as every row put together, which the row
+        # widgets are placed inside of at the positions of the rows they show
+        self.body = tk.Frame(self)
+        self.body.grid(row=1, column=0, sticky='NSEW')
 
-        # Create label and entry fields where the user can enter the secondary axis columns
-        y2_column_label = tk.Label(inner, text='y2 columns:')
-        y2_column_label.grid(row=2, column=2, padx=PADDING, sticky='NSEW')
-
-        y2_column_entry = ValidatableEntry(inner, width=10)
-        y2_column_entry.grid(row=3, column=2, padx=PADDING, sticky='NSEW')
-        self._y2_columns.append(y2_column_entry)
+        # Lay out the rows whenever the canvas scrolls or is resized, after passing
+        # the new position along to the scrollbar as usual
+        self._scrollbar = self.tk.splitlist(str(self.canvas['yscrollcommand']))
+        self.canvas['yscrollcommand'] = self._scrolled
 
-        # Create label and entry fields where the user can enter the x-axis label
-        x_axis_label = tk.Label(inner, text='x axis label:')
-        x_axis_label.grid(row=2, column=3, padx=PADDING, sticky='NSEW')
-
-        x_axis_entry = ttk.Entry(inner)
-        x_axis_entry.grid(row=3, column=3, padx=PADDING, sticky='NSEW')
-        self._x_labels.append(x_axis_entry)
-
-        # Add spacing between the first and second rows of fields
-        gui.Space(inner, row=4, column=0, columnspan=4, padding=PADDING)
-
-        # Create label and entry fields where the user can enter the primary axis label
-        y1_axis_label = tk.Label(inner, text='y1 axis label:')
-        y1_axis_label.grid(row=5, column=0, columnspan=3, padx=PADDING, sticky='NSEW')
+        # Add a row/plot by default
+        self.add_row()
 
-        y1_axis_entry = ttk.Entry(inner)
-        y1_axis_entry.grid(row=6, column=0, columnspan=3, padx=PADDING, sticky='NSEW')
-        self._y1_labels.append(y1_axis_entry)
+    @property
+    def _count(self):
+        """The number of rows/plots in the file."""
 
-        # Create label and entry fields where the user can enter the secondary axis label
-        y2_axis_label = tk.Label(inner, text='y2 axis label:')
-        y2_axis_label.grid(row=5, column=3, padx=PADDING, sticky='NSEW')
+        return len(self.rows)
 
-        y2_axis_entry = ttk.Entry(inner)
-        y2_axis_entry.grid(row=6, column=3, padx=PADDING, sticky='NSEW')
-        self._y2_labels.append(y2_axis_entry)
+    def add_row(self):
+        """Add a row/plot to the current file."""
 
-        # Make each field scroll into view upon a focus event
-        title_entry.bind('<FocusIn>', self._scroll_into_view)
-        x_column_entry.bind('<FocusIn>', self._scroll_into_view)
-        y1_column_entry.bind('<FocusIn>', self._scroll_into_view)
-        y2_column_entry.bind('<FocusIn>', self._scroll_into_view)
-        x_axis_entry.bind('<FocusIn>', self._scroll_into_view)
-        y1_axis_entry.bind('<FocusIn>', self._scroll_into_view)
-        y2_axis_entry.bind('<FocusIn>', self._scroll_into_view)
-
-        # Increment the row count, keep a reference to the frame, and create a plot object
-        self._count += 1
-        self._rows.append(frame)
+        # Add an empty row along with a plot object, then show it if it's in view
+        self.rows.append(PlotRow())
         self.add_plot()
+        self._resize()
 
     def delete_row(self):
         """Delete a row/plot from the bottom of the current file."""
 
         # Only allow a row/plot to be deleted if there is more than one row/plot
-        if len(self._rows) <= 1: return
+        if len(self.rows) <= 1: return
 
-        # Destroy the last row, removing it from the GUI
-        self._rows[-1].destroy()
-        # Delete references to the deleted row/plot
-        del(self._rows[-1])
+        # Delete the last row/plot, along with any fields of it that were invalid
+        del(self.rows[-1])
         del(self.plots[-1])
-        # Decrement the row/plot count
-        self._count -= 1
+        self._invalid = {(row, attribute) for row, attribute in self._invalid
+                         if row < len(self.rows)}
+        self._resize()
+
+    def _measure(self):
+        """Create the first row widget and measure it, since every row is the same
+        size."""
+
+        view = BasicRow(self.body, self)
+        view['text'] = 'Plot 1'
+        self._views.append(view)
+        view.update_idletasks()
+        self._row_height = view.winfo_reqheight() + BasicRow.MARGIN*2
+        self.body.configure(width=view.winfo_reqwidth() + BasicRow.MARGIN*2)
+
+    def _resize(self):
+        """Make the frame tall enough for every row, then lay out the visible rows."""
+
+        if self._row_height is None: self._measure()
+        self.body.configure(height=len(self.rows) * self._row_height)
+        self._layout()
+
+    def _redraw(self):
+        """Show the rows again after they were changed without their widgets."""
+
+        for view in self._views: view.row = None
+        self._resize()
+
+    def _visible(self):
+        """Return the range of rows that are at least partly scrolled into view."""
+
+        height = max(self.canvas.winfo_height(), self.canvas.winfo_reqheight())
+        top = self.canvas.canvasy(0) - self.body.winfo_y()
+        first = max(int(top // self._row_height), 0)
+        last = min(int((top + height) // self._row_height), len(self.rows) - 1)
+        return range(first, last + 1)
+
+    def _layout(self):
+        """Show each visible row on a row widget, keeping the rows that are already
+        shown where they are and reusing the widgets of the rows that aren't."""
+
+        if self._row_height is None: return
+        visible = self._visible()
+        shown = {view.row: view for view in self._views if view.row in visible}
+        free = [view for view in self._views if view.row not in shown]
+
+        # Only create another row widget when there aren't any left to reuse
+        for row in visible:
+            if row in shown: continue
+            if free:
+                view = free.pop()
+            else:
+                view = BasicRow(self.body, self)
+                self._views.append(view)
+            self._show(view, row)
+
+        # Hide the widgets that aren't needed anymore
+        for view in free:
+            view.row = None
+            view.close()
+            view.place_forget()
+
+    def _show(self, view, row):
+        """Show the row on the row widget, at the row's position."""
+
+        view.row = row
+        view['text'] = f'Plot {row + 1}'
+        for attribute, _ in FIELDS:
+            view.variables[attribute].set(getattr(self.rows[row], attribute))
+        for attribute, entry in view.columns.items():
+            if (row, attribute) in self._invalid: entry.set_invalid()
+            else: entry.set_valid()
+        view.place(x=BasicRow.MARGIN, y=row * self._row_height,
+                   relwidth=1, width=-BasicRow.MARGIN*2)
+
+    def _scrolled(self, first, last):
+        """Update the scrollbar and lay out the rows that scrolled into view."""
+
+        if self._scrollbar: self.tk.call(*self._scrollbar, first, last)
+        self._layout()
+
+    def _scroll_to(self, row):
+        """Scroll just far enough for the row to be completely in view."""
+
+        top = self.body.winfo_y() + row * self._row_height
+        bottom = top + self._row_height
+        canvas_top = self.canvas.canvasy(0)
+        canvas_height = self.canvas.winfo_height()
+        total = max(self.winfo_height(), 1)
+        if top < canvas_top:
+            self.canvas.yview_moveto(top / total)
+        elif bottom > canvas_top + canvas_height:
+            self.canvas.yview_moveto((bottom - canvas_height) / total)
+        self._layout()
 
     def _scroll_into_view(self, event):
         """Scrolls the bound widget into view instead of only moving focus offscreen."""
@@ -244,68 +275,48 @@ class BasicFile(gui.ScrollableTab):
 
     def switch_row(self, event, direction, master):
 
-        # Create a list that contains all possible fields contained in each row
-        fields = [self._titles, self._x_columns,
-                  self._y1_columns, self._y2_columns,
-                  self._x_labels, self._y1_labels, self._y2_labels]
-
-        # Iterate through the list and find the widget that currently has focus,
-        # then store which entry it is as well as the row that it's in
-        for f, field in enumerate(fields):
-            for i, item in enumerate(field):
-                if item == master.focus_get():
-                    entry = f
-                    row = i
-                    break # Once the field is found, break from the loop
-            else:
-                continue # Continue if the inner loop was not broken
-            break # If the inner loop was broken, break from the outer loop
-        else:
-            # If the widget was not found, exit this method. This is intended
-            # to happen with the data start, label, and unit row entries.
-            return
+        # Find the row widget and field that currently has focus. If it wasn't
+        # found, exit this method. This is intended to happen with the data start,
+        # label, and unit row entries.
+        focus = master.focus_get()
+        found = [(view.row, attribute) for view in self._views
+                 for attribute, entry in view.entries.items()
+                 if view.row is not None and entry == focus]
+        if not found: return
+        row, attribute = found[0]
 
         # Get the index of the row that the user wants to go to
         destination = (row + 1) if direction == 'next' else (row - 1)
 
-        # If the row exists, find the relevant widget and set focus on it
-        if destination in range(len(fields[entry])):
-            next_widget = fields[entry][destination]
-            next_widget.focus_set()
+        # If the row exists, scroll it into view and set focus on the same field
+        if destination in range(len(self.rows)):
+            self._scroll_to(destination)
+            for view in self._views:
+                if view.row == destination:
+                    view.entries[attribute].focus_set()
 
     def copy(self, ID):
         """Copies the contents of the selected row to the clipboard."""
 
-        self.app.clipboard['title'] = self._titles[ID].get()
-        self.app.clipboard['x column'] = self._x_columns[ID].get()
-        self.app.clipboard['y1 columns'] = self._y1_columns[ID].get()
-        self.app.clipboard['y2 columns'] = self._y2_columns[ID].get()
-        self.app.clipboard['x label'] = self._x_labels[ID].get()
-        self.app.clipboard['y1 label'] = self._y1_labels[ID].get()
-        self.app.clipboard['y2 label'] = self._y2_labels[ID].get()
+        self.app.clipboard.update(self.rows[ID].section())
 
     def paste(self, ID):
         """Pastes the contents of the clipboards into the selected row."""
 
-        self.clear(ID)
-        self._titles[ID].insert(0, self.app.clipboard['title'])
-        self._x_columns[ID].insert(0, self.app.clipboard['x column'])
-        self._y1_columns[ID].insert(0, self.app.clipboard['y1 columns'])
-        self._y2_columns[ID].insert(0, self.app.clipboard['y2 columns'])
-        self._x_labels[ID].insert(0, self.app.clipboard['x label'])
-        self._y1_labels[ID].insert(0, self.app.clipboard['y1 label'])
-        self._y2_labels[ID].insert(0, self.app.clipboard['y2 label'])
+        self.rows[ID] = PlotRow.from_section(self.app.clipboard)
+        self._redraw()
+
+    def paste_all(self):
+        """Pastes the contents of the clipboard into every row."""
+
+        self.rows = [PlotRow.from_section(self.app.clipboard) for _ in self.rows]
+        self._redraw()
 
     def clear(self, ID):
         """Clears the contents of the selected row."""
 
-        self._titles[ID].delete(0, 'end')
-        self._x_columns[ID].delete(0, 'end')
-        self._y1_columns[ID].delete(0, 'end')
-        self._y2_columns[ID].delete(0, 'end')
-        self._x_labels[ID].delete(0, 'end')
-        self._y1_labels[ID].delete(0, 'end')
-        self._y2_labels[ID].delete(0, 'end')
+        self.rows[ID] = PlotRow()
+        self._redraw()
 
     def clear_all(self, delete_header=True):
         """Clear the contents of every field."""
@@ -315,14 +326,8 @@ class BasicFile(gui.ScrollableTab):
             self.data_row_entry.delete(0, 'end')
             self.label_row_entry.delete(0, 'end')
             self.unit_row_entry.delete(0, 'end')
-        for row in range(len(self._rows)):
-            self._titles[row].delete(0, 'end')
-            self._x_columns[row].delete(0, 'end')
-            self._y1_columns[row].delete(0, 'end')
-            self._y2_columns[row].delete(0, 'end')
-            self._x_labels[row].delete(0, 'end')
-            self._y1_labels[row].delete(0, 'end')
-            self._y2_labels[row].delete(0, 'end')
+        self.rows = [PlotRow() for _ in self.rows]
+        self._redraw()
 
     def save_preset(self, preset, file, filepath, file_index):
 
@@ -341,33 +346,23 @@ class BasicFile(gui.ScrollableTab):
 
         # The rest of the inputs are specific to each plot. Iterate through each
         # plot, recording each one's inputs under a different subsection.
-        for p in range(len(file.plots)):
-            preset[f'File {f+1}'][f'Plot {p+1}'] = {
-                'title': file._titles[p].get(),
-                'x column': file._x_columns[p].get(),
-                'y1 columns': file._y1_columns[p].get(),
-                'y2 columns': file._y2_columns[p].get(),
-                'x label': file._x_labels[p].get(),
-                'y1 label': file._y1_labels[p].get(),
-                'y2 label': file._y2_labels[p].get(),
-            }
+        for p, row in enumerate(file.rows):
+            preset[f'File {f+1}'][f'Plot {p+1}'] = row.section()
 
     def load_preset(self, master, tab_index, rows, info):
-        for _ in range(rows):
-            master.plus_row(tab=tab_index)
         self.data_row_entry.insert(0, info['data start'])
         self.label_row_entry.insert(0, info['label row'])
         self.unit_row_entry.insert(0, info['unit row'])
-        plots = [key for key, value in info.items()
+
+        # Store the rows straight from the preset rather than adding them one by
+        # one, keeping a single empty row if there are no plots
+        sections = [value for value in info.values()
                     if isinstance(value, configobj.Section)]
-        for p, plot in enumerate(plots):
-            self._titles[p].insert(0, info[plot]['title'])
-            self._x_columns[p].insert(0, info[plot]['x column'])
-            self._y1_columns[p].insert(0, info[plot]['y1 columns'])
-            self._y2_columns[p].insert(0, info[plot]['y2 columns'])
-            self._x_labels[p].insert(0, info[plot]['x label'])
-            self._y1_labels[p].insert(0, info[plot]['y1 label'])
-            self._y2_labels[p].insert(0, info[plot]['y2 label'])
+        self.rows = [PlotRow.from_section(section) for section in sections] or [PlotRow()]
+        self.plots = [BasicPlot() for _ in self.rows]
+        self._invalid = set()
+        self._redraw()
+        self.scan()
 
     def add_plot(self):
         """Create a new plot object and hold a reference to it."""
@@ -376,61 +371,42 @@ class BasicFile(gui.ScrollableTab):
         plot = BasicPlot()
         self.plots.append(plot)
 
-    def _filetype(self, path):
-        """Determine the filetype of the input."""
-
-        _, extension = os.path.splitext(path)
-        if extension in ['.csv', '.dat']: return 'CSV'
-        elif extension in ['.xls', '.xlsx', '.xlsm']: return 'Excel'
-        else: raise TypeError(f'The .{extension} filetype is not supported.')
-
-    def _labels(self, label_row):
-        """Grab the labels from the specified row."""
-
-        # Grab the labels using the appropriate method for the filetype
-        if self._type == 'CSV':
-            labels = pd.read_csv(self.filepath, skiprows=label_row-1, nrows=1,
-                                 index_col=False, header=None)
-        elif self._type == 'Excel':
-            labels = pd.read_excel(self.filepath, skiprows=label_row-1, nrows=1,
-                                   index_col=False, header=None, encoding='latin1')
-        # Convert the pandas dataframe to a list and return it
-        return list(labels.values.flatten())
-
-    def _units(self, unit_row):
-        """Grab the units from the specified row."""
-
-        # If the unit_row parameter is None, do not continue
-        if not unit_row: return None
-
-        # Grab the units using the appropriate method for the filetype
-        if self._type == 'CSV':
-            units = pd.read_csv(self.filepath, skiprows=unit_row-1, nrows=1,
-                                index_col=False, header=None)
-        elif self._type == 'Excel':
-            units = pd.read_excel(self.filepath, skiprows=unit_row-1, nrows=1,
-                                  index_col=False, header=None, encoding='latin1')
-        # Convert the pandas dataframe to a list and return it
-        return list(units.values.flatten())
-
-    def _data(self, data_start_row):
-        """Grab the appropriate data from the file."""
-
-        # Read the file using the appropriate method for the filetype
-        if self._type == 'CSV':
-            return pd.read_csv(self.filepath, skiprows=data_start_row-1,
-                                 names=self.labels, index_col=False,
-                                 header=None)
-        elif self._type == 'Excel':
-            return pd.read_excel(self.filepath, skiprows=data_start_row-1,
-                                 names=self.labels, index_col=False,
-                                 header=None, encoding='latin1')
+    def _label_row(self):
+        """Return the label row that was entered, or None if it isn't a row."""
+
+        label_row = self.label_row_entry.get().strip()
+        return int(label_row) if label_row.isdigit() and int(label_row) > 0 else None
+
+    def scan(self, event=None):
+        """Start reading the labels of the file in the background, so that its
+        columns can be checked and picked by name without reading its data."""
+
+        label_row = self._label_row()
+        if label_row: self.app.catalog.scan(self.filepath, label_row)
+
+    def complete(self, text):
+        """Return the (column, label) of every column whose label contains the
+        text, or nothing if the labels haven't been read yet."""
+
+        label_row = self._label_row()
+        if not label_row: return []
+        header = self.app.catalog.ready(self.filepath, label_row)
+        return header.complete(text) if header else []
+
+    def set_invalid(self, row, attribute):
+        """Mark a field of a row as invalid, even if the row isn't in view."""
+
+        self._invalid.add((row, attribute))
+        for view in self._views:
+            if view.row == row: view.columns[attribute].set_invalid()
 
     def set_all_valid(self):
         self.data_row_entry.set_valid()
         self.label_row_entry.set_valid()
-        for entry in self._x_columns + self._y1_columns + self._y2_columns:
-            entry.set_valid()
+        self._invalid = set()
+        for view in self._views:
+            for entry in view.columns.values():
+                entry.set_valid()
 
     def check_blanks(self):
         invalid = False
@@ -443,16 +419,16 @@ class BasicFile(gui.ScrollableTab):
             invalid = True
             self.label_row_entry.set_invalid()
 
-        for p in range(len(self.plots)):
+        for p, row in enumerate(self.rows):
 
-            if not self._x_columns[p].get():
+            if not row.x_column:
                 invalid = True
-                self._x_columns[p].set_invalid()
+                self.set_invalid(p, 'x_column')
 
-            if not self._y1_columns[p].get():
+            if not row.y1_columns:
                 invalid = True
-                self._y1_columns[p].set_invalid()
-        
+                self.set_invalid(p, 'y1_columns')
+
         return False if invalid else True
 
     def check_rows(self):
@@ -474,27 +450,29 @@ class BasicFile(gui.ScrollableTab):
         return False if invalid else True
 
     def check_columns(self):
-        valid = list(range(1, len(self.data.columns)+1))
+        # Count the columns from the labels alone, so the data doesn't need to be read
+        header = self.app.catalog.header(self.filepath, int(self.label_row_entry.get()))
+        valid = list(range(1, header.columns+1))
 
         invalid = False
-        for p in range(len(self.plots)):
-            x = int(self._x_columns[p].get())
-            y1 = [int(item) for item in re.findall(r'\d+', self._y1_columns[p].get())]
-            y2 = [int(item) for item in re.findall(r'\d+', self._y2_columns[p].get())]
+        for p, row in enumerate(self.rows):
+            x = int(row.x_column)
+            y1 = [int(item) for item in re.findall(r'\d+', row.y1_columns)]
+            y2 = [int(item) for item in re.findall(r'\d+', row.y2_columns)]
 
             if x not in valid:
                 invalid = True
-                self._x_columns[p].set_invalid()
+                self.set_invalid(p, 'x_column')
 
             for column in y1:
                 if column not in valid:
                     invalid = True
-                    self._y1_columns[p].set_invalid()
+                    self.set_invalid(p, 'y1_columns')
 
             for column in y2:
                 if column not in valid:
                     invalid = True
-                    self._y2_columns[p].set_invalid()
+                    self.set_invalid(p, 'y2_columns')
 
         return False if invalid else True
 
@@ -511,12 +489,12 @@ class BasicFile(gui.ScrollableTab):
             invalid = True
             self.label_row_entry.set_invalid()
 
-        for p in range(len(self.plots)):
-            x = [int(item) for item in re.findall(r'\d+', self._x_columns[p].get())]
+        for p, row in enumerate(self.rows):
+            x = [int(item) for item in re.findall(r'\d+', row.x_column)]
 
             if len(x) > 1:
                 invalid = True
-                self._x_columns[p].set_invalid()
+                self.set_invalid(p, 'x_column')
 
         return False if invalid else True
 
@@ -526,9 +504,6 @@ class BasicFile(gui.ScrollableTab):
             if not self.check_blanks(): return 'blanks'
             if not self.check_length(): return 'length'
             if not self.check_rows(): return 'rows'
-
-            self.setup()
-
             if not self.check_columns(): return 'columns'
 
             return True
@@ -537,6 +512,7 @@ class BasicFile(gui.ScrollableTab):
         """Reset certain instance variables to avoid pandas warnings about
         duplicate names."""
 
+        self.source = None
         self._type = None
         self.labels = None
         self.units = None
@@ -544,20 +520,20 @@ class BasicFile(gui.ScrollableTab):
 
     def setup(self):
 
-        # Determine the file's type
-        self._type = self._filetype(self.filepath)
-
-        # Store the label row and corresponding labels as instance variables
+        # Store the label, unit and data start rows as instance variables
         self.label_row = int(self.label_row_entry.get())
-        self.labels = self._labels(self.label_row)
-
-        # Store the unit row and corresponding units as instance variables
         self.unit_row = int(self.unit_row_entry.get()) if self.unit_row_entry.get() else None
-        self.units = self._units(self.unit_row)
-
-        # Store the data start row and corresponding data as instance variables
         self.data_start_row = int(self.data_row_entry.get())
-        self.data = self._data(self.data_start_row)
+
+        # Read the file the same way that it is read without the GUI, and store its
+        # type, labels, units and data as instance variables
+        self.source = api.BasicSource(self.filepath, self.label_row,
+                                      self.data_start_row, self.unit_row)
+        self.source.read()
+        self._type = self.source.kind
+        self.labels = self.source.labels
+        self.units = self.source.units
+        self.data = self.source.data
 
     def generate(self):
         """The main function for the object which pulls all of the relevant data
@@ -568,408 +544,164 @@ class BasicFile(gui.ScrollableTab):
         self.setup()
 
         # Iterate through each plot
-        for p, plot in enumerate(self.plots):
+        for row, plot in zip(self.rows, self.plots):
             # Grab all entries in each field
-            title = self._titles[p].get()
-            x_column = int(self._x_columns[p].get())
-            self.y1_columns = [int(item) for item in re.findall(r'\d+', self._y1_columns[p].get())]
-            self.y2_columns = [int(item) for item in re.findall(r'\d+', self._y2_columns[p].get())]
-            x_label = self._x_labels[p].get()
-            y1_label = self._y1_labels[p].get()
-            y2_label = self._y2_labels[p].get()
-            # Feed the entries to the plot object
-            plot._generate(self.data, self.labels, x_column, self.y1_columns,
-                           self.y2_columns, self.units)
-            plot._labels(title, x_label, y1_label, y2_label)
+            x_column = int(row.x_column)
+            self.y1_columns = parsing.columns(row.y1_columns)
+            self.y2_columns = parsing.columns(row.y2_columns)
+            # Define the plot on the source, keeping the plot object and its settings
+            self.source.add_plot(x_column, self.y1_columns, self.y2_columns, row.title,
+                                 row.x_label, row.y1_label, row.y2_label, plot=plot)
+
+        # Feed the file's data to every plot
+        self.source.generate()
 
         return True
 
 
-class BasicPlot:
-    """Object that holds information about a singular plot."""
-
-    def __init__(self):
-        """Initialize the object's attributes."""
-
-        # Keep track of the columns to plot and the title/axis labels
-        self.x = None
-        self.y1 = None
-        self.y2 = None
-        self.title = None
-        self.x_label = None
-        self.y1_label = None
-        self.y2_label = None
-
-        # Keep track of whether or not a secondary axis is required
-        self.secondary_axis = None
-
-        # Keep track of original axis limits
-        self.x_lower_original = None
-        self.x_upper_original = None
-        self.y1_lower_original = None
-        self.y1_upper_original = None
-        self.y2_lower_original = None
-        self.y2_upper_original = None
-
-        # Keep track of axis limits
-        self.x_lower = None
-        self.x_upper = None
-        self.y1_lower = None
-        self.y1_upper = None
-        self.y2_lower = None
-        self.y2_upper = None
-
-        # Keep track of number of primary and secondary ticks
-        self.primary_ticks = None
-        self.secondary_ticks = None
-
-        # Keep track of the style selection
-        self.style = tk.StringVar()
-        self.style.set('Default')
-
-        # Keep track of the background selection, and path if necessary
-        self.background = tk.StringVar()
-        self.background.set('None')
-        self.background_path = None
-
-        # Keep track of title and label properties
-        self.title_weight = 'Bold'
-        self.x_label_weight = 'Normal'
-        self.y1_label_weight = 'Normal'
-        self.y2_label_weight = 'Normal'
-        self.title_size = 14
-        self.x_label_size = 10
-        self.y1_label_size = 10
-        self.y2_label_size = 10
-
-        # Keep track of tolerance band information
-        self.bands = ToleranceBands()
-        self.series = []
-        self.color = []
-        self.linestyle = []
-        self.minus_tolerance = []
-        self.plus_tolerance = []
-        self.lag = []
-        self.plus_bands = []
-        self.minus_bands = []
-
-        # Keep track of limit line information
-        self.lines = LimitLines()
-        self.line_axis = []
-        self.line_orientation = []
-        self.line_value = []
-        self.line_color = []
-        self.line_style = []
-        self.line_alpha = []
-
-    def _x_data(self, x_column):
-        """Pull the appropriate x-information from the data."""
-
-        return self.data[self.labels[x_column-1]]
-
-    def _y_data(self, y_columns):
-        """Pull the appropriate y-information from the data."""
-
-        return [self.data[self.labels[column-1]] for column in y_columns]
-
-    def _generate(self, data, labels, x_column, y1_columns, y2_columns=None,
-                  units=None):
-        """The main function for the object which stores the inputs and calls
-        other relevant functions."""
-
-        # Store the inputs as instance variables
-        self.data = data
-        self.labels = labels
-        self.units = units
-        self.x_column = x_column
-        self.y1_columns = y1_columns
-        self.y2_columns = y2_columns
-
-        # Grab the relevant data and store as instance variables
-        self.x = self._x_data(x_column)
-        self.y1 = self._y_data(y1_columns)
-        self.y2 = self._y_data(y2_columns) if y2_columns else None
-
-    def _labels(self, title, x_label, y1_label, y2_label):
-        """Store the label inputs as instance variables. This is separate from
-        the _generate method solely because it didn't feel like it fit there."""
-
-        # Store the label inputs as instance variables
-        self.title = title.replace('\\n', '\n') if title else None
-        self.x_label = x_label.replace('\\n', '\n') if x_label else None
-        self.y1_label = y1_label.replace('\\n', '\n') if y1_label else None
-        self.y2_label = y2_label.replace('\\n', '\n') if y2_label else None
-
-    def update_plot(self, flipbook, file, number):
+class BasicRow(tk.LabelFrame):
+    """The widgets of a single row/plot of a basic file. Only enough of them to fill
+    the tab are created, and each one is moved to whichever row scrolls into view.
+    Everything that is typed into the fields is stored in the row it is showing."""
 
-        # ========================
-        # STYLE SELECTION CONTROLS
-        # ========================
+    # Define padding constants
+    MARGIN = 8
+    TOOLS = 2
+    PADDING = 5
 
-        # Set the style according to whatever the user has selected
-        # Must come before the main section or else things like the legend won't update
-        if self.style.get() == 'Default':
-            plt.style.use('default')
-        elif self.style.get() == 'Classic':
-            plt.style.use('classic')
-        elif self.style.get() == 'Seaborn':
-            plt.style.use('seaborn')
-        elif self.style.get() == 'Fivethirtyeight':
-            plt.style.use('fivethirtyeight')
-
-        # =================
-        # MAIN UPDATE LOGIC
-        # =================
-
-        # Display the filename of the current plot
-        flipbook.filename.set(f'{flipbook.info[file].filename} - Plot {number + 1}')
-
-        # Essentially reset the secondary axis by clearing and turning it off if it exists,
-        # then setting the self.secondary variable to None
-        if flipbook.secondary:
-            flipbook.secondary.clear()
-            flipbook.secondary.axis('off')
-        flipbook.secondary = None
-
-        # Create a variable that keeps track of if a secondary axis is necessary
-        self.secondary_axis = True if self.y2 else False
-        # If it is, create the secondary axis
-        if self.secondary_axis: flipbook.secondary = flipbook.primary.twinx()
-
-        # Clear the primary axis as well
-        flipbook.primary.clear()
-
-        # Set the appropriate coordinates format to display on the flipbook
-        if self.secondary_axis:
-            flipbook.primary.set_zorder(1)
-            flipbook.secondary.set_zorder(100)
-            flipbook.secondary.format_coord = flipbook._coordinates(flipbook.secondary, flipbook.primary,
-                                                            self.secondary_axis)
-        if not self.secondary_axis:
-            flipbook.primary.set_zorder(1000)
-            flipbook.primary.format_coord = flipbook._coordinates(flipbook.primary, None, self.secondary_axis)
-
-        # Choose colors for the primary axis - will be iterated-through sequentially
-        y1_colors = ['k', 'b', 'r', 'g', plot_colors['purple'], plot_colors['orange'],
-                    plot_colors['brown']]
-        # Create a copy of the primary axis plot colors
-        y1_plot_colors = y1_colors[:]
-        # Choose colors for the secondary axis - will be iterated-through sequentially
-        y2_colors = [plot_colors['gray'], 'c', plot_colors['pink'], plot_colors['lime'],
-                    'm', plot_colors['gold'], 'y']
-        # Create a copy of the secondary axis plot colors
-        y2_plot_colors = y2_colors[:]
-
-        # Keep track of each handle, label, and how many times the colors are repeated
-        handles = []
-        labels = []
-        repeated = 0
-        # Iterate through the primary axis data for the current plot
-        for y, y1 in enumerate(self.y1):
-            # Determine how many times the colors list will be repeated
-            if y % len(y1_plot_colors) == 0: repeated += 1
-            # Determine the color of the line
-            color = y1_plot_colors[y - repeated * len(y1_plot_colors)]
-            # Get the column label and plot the line
-            column = self.y1_columns[y]
-            label = self.labels[column-1]
-            line = flipbook.primary.plot(self.x, y1, color, label=label)
-            handles.append(line[0])
-            labels.append(label)
-        # If there is data to be plotted on the secondary axis, run the following code
-        if self.secondary_axis:
-            repeated = 0
-            # Iterate through the secondary axis data for the current plot
-            for y, y2 in enumerate(self.y2):
-                # Determine how many times the colors list will be repeated
-                if y % len(y2_plot_colors) == 0: repeated += 1
-                # Determine the colors of the line
-                color = y2_plot_colors[y - repeated * len(y2_plot_colors)]
-                # Get the column label and plot the line
-                column = self.y2_columns[y]
-                label = self.labels[column-1]
-                line = flipbook.secondary.plot(self.x, y2, color, label=label)
-                handles.append(line[0])
-                labels.append(label)
-
-        # Determine adequate padding for the x-axis and set the x-axis limits accordingly.
-        # Store the original x-axis limits to allow the user to revert to them if desired.
-        min_x = min(self.x.dropna())
-        max_x = max(self.x.dropna())
-        padding = (max_x - min_x) * (100/90) * (0.05)
-        self.x_lower_original = min_x - padding
-        self.x_upper_original = max_x + padding
-        flipbook.primary.set_xlim(self.x_lower_original, self.x_upper_original)
-        # Store the original y-axis limits to allow the user to revert to them if desired.
-        self.y1_lower_original = flipbook.primary.get_ylim()[0]
-        self.y1_upper_original = flipbook.primary.get_ylim()[1]
-        if self.secondary_axis:
-            self.y2_lower_original = flipbook.secondary.get_ylim()[0]
-            self.y2_upper_original = flipbook.secondary.get_ylim()[1]
-
-        # Turn the grid on, with both major and minor gridlines
-        flipbook.primary.grid(b=True, which='major', color='#666666', linestyle='-', alpha=0.5)
-        flipbook.primary.minorticks_on()
-        flipbook.primary.grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
-        if self.secondary_axis:
-            flipbook.secondary.grid(b=True, which='major', color='#666666', linestyle='-', alpha=0.5)
-
-        # Set the title and labels according to user input
-        title_font = {'weight': self.title_weight.lower(), 'size': self.title_size}
-        flipbook.figure.suptitle(self.title, **title_font)
-        # Set the axis labels
-        x_font = {'weight': self.x_label_weight.lower(), 'size': self.x_label_size}
-        flipbook.primary.set_xlabel(self.x_label, fontdict=x_font)
-        y1_font = {'weight': self.y1_label_weight.lower(), 'size': self.y1_label_size}
-        flipbook.primary.set_ylabel(self.y1_label, fontdict=y1_font)
-        if self.secondary_axis:
-            y2_font = {'weight': self.y2_label_weight.lower(), 'size': self.y2_label_size}
-            flipbook.secondary.set_ylabel(self.y2_label, fontdict=y2_font)
-
-        # Determine the number of lines being plotted
-        lines = len(flipbook.primary.lines)
-        if self.secondary_axis: lines += len(flipbook.secondary.lines)
-        # Specify the maximum number of columns per row in the legend, and calculate
-        # the number of rows accordingly
-        max_columns = 5
-        rows = lines / max_columns
-        # If there will be more than two rows, calculate the number of columns required
-        # to keep the legend at two rows
-        if rows > 2: max_columns = math.ceil(lines / 2)
-        # Create the legend
-        legend = flipbook.primary.legend(
-                        handles = handles,
-                        labels = labels,
-                        loc = 'lower left',
-                        fancybox = True,
-                        shadow = True,
-                        ncol = max_columns,
-                        mode = 'expand',
-                        bbox_to_anchor = (-0.15, -0.2, 1.265, 0.1),
-            )
-        # Make the legend draggable (possibly a control in the future)
-        legend.set_draggable(state=True)
-
-        # Map the items in the legend to its corresponding line
-        self.line_map = {}
-        for legend_line, original_line in zip(legend.get_lines(), handles):
-            legend_line.set_picker(5)
-            self.line_map[legend_line] = original_line
+    def __init__(self, master, file):
+        """Create the fields and tools of the row, which doesn't show a row yet."""
 
-        # ====================
-        # AXES LIMITS CONTROLS
-        # ====================
+        tk.LabelFrame.__init__(self, master)
+        self.columnconfigure(0, weight=1)
+        MARGIN, TOOLS, PADDING = self.MARGIN, self.TOOLS, self.PADDING
 
-        # Set each axis limit to the user-specified value
-        if self.x_lower: flipbook.primary.set_xlim(left=self.x_lower)
-        if self.x_upper: flipbook.primary.set_xlim(right=self.x_upper)
-        if self.y1_lower: flipbook.primary.set_ylim(bottom=self.y1_lower)
-        if self.y1_upper: flipbook.primary.set_ylim(top=self.y1_upper)
-        if self.y2_lower: flipbook.secondary.set_ylim(bottom=self.y2_lower)
-        if self.y2_upper: flipbook.secondary.set_ylim(top=self.y2_upper)
+        # Keep track of the file, the index of the row being shown, and the
+        # variable and entry of each field
+        self.file = file
+        self.row = None
+        self.variables = {}
+        self.entries = {}
 
-        # ===================
-        # AXES TICKS CONTROLS
-        # ===================
+        # Create a frame that everything else will be placed inside of
+        inner = tk.Frame(self)
+        inner.grid(row=0, column=0, padx=MARGIN*2, pady=MARGIN*2, sticky='NSEW')
+        inner.columnconfigure(0, weight=1)
+        inner.columnconfigure(1, weight=1)
+        inner.columnconfigure(2, weight=1)
+        inner.columnconfigure(3, weight=10)
 
-        # Set a standard number of axis ticks to make it easier to line up the gridlines
-        if self.primary_ticks:
-            PRIMARY = flipbook.primary.get_ylim()
-            flipbook.primary.set_yticks(np.linspace(PRIMARY[0], PRIMARY[1],
-                                        int(self.primary_ticks)))
-        if self.secondary_ticks:
-            SECONDARY = flipbook.secondary.get_ylim()
-            flipbook.secondary.set_yticks(np.linspace(SECONDARY[0], SECONDARY[1],
-                                          int(self.secondary_ticks)))
+        # Create a frame that will hold all of the tools for the row
+        tools = tk.Frame(inner)
+        tools.grid(row=0, column=0, columnspan=4, padx=PADDING, sticky='NSEW')
+        tools.columnconfigure(1, weight=1)
 
-        # =============================
-        # BACKGROUND SELECTION CONTROLS
-        # =============================
+        # Create label and entry fields where the user can enter the title
+        title_label = tk.Label(tools, text='Title:')
+        title_label.grid(row=0, column=0, sticky='NSEW')
 
-        def set_background(choice):
-            """Set whatever image the user selected as the plot background."""
-
-            # If 'None' is selected, no background is drawn
-            if choice == 'None': return
-            # Otherwise, load a background preset
-            elif choice == 'Tactair': path = 'assets\\tactair.bmp'
-            elif choice == 'Young & Franklin': path = 'assets\\yf.bmp'
-            # 'Custom' loads the background from a preset file
-            elif choice == 'Custom': path = self.background_path
-            # Load the image and display it on the plot
-            image = plt.imread(gui.ResourcePath(path))
-            x_low, x_high = flipbook.primary.get_xlim()
-            y_low, y_high = flipbook.primary.get_ylim()
-            flipbook.primary.imshow(image, extent=[x_low, x_high, y_low, y_high], aspect='auto')
-
-        # Set the background of the plot
-        set_background(self.background.get())
+        title_entry = self._entry(tools, 'title', ttk.Entry)
+        title_entry.grid(row=0, column=1, padx=PADDING, sticky='NSEW')
 
-        # =======================
-        # TOLERANCE BAND CONTROLS
-        # =======================
+        # Create a copy button
+        copy_image = gui.RenderImage('assets\\copy.png', downscale=12)
+        copy_button = ttk.Button(tools, takefocus=0, width=3, image=copy_image, text='C')
+        copy_button['command'] = lambda: self.file.copy(self.row)
+        copy_button.image = copy_image
+        copy_button.grid(row=0, column=2, padx=TOOLS, sticky='NSEW')
 
-        # Iterate through the plus bands of the current plot
-        for p, plus in enumerate(self.plus_bands):
-            # If there are no plus bands, skip to next iteration
-            if not plus: continue
-            # Plot the plus band on the appropriate axis
-            elif plus[0] == 'primary':
-                flipbook.primary.plot(self.x, plus[1], plot_colors[self.color[p]],
-                                linestyle=self.linestyle[p])
-            elif plus[0] == 'secondary':
-                flipbook.secondary.plot(self.x, plus[1], plot_colors[self.color[p]],
-                                linestyle=self.linestyle[p])
-        # Iterate through the minus bands of the current plot
-        for m, minus in enumerate(self.minus_bands):
-            # If there are no minus bands, skip to next iteration
-            if not minus: continue
-            # Plot the minus band on the appropriate axis
-            elif minus[0] == 'primary':
-                flipbook.primary.plot(self.x, minus[1], plot_colors[self.color[m]],
-                                linestyle=self.linestyle[m])
-            elif minus[0] == 'secondary':
-                flipbook.secondary.plot(self.x, minus[1], plot_colors[self.color[m]],
-                                linestyle=self.linestyle[m])
+        # Create a paste button
+        paste_image = gui.RenderImage('assets\\paste.png', downscale=12)
+        paste_button = ttk.Button(tools, takefocus=0, width=3, image=paste_image, text='P')
+        paste_button['command'] = lambda: self.file.paste(self.row)
+        paste_button.image = paste_image
+        paste_button.grid(row=0, column=3, padx=TOOLS, sticky='NSEW')
 
-        # ===================
-        # LIMIT LINE CONTROLS
-        # ===================
+        # Create a clear button
+        clear_image = gui.RenderImage('assets\\clear.png', downscale=12)
+        clear_button = ttk.Button(tools, takefocus=0, width=3, image=clear_image, text='X')
+        clear_button['command'] = lambda: self.file.clear(self.row)
+        clear_button.image = clear_image
+        clear_button.grid(row=0, column=4, padx=TOOLS, sticky='NSEW')
+
+        # Add spacing between the tools and the next row of fields
+        gui.Space(inner, row=1, column=0, columnspan=4, padding=PADDING)
+
+        # Create label and entry fields where the user can enter the x-axis columns
+        x_column_label = tk.Label(inner, text='x column:')
+        x_column_label.grid(row=2, column=0, padx=PADDING, sticky='NSEW')
+
+        x_column_entry = self._entry(inner, 'x_column', ColumnEntry, width=10,
+                                     complete=file.complete)
+        x_column_entry.grid(row=3, column=0, padx=PADDING, sticky='NSEW')
+
+        # Create label and entry fields where the user can enter the primary axis columns
+        y1_column_label = tk.Label(inner, text='y1 columns:')
+        y1_column_label.grid(row=2, column=1, padx=PADDING, sticky='NSEW')
+
+        y1_column_entry = self._entry(inner, 'y1_columns', ColumnEntry, width=10,
+                                      complete=file.complete)
+        y1_column_entry.grid(row=3, column=1, padx=PADDING, sticky='NSEW')
 
-        # Iterate through the values list of the limit lines
-        for v, value in enumerate(self.line_value):
-            # If there are no values, skip to next iteration (e.g. blank rows)
-            if not value: continue
-            # Determine the axis to plot the limit line on
-            axis = flipbook.primary if self.line_axis[v] == 'primary' else \
-                ( flipbook.secondary if self.line_axis[v] == 'secondary' and \
-                    self.secondary_axis else None )
-            # Plot the limit line after determining its orientation
-            if self.line_orientation[v] == 'vertical':
-                axis.axvline(x=float(self.line_value[v]),
-                            linestyle=self.line_style[v],
-                            color=plot_colors[self.line_color[v]],
-                            alpha=float(self.line_alpha[v]))
-            elif self.line_orientation[v] == 'horizontal':
-                axis.axhline(y=float(self.line_value[v]),
-                            linestyle=self.line_style[v],
-                            color=plot_colors[self.line_color[v]],
-                            alpha=float(self.line_alpha[v]))
-
-    def on_click(self, event, flipbook):
-        # An event with a legend artist will be run through separately;
-        # do not execute code in this case
-        if not isinstance(event.artist, mpl.lines.Line2D): return
-        # Get a reference to the legend line and the original line
-        legend_line = event.artist
-        original_line = self.line_map[legend_line]
-        # Determine whether to show or hide the original line
-        visible = not original_line.get_visible()
-        # Set the visibility accordingly
-        original_line.set_visible(visible)
-        legend_line.set_alpha(1.0 if visible else 0.2)
-        # Update the plot
-        flipbook.canvas.draw()
+        # Create label and entry fields where the user can enter the secondary axis columns
+        y2_column_label = tk.Label(inner, text='y2 columns:')
+        y2_column_label.grid(row=2, column=2, padx=PADDING, sticky='NSEW')
+
+        y2_column_entry = self._entry(inner, 'y2_columns', ColumnEntry, width=10,
+                                      complete=file.complete)
+        y2_column_entry.grid(row=3, column=2, padx=PADDING, sticky='NSEW')
+
+        # Create label and entry fields where the user can enter the x-axis label
+        x_axis_label = tk.Label(inner, text='x axis label:')
+        x_axis_label.grid(row=2, column=3, padx=PADDING, sticky='NSEW')
+
+        x_axis_entry = self._entry(inner, 'x_label', ttk.Entry)
+        x_axis_entry.grid(row=3, column=3, padx=PADDING, sticky='NSEW')
+
+        # Add spacing between the first and second rows of fields
+        gui.Space(inner, row=4, column=0, columnspan=4, padding=PADDING)
+
+        # Create label and entry fields where the user can enter the primary axis label
+        y1_axis_label = tk.Label(inner, text='y1 axis label:')
+        y1_axis_label.grid(row=5, column=0, columnspan=3, padx=PADDING, sticky='NSEW')
+
+        y1_axis_entry = self._entry(inner, 'y1_label', ttk.Entry)
+        y1_axis_entry.grid(row=6, column=0, columnspan=3, padx=PADDING, sticky='NSEW')
+
+        # Create label and entry fields where the user can enter the secondary axis label
+        y2_axis_label = tk.Label(inner, text='y2 axis label:')
+        y2_axis_label.grid(row=5, column=3, padx=PADDING, sticky='NSEW')
+
+        y2_axis_entry = self._entry(inner, 'y2_label', ttk.Entry)
+        y2_axis_entry.grid(row=6, column=3, padx=PADDING, sticky='NSEW')
+
+        # Keep the column entries separately, since only they can be marked invalid
+        self.columns = {attribute: self.entries[attribute]
+                        for attribute in ['x_column', 'y1_columns', 'y2_columns']}
+
+    def _entry(self, master, attribute, kind, **kwargs):
+        """Create an entry for a field that stores whatever is typed into it in the
+        row being shown, and make it scroll into view upon a focus event."""
+
+        variable = tk.StringVar(self)
+        variable.trace_add('write', lambda *_: self._store(attribute))
+        entry = kind(master, textvariable=variable, **kwargs)
+        entry.bind('<FocusIn>', self.file._scroll_into_view)
+        self.variables[attribute] = variable
+        self.entries[attribute] = entry
+        return entry
+
+    def _store(self, attribute):
+        """Store the contents of a field in the row being shown."""
+
+        if self.row is None or self.row >= len(self.file.rows): return
+        setattr(self.file.rows[self.row], attribute, self.variables[attribute].get())
+
+    def close(self):
+        """Hide the column suggestions of every field."""
+
+        for entry in self.columns.values():
+            entry.close()
 
 
 class BasicControls(ttk.Notebook):
@@ -1006,6 +738,22 @@ class BasicControls(ttk.Notebook):
         self.axis_ticks = AxisTicks(figure)
         self.axis_ticks.grid(row=2, column=0, padx=20, pady=20, sticky='NSEW')
 
+        # Add a separator
+        separator = gui.Separator(figure, orientation='horizontal', padding=(0, (10, 0)))
+        separator.grid(row=3, column=0, sticky='NSEW')
+
+        # Create the scaling frame
+        self.axis_scaling = AxisScaling(figure)
+        self.axis_scaling.grid(row=4, column=0, padx=20, pady=20, sticky='NSEW')
+
+        # Add a separator
+        separator = gui.Separator(figure, orientation='horizontal', padding=(0, (10, 0)))
+        separator.grid(row=5, column=0, sticky='NSEW')
+
+        # Create the decimation frame
+        self.decimation = Decimation(figure)
+        self.decimation.grid(row=6, column=0, padx=20, pady=20, sticky='NSEW')
+
         # ==============
         # APPEARANCE TAB
         # ==============
@@ -1032,6 +780,22 @@ class BasicControls(ttk.Notebook):
         self.tolerance_bands.grid(row=0, column=0, sticky='NSEW')
         self.tolerance_bands.columnconfigure(0, weight=1)
 
+        # Add a separator
+        separator = gui.Separator(analysis, orientation='horizontal', padding=(0, (10, 0)))
+        separator.grid(row=1, column=0, sticky='NSEW')
+
+        # Add the reference comparison controls
+        self.reference_bands = ReferenceBands(analysis, self.compare_reference)
+        self.reference_bands.grid(row=2, column=0, padx=20, pady=20, sticky='NSEW')
+
+        # Add a separator
+        separator = gui.Separator(analysis, orientation='horizontal', padding=(0, (10, 0)))
+        separator.grid(row=3, column=0, sticky='NSEW')
+
+        # Add a table with the statistics of each plotted series
+        self.series_statistics = SeriesStatistics(analysis)
+        self.series_statistics.grid(row=4, column=0, padx=20, pady=20, sticky='NSEW')
+
         # ===============
         # ANNOTATIONS TAB
         # ===============
@@ -1052,18 +816,23 @@ class BasicControls(ttk.Notebook):
         # AXES LIMITS CONTROLS
         # ====================
 
-        # Fill in each field with their respective values
-        self.axis_limits.x_lower = (current.x_lower, current.x_lower_original)
-        self.axis_limits.x_upper = (current.x_upper, current.x_upper_original)
-        self.axis_limits.y1_lower = (current.y1_lower, current.y1_lower_original)
-        self.axis_limits.y1_upper = (current.y1_upper, current.y1_upper_original)
+        # Fill in each field with their respective values, showing the limits in
+        # the same units as the axes
+        primary, secondary = current.scaling('primary'), current.scaling('secondary')
+        x_lower, x_upper = primary.x_limits(current.x_lower, current.x_upper)
+        y1_lower, y1_upper = primary.y_limits(current.y1_lower, current.y1_upper)
+        self.axis_limits.x_lower = (x_lower, current.x_lower_original)
+        self.axis_limits.x_upper = (x_upper, current.x_upper_original)
+        self.axis_limits.y1_lower = (y1_lower, current.y1_lower_original)
+        self.axis_limits.y1_upper = (y1_upper, current.y1_upper_original)
         # Disable the secondary axis entry fields if there is no secondary axis,
         # otherwise enable and fill the entry fields corresponding to the secondary axis.
         if current.secondary_axis:
             self.axis_limits.y2_lower_entry['state'] = 'normal'
-            self.axis_limits.y2_lower = (current.y2_lower, current.y2_lower_original)
+            y2_lower, y2_upper = secondary.y_limits(current.y2_lower, current.y2_upper)
+            self.axis_limits.y2_lower = (y2_lower, current.y2_lower_original)
             self.axis_limits.y2_upper_entry['state'] = 'normal'
-            self.axis_limits.y2_upper = (current.y2_upper, current.y2_upper_original)
+            self.axis_limits.y2_upper = (y2_upper, current.y2_upper_original)
         else:
             self.axis_limits.y2_lower_entry.clear()
             self.axis_limits.y2_lower_entry['state'] = 'disabled'
@@ -1083,12 +852,43 @@ class BasicControls(ttk.Notebook):
             self.axis_ticks.secondary_ticks_entry.clear()
             self.axis_ticks.secondary_ticks_entry['state'] = 'disabled'
 
+        # =====================
+        # AXIS SCALING CONTROLS
+        # =====================
+
+        # Fill in each field with their respective values
+        self.axis_scaling.x_scale = current.x_scale
+        self.axis_scaling.x_offset = current.x_offset
+        self.axis_scaling.y1_scale = current.y1_scale
+        self.axis_scaling.y1_offset = current.y1_offset
+        self.axis_scaling.zero_x = current.zero_x
+        # Only allow the secondary axis to be scaled if there is one
+        if current.secondary_axis:
+            self.axis_scaling.y2_scale_entry['state'] = 'normal'
+            self.axis_scaling.y2_scale = current.y2_scale
+            self.axis_scaling.y2_offset_entry['state'] = 'normal'
+            self.axis_scaling.y2_offset = current.y2_offset
+        else:
+            self.axis_scaling.y2_scale_entry.clear()
+            self.axis_scaling.y2_scale_entry['state'] = 'disabled'
+            self.axis_scaling.y2_offset_entry.clear()
+            self.axis_scaling.y2_offset_entry['state'] = 'disabled'
+
+        # ===================
+        # DECIMATION CONTROLS
+        # ===================
+
+        # Fill in each field and show how much the data was reduced
+        self.decimation.mode = current.decimation
+        self.decimation.points = current.decimation_points
+        self.decimation.show(current.reduction, current.pipeline.timings.get('decimate'))
+
         # ========================
         # STYLE SELECTION CONTROLS
         # ========================
 
         # Set the current style combobox selection to the stored style value
-        self.general_appearance.style = current.style.get()
+        self.general_appearance.style = current.style
 
         # =============================
         # BACKGROUND SELECTION CONTROLS
@@ -1097,7 +897,7 @@ class BasicControls(ttk.Notebook):
         # Pass the current plot object to the general appearance object
         self.general_appearance.current = current
         # Set the current background combobox selection to the stored background value
-        self.general_appearance.background = current.background.get()
+        self.general_appearance.background = current.background
 
         # ========================
         # LABEL PROPERTY CONTROLS
@@ -1128,7 +928,9 @@ class BasicControls(ttk.Notebook):
         # If the band_controls widget already exists, remove it from view.
         # Destroying it will cause the program to not be able to reference those fields.
         if self.band_controls: self.band_controls.grid_forget()
-        # Re-grid the tolerance bands object of the current plot
+        # Re-grid the tolerance bands object of the current plot, creating it the
+        # first time that the plot is shown
+        if current.bands is None: current.bands = ToleranceBands(current)
         self.band_controls = current.bands
         self.band_controls.setup(self.tolerance_bands)
         self.band_controls.grid(row=0, column=0, sticky='NSEW')
@@ -1158,6 +960,11 @@ class BasicControls(ttk.Notebook):
         for column in current.y2_columns:
             values.append(current.labels[column-1])
         self.band_controls.update_series(values)
+        self.reference_bands.update_series(values)
+
+        # Show the statistics of each plotted series, which were computed when the
+        # plot was generated
+        self.series_statistics.show(current.statistics)
 
         # ===================
         # LIMIT LINE CONTROLS
@@ -1166,7 +973,9 @@ class BasicControls(ttk.Notebook):
         # If the band_controls widget already exists, remove it from view.
         # Destroying it will cause the program to not be able to reference those fields.
         if self.line_controls: self.line_controls.grid_forget()
-        # Re-grid the tolerance bands object of the current plot
+        # Re-grid the limit lines object of the current plot, creating it the first
+        # time that the plot is shown
+        if current.lines is None: current.lines = LimitLines()
         self.line_controls = current.lines
         self.line_controls.setup(self.horizontal_lines)
         self.line_controls.grid(row=0, column=0, sticky='NSEW')
@@ -1187,6 +996,46 @@ class BasicControls(ttk.Notebook):
         self.line_controls.linestyle = current.line_style
         self.line_controls.alpha = current.line_alpha
 
+        # Show the exceedance statistics of each limit line
+        rows = min(len(current.line_value), len(current.line_orientation),
+                   len(current.line_axis), len(self.line_controls.summaries))
+        for row in range(rows):
+            self.line_controls.show_statistics(row, current.limit_statistics(row))
+
+
+    def compare_reference(self):
+        """Compare the selected columns of every loaded file against envelopes
+        around the same columns of the current file, then show the results."""
+
+        # Get a reference to the current plot object and the file it belongs to
+        current = self.current
+        golden = self.flipbook.info[self.flipbook.files[self.flipbook.page]]
+
+        # Make sure that there is something to compare
+        labels = self.reference_bands.series
+        if not labels:
+            msg.showinfo(title='No reference column',
+                         message='Select a reference column to compare the files against.')
+            return
+        try:
+            plus = self.reference_bands.plus_tolerance
+            minus = self.reference_bands.minus_tolerance
+            lag = self.reference_bands.lag
+        except ValueError:
+            msg.showerror(title='Invalid input',
+                          message='The tolerances and lag must be numbers.')
+            return
+
+        # Compare every other basic file, matching columns by their labels. Files
+        # whose tabs haven't been built are placeholders that know their kind.
+        files = [file for file in self.flipbook.info
+                 if getattr(file, 'kind', type(file)) is BasicFile]
+        x_label = current.labels[current.x_column-1]
+        comparisons, matrix = reference.evaluate(golden, files, x_label, labels,
+                                                 plus, minus, lag)
+
+        # Show the pass/fail matrix and the residual pages in a new window
+        reference.ReferenceWindow(self.flipbook, golden.filename, comparisons, matrix)
 
     def update(self):
         """Update the current plot object with the user-entered values and refresh
@@ -1205,14 +1054,20 @@ class BasicControls(ttk.Notebook):
 
             return float(value if value else original)
 
-        # Store the axes limits values in the corresponding plot object attributes
-        current.x_lower = update_axis(self.axis_limits.x_lower, current.x_lower_original)
-        current.x_upper = update_axis(self.axis_limits.x_upper, current.x_upper_original)
-        current.y1_lower = update_axis(self.axis_limits.y1_lower, current.y1_lower_original)
-        current.y1_upper = update_axis(self.axis_limits.y1_upper, current.y1_upper_original)
+        # Store the axes limits values in the corresponding plot object attributes.
+        # The fields show the limits with the scaling that the axes were drawn with,
+        # so convert them back to the units of the data before the scaling changes
+        primary, secondary = current.scaling('primary'), current.scaling('secondary')
+        current.x_lower, current.x_upper = primary.x_data_limits(
+            update_axis(self.axis_limits.x_lower, current.x_lower_original),
+            update_axis(self.axis_limits.x_upper, current.x_upper_original))
+        current.y1_lower, current.y1_upper = primary.y_data_limits(
+            update_axis(self.axis_limits.y1_lower, current.y1_lower_original),
+            update_axis(self.axis_limits.y1_upper, current.y1_upper_original))
         if current.secondary_axis:
-            current.y2_lower = update_axis(self.axis_limits.y2_lower, current.y2_lower_original)
-            current.y2_upper = update_axis(self.axis_limits.y2_upper, current.y2_upper_original)
+            current.y2_lower, current.y2_upper = secondary.y_data_limits(
+                update_axis(self.axis_limits.y2_lower, current.y2_lower_original),
+                update_axis(self.axis_limits.y2_upper, current.y2_upper_original))
 
         # ===================
         # AXIS TICKS CONTROLS
@@ -1223,19 +1078,45 @@ class BasicControls(ttk.Notebook):
         if current.secondary_axis:
             current.secondary_ticks = self.axis_ticks.secondary_ticks
 
+        # =====================
+        # AXIS SCALING CONTROLS
+        # =====================
+
+        # Store the scale factors and offsets, ignoring scale factors of zero since
+        # they would collapse the data onto a single value
+        current.x_scale = self.axis_scaling.x_scale or 1
+        current.x_offset = self.axis_scaling.x_offset
+        current.y1_scale = self.axis_scaling.y1_scale or 1
+        current.y1_offset = self.axis_scaling.y1_offset
+        current.zero_x = self.axis_scaling.zero_x
+        if current.secondary_axis:
+            current.y2_scale = self.axis_scaling.y2_scale or 1
+            current.y2_offset = self.axis_scaling.y2_offset
+
+        # ===================
+        # DECIMATION CONTROLS
+        # ===================
+
+        # Store the decimation settings, then decimate the data right away so that
+        # the tolerance bands, which are calculated from all of the data, are drawn
+        # at the same samples as the series
+        current.decimation = self.decimation.mode
+        current.decimation_points = self.decimation.points
+        current._run_pipeline()
+
         # ========================
         # STYLE SELECTION CONTROLS
         # ========================
 
         # Store the currently selected value from the style combobox
-        current.style.set(self.general_appearance.style)
+        current.style = self.general_appearance.style
 
         # =============================
         # BACKGROUND SELECTION CONTROLS
         # =============================
 
         # Store the currently selected value from the background combobox
-        current.background.set(self.general_appearance.background)
+        current.background = self.general_appearance.background
 
         # ========================
         # LABEL PROPERTY CONTROLS
@@ -1268,6 +1149,8 @@ class BasicControls(ttk.Notebook):
 
         # Pass the current plot object to the calculate method to create the bands
         self.band_controls.calculate(current)
+        # Keep the excursions from the bands with the plot as well
+        current.band_events = self.band_controls.events
 
         # ===================
         # LIMIT LINE CONTROLS
@@ -1316,3 +1199,102 @@ class ValidatableEntry(ttk.Entry):
 
     def set_invalid(self):
         self['style'] = 'Invalid.TEntry'
+
+
+class ColumnEntry(ValidatableEntry):
+    """An entry for column numbers that can also pick columns by their labels.
+    Typing part of a label shows the columns whose labels contain it, and picking
+    one replaces what was typed with the column's number. A label can also be
+    completed after other columns, as long as they are separated by semicolons or
+    commas."""
+
+    def __init__(self, *args, complete=None, **kwargs):
+        ValidatableEntry.__init__(self, *args, **kwargs)
+
+        # Keep a reference to the function that returns the matching columns
+        self.complete = complete
+        self.matches = []
+        self.popup = None
+        self.listbox = None
+
+        # Suggest columns as the user types, and let them pick one with the keyboard
+        self.bind('<KeyRelease>', self._suggest, add='+')
+        self.bind('<Down>', lambda event: self._move(1))
+        self.bind('<Up>', lambda event: self._move(-1))
+        self.bind('<Return>', self._pick)
+        self.bind('<Tab>', self._pick)
+        self.bind('<Escape>', lambda event: self.close())
+        self.bind('<FocusOut>', lambda event: self.after(150, self.close), add='+')
+
+    def _token(self):
+        """Return where the column being typed starts, along with its text."""
+
+        text = self.get()[:self.index('insert')]
+        start = max(text.rfind(','), text.rfind(';')) + 1
+        return start, text[start:].strip()
+
+    def _suggest(self, event):
+        """Show the columns whose labels contain what is being typed."""
+
+        if event.keysym in ['Up', 'Down', 'Return', 'Tab', 'Escape']: return
+        _, token = self._token()
+        # Column numbers are left alone; only text is completed
+        if not self.complete or not token or token.isdigit():
+            self.close()
+            return
+        self.matches = self.complete(token)
+        if not self.matches:
+            self.close()
+            return
+
+        # Create the popup the first time that it is needed, just below the entry
+        if not self.popup:
+            self.popup = tk.Toplevel(self)
+            self.popup.overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, height=8, activestyle='dotbox',
+                                      exportselection=False)
+            self.listbox.grid(row=0, column=0, sticky='NSEW')
+            self.listbox.bind('<ButtonRelease-1>', self._pick)
+        self.popup.geometry(f'+{self.winfo_rootx()}'
+                            f'+{self.winfo_rooty() + self.winfo_height()}')
+        self.listbox['width'] = max(len(f'{column}: {label}')
+                                    for column, label in self.matches) + 2
+        self.listbox.delete(0, 'end')
+        for column, label in self.matches:
+            self.listbox.insert('end', f'{column}: {label}')
+        self.listbox.selection_set(0)
+
+    def _move(self, step):
+        """Move the selection within the suggestions."""
+
+        if not self.popup: return
+        index = self.listbox.curselection()
+        index = (index[0] + step) % len(self.matches) if index else 0
+        self.listbox.selection_clear(0, 'end')
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        # Return 'break' so that the arrow keys don't move the cursor
+        return 'break'
+
+    def _pick(self, event=None):
+        """Replace what is being typed with the number of the selected column."""
+
+        if not self.popup: return
+        index = self.listbox.curselection()
+        if index:
+            start, _ = self._token()
+            column = self.matches[index[0]][0]
+            self.delete(start, 'insert')
+            self.insert(start, f' {column}' if start else str(column))
+        self.close()
+        self.focus_set()
+        # Return 'break' so that picking a column doesn't also plot or move focus
+        return 'break'
+
+    def close(self):
+        """Hide the suggestions."""
+
+        if self.popup: self.popup.destroy()
+        self.popup = None
+        self.listbox = None
+        self.matches = []
@@ -0,0 +1,725 @@
+import math
+import os
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+
+import analysis
+import backgrounds
+import decimation
+import interaction
+import pipeline
+import scaling
+from settings import plot_colors
+
+
+class BasicPlot:
+    """Object that holds information about a singular plot."""
+
+    def __init__(self):
+        """Initialize the object's attributes."""
+
+        # Keep track of the columns to plot and the title/axis labels
+        self.x = None
+        self.y1 = None
+        self.y2 = None
+        # Keep track of the data before it was decimated, which everything besides
+        # drawing uses, and the indices of the samples that are drawn, which are None
+        # when every sample is drawn
+        self.x_full = None
+        self.y1_full = None
+        self.y2_full = None
+        self.indices = None
+        self.title = None
+        self.x_label = None
+        self.y1_label = None
+        self.y2_label = None
+
+        # Keep track of whether or not a secondary axis is required
+        self.secondary_axis = None
+
+        # Create the pipeline that prepares the data for drawing, and keep track of
+        # how many times the plot has been generated so that the pipeline knows when
+        # the underlying data has changed. The data is analyzed before it is
+        # decimated, so the statistics always describe all of the data and changing
+        # the decimation doesn't recompute them.
+        self.pipeline = pipeline.Pipeline(
+            ('select', self._select),
+            ('transform', self._transform),
+            ('analyze', self._analyze),
+            ('decimate', self._decimate),
+        )
+        self.generation = 0
+        self.x_extent = None
+        self.statistics = None
+
+        # Keep track of how the data is decimated, along with the number of points
+        # before and after it was decimated
+        self.decimation = 'None'
+        self.decimation_points = 5000
+        self.reduction = None
+
+        # Keep track of original axis limits
+        self.x_lower_original = None
+        self.x_upper_original = None
+        self.y1_lower_original = None
+        self.y1_upper_original = None
+        self.y2_lower_original = None
+        self.y2_upper_original = None
+
+        # Keep track of axis limits, in the units of the data
+        self.x_lower = None
+        self.x_upper = None
+        self.y1_lower = None
+        self.y1_upper = None
+        self.y2_lower = None
+        self.y2_upper = None
+
+        # Keep track of number of primary and secondary ticks
+        self.primary_ticks = None
+        self.secondary_ticks = None
+
+        # Keep track of the scale factors and offsets that the data is shown with,
+        # and whether the x-axis should be zeroed
+        self.x_scale = 1
+        self.x_offset = 0
+        self.y1_scale = 1
+        self.y1_offset = 0
+        self.y2_scale = 1
+        self.y2_offset = 0
+        self.zero_x = False
+
+        # Keep track of the style selection
+        self.style = 'Default'
+
+        # Keep track of the background selection, and path if necessary
+        self.background = 'None'
+        self.background_path = None
+
+        # Keep track of title and label properties
+        self.title_weight = 'Bold'
+        self.x_label_weight = 'Normal'
+        self.y1_label_weight = 'Normal'
+        self.y2_label_weight = 'Normal'
+        self.title_size = 14
+        self.x_label_size = 10
+        self.y1_label_size = 10
+        self.y2_label_size = 10
+
+        # Keep track of tolerance band information. The widgets that edit the bands
+        # are created by the controls window the first time the plot is shown there.
+        self.bands = None
+        self.series = []
+        self.color = []
+        self.linestyle = []
+        self.minus_tolerance = []
+        self.plus_tolerance = []
+        self.lag = []
+        self.plus_bands = []
+        self.minus_bands = []
+        self.band_events = None
+
+        # Keep track of limit line information, which is also edited by widgets that
+        # the controls window creates
+        self.lines = None
+        self.line_axis = []
+        self.line_orientation = []
+        self.line_value = []
+        self.line_color = []
+        self.line_style = []
+        self.line_alpha = []
+        # Keep track of the exceedance statistics of the limit lines, keyed by the
+        # label of the series and the value of the line
+        self.exceedances = {}
+
+    def __getstate__(self):
+        """Return the attributes to copy when the plot is pickled, e.g. to render it
+        in another process. The widgets and artists belong to the GUI, so they are
+        left out, as is the file's data since the pipeline already holds the
+        columns that the plot uses."""
+
+        state = dict(self.__dict__)
+        for name in ['data', 'bands', 'lines', 'cursor_series', 'line_map']:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore the pickled attributes and recreate the ones that were left out."""
+
+        self.__dict__.update(state)
+        self.data = None
+        self.bands = None
+        self.lines = None
+        self.cursor_series = []
+        self.line_map = {}
+
+    def generate(self, data, labels, x_column, y1_columns, y2_columns=None,
+                 units=None, title=None, x_label=None, y1_label=None, y2_label=None):
+        """Pull the data of the plot from the file's data and store its labels.
+        Doesn't rely on any widgets, so that plots can also be generated without
+        the GUI."""
+
+        self._generate(data, labels, x_column, y1_columns, y2_columns, units)
+        self._labels(title, x_label, y1_label, y2_label)
+
+    def _x_data(self, x_column):
+        """Pull the appropriate x-information from the data."""
+
+        return self.data[self.labels[x_column-1]]
+
+    def _y_data(self, y_columns):
+        """Pull the appropriate y-information from the data."""
+
+        return [self.data[self.labels[column-1]] for column in y_columns]
+
+    def _generate(self, data, labels, x_column, y1_columns, y2_columns=None,
+                  units=None):
+        """The main function for the object which stores the inputs and calls
+        other relevant functions."""
+
+        # Store the inputs as instance variables
+        self.data = data
+        self.labels = labels
+        self.units = units
+        self.x_column = x_column
+        self.y1_columns = y1_columns
+        self.y2_columns = y2_columns
+
+        # Run the data through the pipeline and store the results as instance variables
+        self.generation += 1
+        self._run_pipeline()
+
+    def _settings(self):
+        """Return the settings of each stage of the pipeline."""
+
+        return {
+            'select': (self.generation, self.x_column, tuple(self.y1_columns),
+                       tuple(self.y2_columns or ())),
+            'decimate': (self.decimation, self.decimation_points),
+        }
+
+    def _run_pipeline(self):
+        """Run the pipeline with the current settings and store its results. Stages
+        whose settings have not changed reuse their previous results."""
+
+        data = self.pipeline.run(self._settings())
+        changed = data['x full'] is not self.x_full
+        decimated = data['x'] is not self.x
+        self.x = data['x']
+        self.y1 = data['y1']
+        self.y2 = data['y2']
+        self.x_full = data['x full']
+        self.y1_full = data['y1 full']
+        self.y2_full = data['y2 full']
+        self.indices = data['indices']
+        self.x_extent = data['x extent']
+        self.statistics = data['statistics']
+        self.reduction = data['reduction']
+
+        # Everything else that is derived from the data only needs to be redone when
+        # the data itself has changed
+
+        # Forget the exceedance statistics of the previous data
+        if changed: self.exceedances = {}
+
+        # Index the drawn x-data so that the crosshair can find the nearest sample
+        # quickly; data that cannot be treated as numbers, such as dates, is not indexed
+        if not decimated: return
+        try:
+            self.x_index = interaction.SortedIndex(self.x)
+        except (TypeError, ValueError):
+            self.x_index = None
+
+    def _select(self, data, settings):
+        """Grab the relevant columns from the file's data."""
+
+        return {
+            'x': self._x_data(self.x_column),
+            'y1': self._y_data(self.y1_columns),
+            'y2': self._y_data(self.y2_columns) if self.y2_columns else None,
+        }
+
+    def _transform(self, data, settings):
+        """Transform the selected data. There are currently no transformations, so
+        the data is passed through as-is."""
+
+        return data
+
+    def _decimate(self, data, settings):
+        """Reduce the number of points to draw with the selected decimation mode.
+        The reduced data is what is drawn, exported and read out by the crosshair,
+        while the full data is kept for the tolerance bands, excursions, exceedance
+        statistics and lag estimates, so that they don't depend on how the data is
+        drawn."""
+
+        mode, points = settings
+        decimated = dict(data)
+        count = len(data['x'])
+        decimated['x full'] = data['x']
+        decimated['y1 full'] = data['y1']
+        decimated['y2 full'] = data['y2']
+
+        series = data['y1'] + (data['y2'] or [])
+        indices = decimation.decimate(data['x'], series, mode, points)
+        decimated['indices'] = indices
+        if indices is not None:
+            decimated['x'] = data['x'].iloc[indices]
+            decimated['y1'] = [y.iloc[indices] for y in data['y1']]
+            if data['y2']:
+                decimated['y2'] = [y.iloc[indices] for y in data['y2']]
+        decimated['reduction'] = (count, len(decimated['x']))
+        return decimated
+
+    def _analyze(self, data, settings):
+        """Compute the information about the data that drawing it relies on, such as
+        the statistics of each series and the extent of the x-data."""
+
+        analyzed = dict(data)
+
+        # Compute the statistics of the x-data and every y-series at once
+        columns = [self.x_column] + self.y1_columns + (self.y2_columns or [])
+        series = [data['x']] + data['y1'] + (data['y2'] or [])
+        analyzed['statistics'] = analysis.statistics(
+            [self.labels[column-1] for column in columns], series)
+
+        # Reuse the statistics for the extent of the x-data, unless it isn't numeric
+        if np.issubdtype(data['x'].dtype, np.number):
+            x_statistics = analyzed['statistics'].iloc[0]
+            analyzed['x extent'] = (x_statistics['min'], x_statistics['max'])
+        else:
+            analyzed['x extent'] = (data['x'].min(), data['x'].max())
+        return analyzed
+
+    def _drawn(self, values):
+        """Return the samples of data that was computed from the full data, such as
+        a tolerance band, that are drawn along with the decimated series."""
+
+        if self.indices is None: return values
+        return np.asarray(values)[self.indices]
+
+    def _labels(self, title, x_label, y1_label, y2_label):
+        """Store the label inputs as instance variables. This is separate from
+        the _generate method solely because it didn't feel like it fit there."""
+
+        # Store the label inputs as instance variables
+        self.title = title.replace('\\n', '\n') if title else None
+        self.x_label = x_label.replace('\\n', '\n') if x_label else None
+        self.y1_label = y1_label.replace('\\n', '\n') if y1_label else None
+        self.y2_label = y2_label.replace('\\n', '\n') if y2_label else None
+
+    def scaling(self, axis='primary'):
+        """Return the Scaling that the data of the specified axis is shown with.
+        Zeroing the x-axis replaces the x-offset with the offset that moves the
+        start of the x-data to zero."""
+
+        x_offset = self.x_offset
+        # Only numeric x-data can be zeroed, e.g. not timestamps
+        if self.zero_x and isinstance(self.x_extent[0], (int, float, np.number)):
+            x_offset = -self.x_extent[0] * self.x_scale
+        if axis == 'secondary':
+            return scaling.Scaling(self.x_scale, x_offset, self.y2_scale, self.y2_offset)
+        return scaling.Scaling(self.x_scale, x_offset, self.y1_scale, self.y1_offset)
+
+    def _plot_series(self, axis, series, columns, colors, statistics, scaling):
+        """Plot each series on the axis, iterating through the colors sequentially.
+        Returns the legend handles and labels, as well as the line that each legend
+        handle should show or hide when it is clicked. The statistics of the series
+        are used to scale the axis when they are drawn as a collection, and the
+        scaling is applied as part of the transform that the series are drawn with.
+
+        Each series is normally drawn as its own line. Since drawing time grows with
+        the number of artists, plots with many series instead draw all of them as a
+        single LineCollection that is backed by one contiguous array."""
+
+        # Define the number of series at which they are drawn as a single collection
+        BATCH = 30
+
+        # Determine the label and color of each series
+        labels = [self.labels[column-1] for column in columns]
+        colors = [colors[y % len(colors)] for y in range(len(series))]
+
+        # Only numeric data can be placed in a collection; anything else, such as
+        # dates stored as text, has to be drawn as individual lines
+        numeric = all(np.issubdtype(item.dtype, np.number) for item in [self.x] + series)
+        if len(series) < BATCH or not numeric:
+            handles = [axis.plot(self.x, y, color, label=label,
+                                 transform=scaling.transform(axis))[0]
+                       for y, color, label in zip(series, colors, labels)]
+            return handles, labels, handles[:]
+
+        # Copy every series into a single array of shape (series, points, xy)
+        segments = np.empty((len(series), len(self.x), 2))
+        segments[:, :, 0] = self.x.values
+        segments[:, :, 1] = np.vstack([y.values for y in series])
+        # Draw the array as a single artist and rescale the axis to fit it, using the
+        # precomputed extents instead of searching through every segment again
+        collection = mpl.collections.LineCollection(segments, colors=colors,
+                                                    transform=scaling.transform(axis))
+        axis.add_collection(collection, autolim=False)
+        x_min, x_max = scaling.x_extent(*self.x_extent)
+        y_min, y_max = scaling.y_extent(np.nanmin(statistics['min']),
+                                        np.nanmax(statistics['max']))
+        axis.update_datalim([(x_min, y_min), (x_max, y_max)])
+        axis.autoscale_view()
+
+        # The legend needs a line for each series, which are only used as handles
+        handles = [mpl.lines.Line2D([], [], color=color, label=label)
+                   for color, label in zip(colors, labels)]
+        targets = [BatchedSeries(collection, index) for index in range(len(series))]
+        return handles, labels, targets
+
+    def update_plot(self, flipbook, file, number):
+
+        # The style that the user has selected is applied by the flipbook to the
+        # figure once this method has drawn the plot
+
+        # =================
+        # MAIN UPDATE LOGIC
+        # =================
+
+        # Bring the data up to date with the current settings; only the stages whose
+        # settings have changed are recomputed
+        self._run_pipeline()
+
+        # Display the filename of the current plot
+        flipbook.filename.set(f'{flipbook.info[file].filename} - Plot {number + 1}')
+
+        # Essentially reset the secondary axis by clearing and turning it off if it exists,
+        # then setting the self.secondary variable to None
+        if flipbook.secondary:
+            flipbook.secondary.clear()
+            flipbook.secondary.axis('off')
+        flipbook.secondary = None
+
+        # Create a variable that keeps track of if a secondary axis is necessary
+        self.secondary_axis = True if self.y2 else False
+        # If it is, create the secondary axis
+        if self.secondary_axis: flipbook.secondary = flipbook.primary.twinx()
+
+        # Clear the primary axis as well
+        flipbook.primary.clear()
+
+        # Set the appropriate coordinates format to display on the flipbook
+        if self.secondary_axis:
+            flipbook.primary.set_zorder(1)
+            flipbook.secondary.set_zorder(100)
+            flipbook.secondary.format_coord = flipbook._coordinates(flipbook.secondary, flipbook.primary,
+                                                            self.secondary_axis)
+        if not self.secondary_axis:
+            flipbook.primary.set_zorder(1000)
+            flipbook.primary.format_coord = flipbook._coordinates(flipbook.primary, None, self.secondary_axis)
+
+        # Choose colors for the primary axis - will be iterated-through sequentially
+        y1_colors = ['k', 'b', 'r', 'g', plot_colors['purple'], plot_colors['orange'],
+                    plot_colors['brown']]
+        # Create a copy of the primary axis plot colors
+        y1_plot_colors = y1_colors[:]
+        # Choose colors for the secondary axis - will be iterated-through sequentially
+        y2_colors = [plot_colors['gray'], 'c', plot_colors['pink'], plot_colors['lime'],
+                    'm', plot_colors['gold'], 'y']
+        # Create a copy of the secondary axis plot colors
+        y2_plot_colors = y2_colors[:]
+
+        # Plot the primary axis data for the current plot, keeping track of each
+        # handle and label, as well as the line that each handle represents
+        # The statistics table starts with the x-data, followed by the series of each axis
+        y1_statistics = self.statistics.iloc[1:1+len(self.y1)]
+        y2_statistics = self.statistics.iloc[1+len(self.y1):]
+        # Get the scaling that each axis shows its data with
+        y1_scaling = self.scaling('primary')
+        y2_scaling = self.scaling('secondary')
+        handles, labels, targets = self._plot_series(flipbook.primary, self.y1,
+                                                     self.y1_columns, y1_plot_colors,
+                                                     y1_statistics, y1_scaling)
+        # If there is data to be plotted on the secondary axis, run the following code
+        if self.secondary_axis:
+            y2_handles, y2_labels, y2_targets = self._plot_series(
+                flipbook.secondary, self.y2, self.y2_columns, y2_plot_colors,
+                y2_statistics, y2_scaling)
+            handles += y2_handles
+            labels += y2_labels
+            targets += y2_targets
+
+        # Keep track of the axis, label, values, line and scaling of each series so
+        # that the crosshair can look up their values at any sample
+        axes = [flipbook.primary] * len(self.y1)
+        series = self.y1[:]
+        scalings = [y1_scaling] * len(self.y1)
+        if self.secondary_axis:
+            axes += [flipbook.secondary] * len(self.y2)
+            series += self.y2
+            scalings += [y2_scaling] * len(self.y2)
+        values = [np.asarray(pd.to_numeric(y, errors='coerce'), dtype=float) for y in series]
+        self.cursor_series = list(zip(axes, labels, values, targets, scalings))
+
+        # Determine adequate padding for the x-axis and set the x-axis limits accordingly.
+        # Store the original x-axis limits to allow the user to revert to them if desired.
+        min_x, max_x = y1_scaling.x_extent(*self.x_extent)
+        padding = (max_x - min_x) * (100/90) * (0.05)
+        self.x_lower_original = min_x - padding
+        self.x_upper_original = max_x + padding
+        flipbook.primary.set_xlim(self.x_lower_original, self.x_upper_original)
+        # Store the original y-axis limits to allow the user to revert to them if desired.
+        self.y1_lower_original = flipbook.primary.get_ylim()[0]
+        self.y1_upper_original = flipbook.primary.get_ylim()[1]
+        if self.secondary_axis:
+            self.y2_lower_original = flipbook.secondary.get_ylim()[0]
+            self.y2_upper_original = flipbook.secondary.get_ylim()[1]
+
+        # Turn the grid on, with both major and minor gridlines
+        flipbook.primary.grid(b=True, which='major', color='#666666', linestyle='-', alpha=0.5)
+        flipbook.primary.minorticks_on()
+        flipbook.primary.grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
+        if self.secondary_axis:
+            flipbook.secondary.grid(b=True, which='major', color='#666666', linestyle='-', alpha=0.5)
+
+        # Set the title and labels according to user input
+        title_font = {'weight': self.title_weight.lower(), 'size': self.title_size}
+        flipbook.figure.suptitle(self.title, **title_font)
+        # Set the axis labels
+        x_font = {'weight': self.x_label_weight.lower(), 'size': self.x_label_size}
+        flipbook.primary.set_xlabel(self.x_label, fontdict=x_font)
+        y1_font = {'weight': self.y1_label_weight.lower(), 'size': self.y1_label_size}
+        flipbook.primary.set_ylabel(self.y1_label, fontdict=y1_font)
+        if self.secondary_axis:
+            y2_font = {'weight': self.y2_label_weight.lower(), 'size': self.y2_label_size}
+            flipbook.secondary.set_ylabel(self.y2_label, fontdict=y2_font)
+
+        # Determine the number of series being plotted
+        lines = len(handles)
+        # Specify the maximum number of columns per row in the legend, and calculate
+        # the number of rows accordingly
+        max_columns = 5
+        rows = lines / max_columns
+        # If there will be more than two rows, calculate the number of columns required
+        # to keep the legend at two rows
+        if rows > 2: max_columns = math.ceil(lines / 2)
+        # Create the legend
+        legend = flipbook.primary.legend(
+                        handles = handles,
+                        labels = labels,
+                        loc = 'lower left',
+                        fancybox = True,
+                        shadow = True,
+                        ncol = max_columns,
+                        mode = 'expand',
+                        bbox_to_anchor = (-0.15, -0.2, 1.265, 0.1),
+            )
+        # Make the legend draggable (possibly a control in the future)
+        interaction.make_draggable(legend, flipbook.blitter)
+
+        # Map the items in the legend to its corresponding line
+        self.line_map = {}
+        for legend_line, original_line in zip(legend.get_lines(), targets):
+            legend_line.set_picker(5)
+            self.line_map[legend_line] = original_line
+
+        # ====================
+        # AXES LIMITS CONTROLS
+        # ====================
+
+        # Set each axis limit to the user-specified value. The limits are kept in
+        # the units of the data, so they are scaled just like the data is
+        x_lower, x_upper = y1_scaling.x_limits(self.x_lower, self.x_upper)
+        y1_lower, y1_upper = y1_scaling.y_limits(self.y1_lower, self.y1_upper)
+        if x_lower is not None: flipbook.primary.set_xlim(left=x_lower)
+        if x_upper is not None: flipbook.primary.set_xlim(right=x_upper)
+        if y1_lower is not None: flipbook.primary.set_ylim(bottom=y1_lower)
+        if y1_upper is not None: flipbook.primary.set_ylim(top=y1_upper)
+        if self.secondary_axis:
+            y2_lower, y2_upper = y2_scaling.y_limits(self.y2_lower, self.y2_upper)
+            if y2_lower is not None: flipbook.secondary.set_ylim(bottom=y2_lower)
+            if y2_upper is not None: flipbook.secondary.set_ylim(top=y2_upper)
+
+        # ===================
+        # AXES TICKS CONTROLS
+        # ===================
+
+        # Set a standard number of axis ticks to make it easier to line up the gridlines
+        if self.primary_ticks:
+            PRIMARY = flipbook.primary.get_ylim()
+            flipbook.primary.set_yticks(np.linspace(PRIMARY[0], PRIMARY[1],
+                                        int(self.primary_ticks)))
+        if self.secondary_ticks:
+            SECONDARY = flipbook.secondary.get_ylim()
+            flipbook.secondary.set_yticks(np.linspace(SECONDARY[0], SECONDARY[1],
+                                          int(self.secondary_ticks)))
+
+        # =============================
+        # BACKGROUND SELECTION CONTROLS
+        # =============================
+
+        def set_background(choice):
+            """Set whatever image the user selected as the plot background."""
+
+            # If 'None' is selected, no background is drawn
+            if choice == 'None': path = None
+            # Otherwise, load a background preset
+            elif choice == 'Tactair': path = os.path.join('Assets', 'tactair.bmp')
+            elif choice == 'Young & Franklin': path = os.path.join('Assets', 'yf.bmp')
+            # 'Custom' loads the background from a preset file
+            elif choice == 'Custom': path = self.background_path
+            # Draw the cached image as a layer behind the plot
+            if path is not None: path = backgrounds.resource(path)
+            flipbook.background = backgrounds.draw(flipbook.figure, flipbook.primary,
+                                                   path, flipbook.background)
+
+        # Set the background of the plot
+        set_background(self.background)
+
+        # =======================
+        # TOLERANCE BAND CONTROLS
+        # =======================
+
+        # Iterate through the plus bands of the current plot
+        for p, plus in enumerate(self.plus_bands):
+            # If there are no plus bands, skip to next iteration
+            if not plus: continue
+            # Plot the plus band on the appropriate axis
+            elif plus[0] == 'primary':
+                flipbook.primary.plot(self.x, self._drawn(plus[1]), plot_colors[self.color[p]],
+                                linestyle=self.linestyle[p],
+                                transform=y1_scaling.transform(flipbook.primary))
+            elif plus[0] == 'secondary':
+                flipbook.secondary.plot(self.x, self._drawn(plus[1]), plot_colors[self.color[p]],
+                                linestyle=self.linestyle[p],
+                                transform=y2_scaling.transform(flipbook.secondary))
+        # Iterate through the minus bands of the current plot
+        for m, minus in enumerate(self.minus_bands):
+            # If there are no minus bands, skip to next iteration
+            if not minus: continue
+            # Plot the minus band on the appropriate axis
+            elif minus[0] == 'primary':
+                flipbook.primary.plot(self.x, self._drawn(minus[1]), plot_colors[self.color[m]],
+                                linestyle=self.linestyle[m],
+                                transform=y1_scaling.transform(flipbook.primary))
+            elif minus[0] == 'secondary':
+                flipbook.secondary.plot(self.x, self._drawn(minus[1]), plot_colors[self.color[m]],
+                                linestyle=self.linestyle[m],
+                                transform=y2_scaling.transform(flipbook.secondary))
+
+        # ===================
+        # LIMIT LINE CONTROLS
+        # ===================
+
+        # Iterate through the values list of the limit lines
+        for v, value in enumerate(self.line_value):
+            # If there are no values, skip to next iteration (e.g. blank rows)
+            if not value: continue
+            # Determine the axis to plot the limit line on
+            axis = flipbook.primary if self.line_axis[v] == 'primary' else \
+                ( flipbook.secondary if self.line_axis[v] == 'secondary' and \
+                    self.secondary_axis else None )
+            # Plot the limit line after determining its orientation
+            if self.line_orientation[v] == 'vertical':
+                line = axis.axvline(x=float(self.line_value[v]),
+                            linestyle=self.line_style[v],
+                            color=plot_colors[self.line_color[v]],
+                            alpha=float(self.line_alpha[v]))
+            elif self.line_orientation[v] == 'horizontal':
+                line = axis.axhline(y=float(self.line_value[v]),
+                            linestyle=self.line_style[v],
+                            color=plot_colors[self.line_color[v]],
+                            alpha=float(self.line_alpha[v]))
+            # Allow the limit line to be dragged to a new value
+            interaction.DraggableLine(line, self.line_orientation[v], flipbook.blitter,
+                                      lambda value, v=v: self._move_line(v, value, flipbook))
+
+    def _move_line(self, index, value, flipbook):
+        """Store the new value of a limit line that was dragged, and show it in the
+        controls window."""
+
+        self.line_value[index] = f'{value:g}'
+        if flipbook.controls: flipbook.controls.refresh()
+
+    def limit_statistics(self, index):
+        """Return the exceedance statistics of each series on the axis of the limit
+        line at the specified index as a list of (label, statistics) tuples. Only
+        horizontal lines have statistics.
+
+        The statistics are cached per series and value, so editing or dragging a
+        line only computes the statistics for that line's new value. The line's
+        value is shown on the scaled axis, so it is converted back to the data's
+        value first, and the durations are converted to the scaled x-axis."""
+
+        # Make sure that the line is a horizontal line with a valid value
+        if self.line_orientation[index] != 'horizontal': return []
+        try:
+            value = float(self.line_value[index])
+        except (TypeError, ValueError):
+            return []
+
+        # Determine which series are plotted on the line's axis
+        if self.line_axis[index] == 'primary':
+            columns, series = self.y1_columns, self.y1_full
+        elif self.line_axis[index] == 'secondary' and self.y2_full:
+            columns, series = self.y2_columns, self.y2_full
+        else:
+            return []
+        scaling = self.scaling(self.line_axis[index])
+        value = scaling.y_data(value)
+
+        # Compute the statistics for any series and value that haven't been seen yet
+        statistics = []
+        for column, y in zip(columns, series):
+            label = self.labels[column-1]
+            if (label, value) not in self.exceedances:
+                self.exceedances[(label, value)] = analysis.exceedance(self.x_full, y, value)
+            statistics.append((label, self._scale_exceedance(
+                self.exceedances[(label, value)], scaling)))
+        return statistics
+
+    def _scale_exceedance(self, statistics, scaling):
+        """Convert exceedance statistics of the data to the scaled axes. Durations
+        grow with the x-scale, and a negative y-scale flips above and below."""
+
+        factor = abs(scaling.x_scale)
+        above, below = ('above', 'below') if scaling.y_scale >= 0 else ('below', 'above')
+        return {'crossings': statistics['crossings'],
+                'time above': statistics[f'time {above}'] * factor,
+                'time below': statistics[f'time {below}'] * factor,
+                'longest above': statistics[f'longest {above}'] * factor,
+                'longest below': statistics[f'longest {below}'] * factor}
+
+    def on_click(self, event, flipbook):
+        # An event with a legend artist will be run through separately;
+        # do not execute code in this case
+        if not isinstance(event.artist, mpl.lines.Line2D): return
+        # Neither should picking a limit line, which is dragged instead
+        if event.artist not in self.line_map: return
+        # Get a reference to the legend line and the original line
+        legend_line = event.artist
+        original_line = self.line_map[legend_line]
+        # Determine whether to show or hide the original line
+        visible = not original_line.get_visible()
+        # Set the visibility accordingly
+        original_line.set_visible(visible)
+        legend_line.set_alpha(1.0 if visible else 0.2)
+        # The line is part of the background rather than an animated overlay, so
+        # draw the canvas once to cache the background again with the line toggled
+        flipbook.blitter.redraw()
+
+
+class BatchedSeries:
+    """A single series that was drawn as part of a LineCollection. It can be shown
+    or hidden just like a regular line, which is done by changing the alpha of its
+    segment within the collection."""
+
+    def __init__(self, collection, index):
+        """Initialize the object's attributes."""
+
+        self.collection = collection
+        self.index = index
+        self.alpha = collection.get_colors()[index][3]
+        self.visible = True
+
+    def get_visible(self):
+        return self.visible
+
+    def set_visible(self, visible):
+        self.visible = visible
+        # Change the alpha of only this series's segment
+        colors = self.collection.get_colors().copy()
+        colors[self.index][3] = self.alpha if visible else 0
+        self.collection.set_color(colors)
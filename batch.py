@@ -0,0 +1,115 @@
+import argparse
+import os
+import sys
+
+import configobj
+import matplotlib as mpl
+
+import api
+import report
+
+
+# Image formats that pages can be rendered to
+FORMATS = ['png', 'svg']
+
+
+def load_preset(path):
+    """Return a source for each file in the preset that exists and has a valid
+    type. Files that are skipped are reported on stderr."""
+
+    sources = []
+    for key, info in configobj.ConfigObj(path).items():
+        if not os.path.isfile(info['filepath']):
+            print(f'{path}: skipping {key}, {info["filepath"]} does not exist',
+                  file=sys.stderr)
+        elif info['type'] not in api.TYPES:
+            print(f'{path}: skipping {key}, {info["type"]} is not a valid type',
+                  file=sys.stderr)
+        else:
+            sources.append(api.preset_source(info))
+    return sources
+
+
+def render(preset, output, formats, dpi=100, pdf=False):
+    """Render every page of the preset into the output directory, and optionally
+    a PDF report of every page. Returns the number of pages that failed."""
+
+    failures = 0
+    name = os.path.splitext(os.path.basename(preset))[0]
+
+    # Generate the plots of every file, leaving out any file that can't be read
+    sources = []
+    for source in load_preset(preset):
+        try:
+            source.generate()
+        except Exception as error:
+            print(f'{preset}: unable to generate {source.filepath}: {error}',
+                  file=sys.stderr)
+            failures += len(source.plots)
+            continue
+        sources.append(source)
+
+    flipbook = api.OffscreenFlipbook(sources, dpi=dpi)
+    for page in range(flipbook.pages):
+        source = sources[flipbook.files[page]]
+        stem = os.path.splitext(source.filename)[0]
+        base = f'{name}_{page+1:03d}_{stem}_plot{flipbook.numbers[page]+1}'
+        paths = [os.path.join(output, f'{base}.{extension}') for extension in formats]
+        try:
+            flipbook.save(page, paths)
+        except Exception as error:
+            print(f'{preset}: unable to render page {page+1}: {error}', file=sys.stderr)
+            failures += 1
+            continue
+        for path in paths: print(path)
+
+    # Write the report after the images so that a failed page doesn't stop them
+    if pdf:
+        path = os.path.join(output, f'{name}.pdf')
+        try:
+            report.write(path, flipbook, dpi=max(dpi, 150))
+        except Exception as error:
+            print(f'{preset}: unable to write the report: {error}', file=sys.stderr)
+            failures += 1
+        else:
+            print(path)
+
+    return failures
+
+
+def main(arguments=None):
+    """Render the pages of each preset from the command line."""
+
+    parser = argparse.ArgumentParser(
+        description='Render every page of one or more presets to image files or '
+                    'PDF reports, without opening any windows.')
+    parser.add_argument('presets', nargs='+', help='preset (.ini) files to render')
+    parser.add_argument('-o', '--output', default='.',
+                        help='directory to write the images to')
+    parser.add_argument('-f', '--format', action='append', choices=FORMATS,
+                        dest='formats', help='image format; may be repeated '
+                                             '(default: png, unless a report '
+                                             'is requested)')
+    parser.add_argument('-r', '--report', action='store_true',
+                        help='also write a PDF report of every page of each '
+                             'preset, with pass/fail and band summaries')
+    parser.add_argument('--dpi', type=int, default=100,
+                        help='resolution of the images (default: 100)')
+    arguments = parser.parse_args(arguments)
+
+    # Pages are drawn on their own Agg canvases, but make sure that nothing else
+    # tries to open a window either. This is done here rather than on import so
+    # that importing this module from the GUI leaves its backend alone.
+    mpl.use('Agg')
+
+    os.makedirs(arguments.output, exist_ok=True)
+    failures = 0
+    formats = arguments.formats or ([] if arguments.report else ['png'])
+    for preset in arguments.presets:
+        failures += render(preset, arguments.output, formats, arguments.dpi,
+                           arguments.report)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import parsing
+
+
+def _modified(path):
+    """Return the modification time of the file, or None if it cannot be found."""
+
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class Header:
+    """The labels of a basic data file, along with an index from each label to the
+    columns that have it. Columns are numbered from 1, just like in the fields."""
+
+    def __init__(self, path, labels):
+        """Store the labels and index them."""
+
+        self.path = path
+        self.filename = path.split('/')[-1]
+        self.labels = [str(label).strip() for label in labels]
+        self.index = {}
+        for column, label in enumerate(self.labels, start=1):
+            self.index.setdefault(label, []).append(column)
+
+    @property
+    def columns(self):
+        """The number of columns in the file."""
+
+        return len(self.labels)
+
+    def find(self, label):
+        """Return the columns that have the label."""
+
+        return self.index.get(str(label).strip(), [])
+
+    def complete(self, text, limit=20):
+        """Return the (column, label) of every column whose label contains the text,
+        ignoring case. Labels that start with the text are listed first."""
+
+        text = text.strip().lower()
+        starts, contains = [], []
+        for column, label in enumerate(self.labels, start=1):
+            lowered = label.lower()
+            if lowered.startswith(text): starts.append((column, label))
+            elif text in lowered: contains.append((column, label))
+        return (starts + contains)[:limit]
+
+
+def read(path, label_row):
+    """Read the header of a basic data file, without reading any of its data."""
+
+    return Header(path, parsing.labels(path, parsing.filetype(path), label_row))
+
+
+class Catalog:
+    """The headers of every loaded file, read on a pool of threads so that the
+    headers of hundreds of files are read at once.
+
+    Only the label row of each file is read, so columns can be checked and picked
+    by name long before the data is read. Headers are kept until their file is
+    modified or a different label row is used."""
+
+    def __init__(self, workers=8):
+        """Start the pool of threads."""
+
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = {}
+        self.lock = threading.Lock()
+
+    def scan(self, path, label_row):
+        """Start reading the header of the file in the background, unless it has
+        been read already. Returns a future of the header."""
+
+        key = (path, _modified(path), label_row)
+        with self.lock:
+            if key not in self.futures:
+                # Forget the headers that were read from an older copy of the file
+                for old in [old for old in self.futures if old[0] == path]:
+                    del(self.futures[old])
+                self.futures[key] = self.executor.submit(read, path, label_row)
+            return self.futures[key]
+
+    def header(self, path, label_row):
+        """Return the header of the file, waiting for it to be read if necessary.
+        Raises whatever error kept the header from being read."""
+
+        return self.scan(path, label_row).result()
+
+    def ready(self, path, label_row):
+        """Return the header of the file if it has already been read, otherwise
+        start reading it and return None. Never waits."""
+
+        future = self.scan(path, label_row)
+        if not future.done() or future.exception() is not None: return None
+        return future.result()
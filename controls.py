@@ -4,6 +4,7 @@ import re
 import tkinter as tk
 from tkinter import colorchooser as cc
 from tkinter import filedialog as fd
+from tkinter import messagebox as msg
 from tkinter import ttk
 
 import lemons.gui as gui
@@ -11,6 +12,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+import analysis
+import decimation
 from settings import plot_colors
 
 
@@ -260,6 +263,161 @@ class AxisTicks(tk.Frame):
         self.secondary_ticks_entry.set(value[0] if value[0] else value[1])
 
 
+class AxisScaling(tk.Frame):
+
+    def __init__(self, *args, **kwargs):
+
+        tk.Frame.__init__(self, *args, **kwargs)
+
+        # Define amount of padding to use around widgets
+        PADDING = 10
+
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        # Add the title of the section
+        scaling_title = tk.Label(self, text='Axis Scaling',
+                         font=('TkDefaultFont', 10, 'bold'))
+        scaling_title.grid(row=0, column=0, pady=(0, 10), sticky='W')
+        # Create the x-axis scale and offset entries
+        self.x_scale_entry = LabeledEntry(self, 'x-scale:')
+        self.x_scale_entry.grid(row=1, column=0, padx=PADDING, sticky='NSEW')
+        self.x_offset_entry = LabeledEntry(self, 'x-offset:')
+        self.x_offset_entry.grid(row=1, column=1, padx=PADDING, sticky='NSEW')
+        # Add some vertical spacing between widgets
+        gui.Space(self, row=2, column=0, columnspan=2)
+        # Create the y1-axis scale and offset entries
+        self.y1_scale_entry = LabeledEntry(self, 'y1-scale:')
+        self.y1_scale_entry.grid(row=3, column=0, padx=PADDING, sticky='NSEW')
+        self.y1_offset_entry = LabeledEntry(self, 'y1-offset:')
+        self.y1_offset_entry.grid(row=3, column=1, padx=PADDING, sticky='NSEW')
+        # Add some vertical spacing between widgets
+        gui.Space(self, row=4, column=0, columnspan=2)
+        # Create the y2-axis scale and offset entries
+        self.y2_scale_entry = LabeledEntry(self, 'y2-scale:')
+        self.y2_scale_entry.grid(row=5, column=0, padx=PADDING, sticky='NSEW')
+        self.y2_offset_entry = LabeledEntry(self, 'y2-offset:')
+        self.y2_offset_entry.grid(row=5, column=1, padx=PADDING, sticky='NSEW')
+        # Create a checkbutton that zeroes the x-axis, which replaces the x-offset
+        self.zero = tk.IntVar()
+        zero_checkbutton = ttk.Checkbutton(self, text='Zero x-axis', takefocus=0,
+                                           variable=self.zero)
+        zero_checkbutton.grid(row=6, column=0, padx=PADDING, pady=(10, 0), sticky='W')
+
+    @property
+    def x_scale(self):
+        return float(self.x_scale_entry.get() or 1)
+
+    @x_scale.setter
+    def x_scale(self, value):
+        self.x_scale_entry.set(f'{value:g}')
+
+    @property
+    def x_offset(self):
+        return float(self.x_offset_entry.get() or 0)
+
+    @x_offset.setter
+    def x_offset(self, value):
+        self.x_offset_entry.set(f'{value:g}')
+
+    @property
+    def y1_scale(self):
+        return float(self.y1_scale_entry.get() or 1)
+
+    @y1_scale.setter
+    def y1_scale(self, value):
+        self.y1_scale_entry.set(f'{value:g}')
+
+    @property
+    def y1_offset(self):
+        return float(self.y1_offset_entry.get() or 0)
+
+    @y1_offset.setter
+    def y1_offset(self, value):
+        self.y1_offset_entry.set(f'{value:g}')
+
+    @property
+    def y2_scale(self):
+        return float(self.y2_scale_entry.get() or 1)
+
+    @y2_scale.setter
+    def y2_scale(self, value):
+        self.y2_scale_entry.set(f'{value:g}')
+
+    @property
+    def y2_offset(self):
+        return float(self.y2_offset_entry.get() or 0)
+
+    @y2_offset.setter
+    def y2_offset(self, value):
+        self.y2_offset_entry.set(f'{value:g}')
+
+    @property
+    def zero_x(self):
+        return bool(self.zero.get())
+
+    @zero_x.setter
+    def zero_x(self, value):
+        self.zero.set(bool(value))
+
+
+class Decimation(tk.Frame):
+
+    def __init__(self, *args, **kwargs):
+
+        tk.Frame.__init__(self, *args, **kwargs)
+
+        # Define amount of padding to use around widgets
+        PADDING = 10
+
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        # Add the title of the section
+        decimation_title = tk.Label(self, text='Decimation',
+                         font=('TkDefaultFont', 10, 'bold'))
+        decimation_title.grid(row=0, column=0, pady=(0, 10), sticky='W')
+        # Create the decimation mode combobox and the number of points entry
+        self.mode_combobox = LabeledCombobox(self, 'Mode:', decimation.MODES)
+        self.mode_combobox.grid(row=1, column=0, padx=PADDING, sticky='NSEW')
+        self.points_entry = LabeledEntry(self, 'Points per series:')
+        self.points_entry.grid(row=1, column=1, padx=PADDING, sticky='NSEW')
+        # Create a label that shows how much the data was reduced and how long it took
+        self.summary = tk.StringVar()
+        summary_label = tk.Label(self, textvariable=self.summary, anchor='w')
+        summary_label.grid(row=2, column=0, columnspan=2, padx=PADDING, pady=(10, 0),
+                           sticky='W')
+
+    def show(self, reduction, seconds):
+        """Show the number of points before and after decimation, along with the
+        time it took to decimate them."""
+
+        if not reduction:
+            self.summary.set('')
+            return
+        before, after = reduction
+        if before == after:
+            self.summary.set(f'{before:,} points, not reduced')
+            return
+        duration = f' in {seconds*1000:.1f} ms' if seconds is not None else ''
+        self.summary.set(f'{before:,} → {after:,} points '
+                         f'({before / max(after, 1):.1f}x){duration}')
+
+    @property
+    def mode(self):
+        return self.mode_combobox.get() or 'None'
+
+    @mode.setter
+    def mode(self, value):
+        self.mode_combobox.set(value)
+
+    @property
+    def points(self):
+        return int(float(self.points_entry.get() or 0))
+
+    @points.setter
+    def points(self, value):
+        self.points_entry.set(value)
+
+
 class GeneralAppearance(tk.Frame):
 
     def __init__(self, master, *args, **kwargs):
@@ -451,9 +609,12 @@ class ToleranceBands(tk.Frame):
     """Creates a GUI frame that can hold a dynamic amount of rows for
     tolerance band fields. Keeps track of inputs and band data as well."""
 
-    def __init__(self):
+    def __init__(self, plot=None):
         """Initialize the object's attributes."""
 
+        # Keep a reference to the plot that the bands belong to
+        self.plot = plot
+
         # Initialize/reset the object's attributes
         self.reset()
 
@@ -485,6 +646,16 @@ class ToleranceBands(tk.Frame):
                                    command=self.delete_band)
         delete_button.grid(row=0, column=2)
 
+        # Add a button that exports the excursions from the bands
+        export_button = ttk.Button(controls, text='Export', width=7, takefocus=0,
+                                   command=self.export_events)
+        export_button.grid(row=0, column=3, padx=(5, 0))
+
+        # Add a button that estimates the lag of each row from the data
+        estimate_button = ttk.Button(controls, text='Estimate lag', takefocus=0,
+                                     command=self.estimate_lags)
+        estimate_button.grid(row=0, column=4, padx=(5, 0))
+
     def reset(self):
         """Reset the attributes of the object to their default states. Called
         whenever a Tolerance Bands object is created or recreated."""
@@ -504,11 +675,14 @@ class ToleranceBands(tk.Frame):
         self.lag_entries = []
         self.color_combos = []
         self.linestyle_combos = []
+        self.summaries = []
         # Reset the values that appear in the series combobox
         self.values = None
         # Clear the data for the plus tolerance and minus tolerance bands
         self.plus_bands = []
         self.minus_bands = []
+        # Clear the table of excursions from the bands
+        self.events = None
 
     def recreate(self, rows):
         """Recreates the rows that were previously in the Tolerance Bands object
@@ -519,6 +693,7 @@ class ToleranceBands(tk.Frame):
         # them in a backup variable for now
         self.minus_backup = self.minus_bands
         self.plus_backup = self.plus_bands
+        self.events_backup = self.events
         # Reset the object's attributes
         self.reset()
         # Add as many rows as there were before the page was flipped
@@ -527,6 +702,10 @@ class ToleranceBands(tk.Frame):
         # Set the minus and plus band data back to what they were before the reset
         self.minus_bands = self.minus_backup
         self.plus_bands = self.plus_backup
+        self.events = self.events_backup
+        # Show the excursions of each row again now that the data is back
+        for row, summary in enumerate(self.summaries):
+            summary.set(self.summarize(row))
 
     def add_band(self, recreate=None):
         """Add a row to the Tolerance Bands object."""
@@ -610,6 +789,13 @@ class ToleranceBands(tk.Frame):
         lag_entry.grid(row=3, column=2, padx=PADDING)
         self.lag_entries.append(lag_entry)
 
+        # Add a label that summarizes the excursions from the bands
+        summary = tk.StringVar()
+        summary_label = ttk.Label(container, textvariable=summary)
+        summary_label.grid(row=4, column=0, columnspan=3, padx=PADDING,
+                           pady=(5, 0), sticky='W')
+        self.summaries.append(summary)
+
         # If this method was not called by the recreate function, add filler
         # data to the plus bands and minus bands data lists
         if not recreate:
@@ -638,6 +824,7 @@ class ToleranceBands(tk.Frame):
         del(self.minus_tolerance_entries[-1])
         del(self.plus_tolerance_entries[-1])
         del(self.lag_entries[-1])
+        del(self.summaries[-1])
         del(self.minus_bands[-1])
         del(self.plus_bands[-1])
         # Decrease the row count by one
@@ -678,50 +865,22 @@ class ToleranceBands(tk.Frame):
             # Grab the selected series from the appropriate series combobox
             series = self.series_combos[iterator].get()
 
-            # Find the index of the selection within the list of the current plot's labels
-            index = plot.labels.index(series)
-
-            # Determine which axis the series is plotted on and then determine the index
-            # of the series within that axis's column list
-            if index + 1 in plot.y1_columns:
-                axis = 'primary'
-                position = plot.y1_columns.index(index + 1)
-            else:
-                axis = 'secondary'
-                position = plot.y2_columns.index(index + 1)
-
-            # Get a reference to the x-data and y-data
-            x = plot.x
-            if axis == 'primary':
-                y = plot.y1[position]
-            elif axis == 'secondary':
-                y = plot.y2[position]
-
-            # Define the lookback range
-            resolution = x[1] - x[0]
-            lookback = round(LAG / resolution)
-
-            # Iterate through the y-data and begin tolerance bands calculations once the
-            # index is greater than the lookback range. Essentially, The lookback range
-            # accounts for the lag/time shift, and then the appropriate tolerance is added
-            # or subtracted on top of that. The tolerance band data will be of the same
-            # length as the y-data, but the first few values may be None.
-            band = []
-            # for i, c in enumerate(y):
-            for i in range(len(y)):
-                if i >= lookback:
-                    if which == '+':
-                        # Get the maximum value in the lookback range and add tolerance
-                        maximum = max(y.loc[i-lookback:i])
-                        toleranced = maximum + PLUS_TOLERANCE
-                    elif which == '-':
-                        # Get the minimum value in the lookback range and subtract tolerance
-                        minimum = min(y.loc[i-lookback:i])
-                        toleranced = minimum - MINUS_TOLERANCE
-                    band.append(toleranced)
-                else:
-                    # Don't want to plot any values before a lookback can be done
-                    band.append(None)
+            # Get a reference to the x-data and y-data, and the axis of the series,
+            # using all of the data rather than the decimated data that is drawn
+            x = plot.x_full
+            axis, y = self._locate(plot, series)
+
+            # Take the maximum or minimum over the lag window ending at each point, then
+            # add or subtract the appropriate tolerance on top of that. Essentially, the
+            # window accounts for the lag/time shift. The window spans a distance along
+            # the x-axis rather than a number of samples, so the bands stay correct for
+            # data that isn't sampled at a constant rate. The tolerance band data will
+            # be of the same length as the y-data, but the first few values may be NaN
+            # since the window reaches back past the start of the data for them.
+            if which == '+':
+                band = analysis.windowed_max(x, y, LAG) + PLUS_TOLERANCE
+            elif which == '-':
+                band = analysis.windowed_min(x, y, LAG) - MINUS_TOLERANCE
 
             # Return the axis that the series on plotted on as well as the band data
             return (axis, band)
@@ -731,6 +890,103 @@ class ToleranceBands(tk.Frame):
             self.plus_bands[i] = BandData(i, which='+')
             self.minus_bands[i] = BandData(i, which='-')
 
+        # Find where the plotted series leave the bands and summarize each row
+        self.events = self.detect(plot)
+        for row, summary in enumerate(self.summaries):
+            summary.set(self.summarize(row))
+
+    def _locate(self, plot, series):
+        """Return the axis that the series is plotted on, along with all of its
+        data, i.e. before it was decimated."""
+
+        # Find the index of the selection within the list of the current plot's labels
+        index = plot.labels.index(series)
+
+        # Determine which axis the series is plotted on and then determine the index
+        # of the series within that axis's column list
+        if index + 1 in plot.y1_columns:
+            return 'primary', plot.y1_full[plot.y1_columns.index(index + 1)]
+        return 'secondary', plot.y2_full[plot.y2_columns.index(index + 1)]
+
+    def estimate_lags(self):
+        """Estimate the lag of each row as the delay between its series and the other
+        series on the same axis, then fill in the lag entries with the estimates."""
+
+        plot = self.plot
+        if plot is None or plot.x_full is None: return
+
+        # Get a reference to the columns and data that are plotted on each axis
+        columns = {'primary': plot.y1_columns, 'secondary': plot.y2_columns or []}
+        data = {'primary': plot.y1_full, 'secondary': plot.y2_full or []}
+
+        for i, combo in enumerate(self.series_combos):
+            series = combo.get()
+            if not series: continue
+            axis, command = self._locate(plot, series)
+            # Use the largest delay so that the band covers every response
+            lags = [analysis.estimate_lag(plot.x_full, command, response)
+                    for column, response in zip(columns[axis], data[axis])
+                    if plot.labels[column-1] != series]
+            lags = [lag for lag in lags if lag is not None]
+            if not lags: continue
+            self.lag_entries[i].delete(0, 'end')
+            self.lag_entries[i].insert(0, f'{max(max(lags), 0):g}')
+
+    def detect(self, plot):
+        """Find where each series leaves the tolerance bands that are plotted on its
+        axis, and return a table of the excursions along with the band and series
+        that each one belongs to. A band is not checked against the series that it
+        was calculated from, since the band always contains that series."""
+
+        # Get a reference to the columns and data that are plotted on each axis
+        columns = {'primary': plot.y1_columns, 'secondary': plot.y2_columns or []}
+        data = {'primary': plot.y1_full, 'secondary': plot.y2_full or []}
+
+        # Check every other series on the band's axis against the band
+        tables = []
+        for i, (plus, minus) in enumerate(zip(self.plus_bands, self.minus_bands)):
+            if not plus or not minus: continue
+            axis = plus[0]
+            for column, y in zip(columns[axis], data[axis]):
+                label = plot.labels[column-1]
+                if label == self.series_combos[i].get(): continue
+                table = analysis.excursions(plot.x_full, y, plus[1], minus[1])
+                table.insert(0, 'series', label)
+                table.insert(0, 'band', i + 1)
+                tables.append(table)
+
+        # Return None if there were no bands to check
+        if not tables: return None
+        return pd.concat(tables, ignore_index=True)
+
+    def summarize(self, row):
+        """Return a line of text that counts the excursions from the bands of the
+        specified row."""
+
+        if self.events is None: return ''
+        events = self.events[self.events['band'] == row + 1]
+        above = int((events['side'] == 'above').sum())
+        below = int((events['side'] == 'below').sum())
+        text = f'excursions: {above} above, {below} below'
+        if len(events):
+            text += f' (largest: {events["peak excursion"].max():g})'
+        return text
+
+    def export_events(self):
+        """Save the table of excursions from the bands to a CSV file."""
+
+        # Let the user know if there is nothing to export
+        if self.events is None:
+            msg.showinfo(title='Nothing to export',
+                         message='Press Update to calculate the tolerance bands first.')
+            return
+
+        # Ask the user where to save the file, then save it if they chose somewhere
+        path = fd.asksaveasfilename(title='Export excursions',
+                                    defaultextension='.csv',
+                                    filetypes=[('CSV files', '*.csv')])
+        if path: self.events.to_csv(path, index=False)
+
     @property
     def series(self):
         """Iterates through each row and returns a list of series combobox selections."""
@@ -844,6 +1100,106 @@ class ToleranceBands(tk.Frame):
         self.minus_bands = bands
 
 
+class ReferenceBands(tk.Frame):
+    """Creates a GUI frame with the fields needed to compare every loaded file
+    against an envelope around a column of the current file."""
+
+    def __init__(self, master, command, *args, **kwargs):
+
+        tk.Frame.__init__(self, master, *args, **kwargs)
+
+        # Keep track of the series that can be selected as the reference
+        self.values = []
+
+        # Define amount of padding to use around widgets
+        PADDING = 10
+
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        # Add the title of the section
+        reference_title = tk.Label(self, text='Reference Comparison',
+                         font=('TkDefaultFont', 10, 'bold'))
+        reference_title.grid(row=0, column=0, pady=(0, 10), sticky='W')
+        # Create a combobox to select the reference column
+        self.series_combobox = LabeledCombobox(self, 'Reference column:', [])
+        self.series_combobox.grid(row=1, column=0, padx=PADDING, sticky='NSEW')
+        # Create a label and an entry for the lag
+        self.lag_entry = LabeledEntry(self, 'Lag:')
+        self.lag_entry.grid(row=1, column=1, padx=PADDING, sticky='NSEW')
+        # Add some vertical spacing between widgets
+        gui.Space(self, row=2, column=0, columnspan=2)
+        # Create labels and entries for the plus and minus tolerances
+        self.plus_tolerance_entry = LabeledEntry(self, '+tolerance:')
+        self.plus_tolerance_entry.grid(row=3, column=0, padx=PADDING, sticky='NSEW')
+        self.minus_tolerance_entry = LabeledEntry(self, '-tolerance:')
+        self.minus_tolerance_entry.grid(row=3, column=1, padx=PADDING, sticky='NSEW')
+        # Create the button that runs the comparison
+        compare_button = ttk.Button(self, text='Compare', takefocus=0,
+                                    command=command)
+        compare_button.grid(row=4, column=1, padx=PADDING, pady=(10, 0), sticky='E')
+
+    def update_series(self, values):
+        """Update the reference column choices with the currently plotted series,
+        along with a choice that selects all of them."""
+
+        self.values = values
+        self.series_combobox['values'] = ['All plotted series'] + values
+        if self.series_combobox.get() not in self.series_combobox['values']:
+            self.series_combobox.clear()
+
+    @property
+    def series(self):
+        """Returns a list of the selected reference columns."""
+
+        selection = self.series_combobox.get()
+        if selection == 'All plotted series': return list(self.values)
+        return [selection] if selection else []
+
+    @property
+    def plus_tolerance(self):
+        return float(self.plus_tolerance_entry.get() or 0)
+
+    @property
+    def minus_tolerance(self):
+        return float(self.minus_tolerance_entry.get() or 0)
+
+    @property
+    def lag(self):
+        return float(self.lag_entry.get() or 0)
+
+
+class SeriesStatistics(tk.Frame):
+    """Creates a GUI frame with a table of the statistics of each plotted series."""
+
+    def __init__(self, *args, **kwargs):
+
+        tk.Frame.__init__(self, *args, **kwargs)
+        self.columnconfigure(0, weight=1)
+        # Add the title of the section
+        statistics_title = tk.Label(self, text='Statistics',
+                         font=('TkDefaultFont', 10, 'bold'))
+        statistics_title.grid(row=0, column=0, pady=(0, 10), sticky='W')
+        # Create a table with a row for each series and a column for each statistic
+        columns = ['min', 'max', 'mean', 'std', 'rms', 'missing']
+        self.table = ttk.Treeview(self, columns=columns, height=5)
+        self.table.heading('#0', text='series')
+        self.table.column('#0', width=100)
+        for column in columns:
+            self.table.heading(column, text=column)
+            self.table.column(column, width=60, anchor='e')
+        self.table.grid(row=1, column=0, sticky='NSEW')
+
+    def show(self, statistics):
+        """Fill the table with the rows of the statistics table."""
+
+        self.table.delete(*self.table.get_children())
+        if statistics is None: return
+        for label, row in statistics.iterrows():
+            values = [f'{row[column]:.4g}' for column in self.table['columns'][:-1]]
+            values.append(int(row['missing']))
+            self.table.insert('', 'end', text=label, values=values)
+
+
 class LimitLines(tk.Frame):
     """Creates a GUI frame that can hold a dynamic amount of rows for
     horizontal line fields. Keeps track of inputs."""
@@ -902,6 +1258,7 @@ class LimitLines(tk.Frame):
         self.color_combos = []
         self.linestyle_combos = []
         self.alpha_entries = []
+        self.summaries = []
 
     def recreate(self, rows):
         """Recreates the rows that were previously in the Limit Lines object
@@ -999,6 +1356,13 @@ class LimitLines(tk.Frame):
         alpha_entry.grid(row=3, column=2, padx=PADDING)
         self.alpha_entries.append(alpha_entry)
 
+        # Add a label that summarizes how each series behaves relative to the line
+        summary = tk.StringVar()
+        summary_label = ttk.Label(container, textvariable=summary, justify='left')
+        summary_label.grid(row=4, column=0, columnspan=3, padx=PADDING,
+                           pady=(5, 0), sticky='W')
+        self.summaries.append(summary)
+
         # Add one to the row count and keep a reference to this row
         self.count += 1
         self.lines.append(frame)
@@ -1022,9 +1386,20 @@ class LimitLines(tk.Frame):
         del(self.color_choices[-1])
         del(self.color_combos[-1])
         del(self.alpha_entries[-1])
+        del(self.summaries[-1])
         # Decrease the row count by one
         self.count -= 1
 
+    def show_statistics(self, row, statistics):
+        """Show the exceedance statistics of each series in the specified row. The
+        statistics are a list of (label, statistics) tuples."""
+
+        lines = [f"{label}: {stats['crossings']} crossings, "
+                 f"{stats['time above']:g} above (longest {stats['longest above']:g}), "
+                 f"{stats['time below']:g} below (longest {stats['longest below']:g})"
+                 for label, stats in statistics]
+        self.summaries[row].set('\n'.join(lines))
+
     @property
     def axis(self):
         """Iterates through each row and returns a list of axis combobox selections."""
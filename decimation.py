@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+
+MODES = ['None', 'Min-max', 'LTTB', 'Every Nth']
+
+
+def _as_float(values):
+    """Return the values as a float array, with anything that isn't a number as
+    NaN. Values that can't be converted at all, such as dates, return None."""
+
+    try:
+        return np.asarray(pd.to_numeric(values, errors='coerce'), dtype=float)
+    except (TypeError, ValueError):
+        return None
+
+
+def _buckets(values, size, fill):
+    """Split the values into rows of the specified size, filling the end of the
+    last row with the fill value. Returns a 2D array with a row per bucket."""
+
+    remainder = (-len(values)) % size
+    if remainder:
+        values = np.concatenate([values, np.full(remainder, fill)])
+    return values.reshape(-1, size)
+
+
+def stride(count, points):
+    """Return the indices of every Nth sample, where N is chosen so that roughly
+    the specified number of points are kept. The last sample is always kept."""
+
+    step = -(-count // points)
+    indices = np.arange(0, count, step)
+    if indices[-1] != count - 1:
+        indices = np.append(indices, count - 1)
+    return indices
+
+
+def min_max(y, points):
+    """Return the indices of the minimum and maximum of each bucket, along with
+    the first and last samples. Half as many buckets as points are used, so the
+    envelope of the data is kept exactly, including every spike."""
+
+    count = len(y)
+    size = -(-count // max(points // 2, 1))
+    # Treat NaNs as the opposite extreme so they are never picked over a number
+    lows = _buckets(np.where(np.isnan(y), np.inf, y), size, np.inf)
+    highs = _buckets(np.where(np.isnan(y), -np.inf, y), size, -np.inf)
+    starts = np.arange(len(lows)) * size
+    indices = np.concatenate([starts + lows.argmin(axis=1),
+                              starts + highs.argmax(axis=1), [0, count - 1]])
+    return np.unique(np.minimum(indices, count - 1))
+
+
+def lttb(x, y, points):
+    """Return the indices picked by the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last samples are always kept, and the samples between them are
+    split into equally sized buckets. From each bucket, the sample that forms the
+    largest triangle with the sample picked from the previous bucket and the mean
+    of the next bucket is kept. The buckets and their means are computed all at
+    once; only picking a sample depends on the previous pick, so that step runs
+    once per bucket over the bucket's own row."""
+
+    count = len(y)
+    if points < 3 or count <= points: return np.arange(count)
+
+    # Split the samples between the first and last into buckets
+    size = -(-(count - 2) // (points - 2))
+    xs = _buckets(x[1:-1], size, np.nan)
+    ys = _buckets(y[1:-1], size, np.nan)
+
+    # Compute the mean of each bucket, ignoring NaNs, with the last sample acting as
+    # the bucket after the last one
+    valid = np.isfinite(xs) & np.isfinite(ys)
+    counts = np.maximum(valid.sum(axis=1), 1)
+    x_means = np.append(np.where(valid, xs, 0).sum(axis=1) / counts, x[-1])
+    y_means = np.append(np.where(valid, ys, 0).sum(axis=1) / counts, y[-1])
+
+    # Pick the sample of each bucket that forms the largest triangle
+    picks = np.empty(len(xs), dtype=np.int64)
+    a_x, a_y = x[0], y[0]
+    for bucket in range(len(xs)):
+        c_x, c_y = x_means[bucket+1], y_means[bucket+1]
+        areas = np.abs((a_x - c_x) * (ys[bucket] - a_y) - (a_x - xs[bucket]) * (c_y - a_y))
+        pick = int(np.argmax(np.where(np.isfinite(areas), areas, -1)))
+        picks[bucket] = pick
+        a_x, a_y = xs[bucket, pick], ys[bucket, pick]
+        # Keep the previous point if the picked sample was missing
+        if not np.isfinite(a_x) or not np.isfinite(a_y):
+            a_x, a_y = x_means[bucket], y_means[bucket]
+
+    indices = 1 + np.arange(len(xs)) * size + picks
+    indices = np.concatenate([[0], indices[indices < count - 1], [count - 1]])
+    return np.unique(indices)
+
+
+def decimate(x, series, mode, points):
+    """Return the sorted indices of the samples to keep so that the series, which
+    all share the same x-data, are drawn with roughly the specified number of
+    points each. Since the series share the x-data, the samples kept for each one
+    are combined, so a plot with several series may keep more points in total.
+    Returns None if the data does not need to be reduced, or if the number of
+    points isn't positive."""
+
+    count = len(x)
+    if mode not in MODES[1:] or not points or points < 1 or count <= points:
+        return None
+
+    if mode == 'Every Nth':
+        return stride(count, points)
+
+    # Fall back to the position of each sample if the x-data isn't numeric
+    x_values = _as_float(x)
+    if x_values is None: x_values = np.arange(count, dtype=float)
+
+    indices = []
+    for y in series:
+        y_values = _as_float(y)
+        if y_values is None: continue
+        if mode == 'Min-max':
+            indices.append(min_max(y_values, points))
+        elif mode == 'LTTB':
+            indices.append(lttb(x_values, y_values, points))
+    if not indices: return stride(count, points)
+    return np.unique(np.concatenate(indices))
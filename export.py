@@ -0,0 +1,84 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import api
+
+
+def _render(plot, path, dpi):
+    """Draw a single plot on its own offscreen flipbook and save it. Runs in a
+    worker process, which receives a copy of the plot with all of its settings."""
+
+    api.save(plot, [path], dpi=dpi)
+    return path
+
+
+def numbered(path, count):
+    """Return a numbered path for each of the pages, based on the path that the
+    user chose, e.g. plots.png becomes plots_001.png, plots_002.png, etc."""
+
+    base, extension = os.path.splitext(path)
+    digits = max(3, len(str(count)))
+    return [f'{base}_{number:0{digits}d}{extension}' for number in range(1, count+1)]
+
+
+class Export:
+    """Renders a list of pages to numbered image files on a pool of processes, so
+    that the pages are drawn on every core at once.
+
+    Each page is a generated plot. The plots are copied to the workers
+    along with everything that has been set in the controls window, e.g. limits,
+    bands, limit lines and styles. Progress can be polled from the GUI while the
+    pages are rendering."""
+
+    def __init__(self, pages, path, dpi=100, workers=None):
+        """Start rendering every page in the background."""
+
+        self.paths = numbered(path, len(pages))
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+        self.futures = [self.executor.submit(_render, plot, page_path, dpi)
+                        for plot, page_path in zip(pages, self.paths)]
+        # Let the workers exit on their own once the last page is done
+        self.executor.shutdown(wait=False)
+
+    @property
+    def total(self):
+        """The number of pages being exported."""
+
+        return len(self.futures)
+
+    @property
+    def completed(self):
+        """The number of pages that are finished, including failed and cancelled
+        pages."""
+
+        return sum(future.done() for future in self.futures)
+
+    @property
+    def finished(self):
+        """Whether every page is finished."""
+
+        return self.completed == self.total
+
+    @property
+    def failures(self):
+        """A list of (path, error) tuples for every page that failed to render."""
+
+        failures = []
+        for path, future in zip(self.paths, self.futures):
+            if not future.done() or future.cancelled(): continue
+            error = future.exception()
+            if error is not None: failures.append((path, error))
+        return failures
+
+    @property
+    def cancelled(self):
+        """The number of pages that were cancelled before they started."""
+
+        return sum(future.cancelled() for future in self.futures)
+
+    def cancel(self):
+        """Cancel every page that has not started rendering yet. Pages that are
+        already rendering are allowed to finish."""
+
+        for future in self.futures:
+            future.cancel()
@@ -0,0 +1,348 @@
+import numpy as np
+from matplotlib.legend import DraggableLegend
+from matplotlib.lines import Line2D
+
+
+class Blitter:
+    """Keeps a copy of the canvas as it looks without its animated artists, so that
+    interactive elements such as the legend can be redrawn on top of the copy
+    instead of redrawing all of the data underneath them."""
+
+    def __init__(self, canvas):
+        """Initialize the object's attributes and start listening for draws."""
+
+        self.canvas = canvas
+
+        # Keep track of the animated artists and the event connections that belong
+        # to the current page
+        self.artists = []
+        self.connections = []
+
+        # Keep track of the cached background and the size it was cached at
+        self.background = None
+        self.size = None
+
+        # Recache the background every time the whole canvas is drawn
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add(self, artist):
+        """Animate the artist so that it is left out of the cached background."""
+
+        if artist in self.artists: return
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def connect(self, event, callback):
+        """Connect the callback to a canvas event for as long as the current page is
+        shown. A reference to the callback is kept since matplotlib does not."""
+
+        cid = self.canvas.mpl_connect(event, callback)
+        self.connections.append((cid, callback))
+
+    def reset(self):
+        """Forget the animated artists and event connections of the current page.
+        Called whenever the page is changed or redrawn."""
+
+        for artist in self.artists:
+            artist.set_animated(False)
+        for cid, _ in self.connections:
+            self.canvas.mpl_disconnect(cid)
+        self.artists = []
+        self.connections = []
+        self.background = None
+
+    def update(self, *artists):
+        """Redraw the animated artists on top of the cached background.
+
+        Any of the specified artists that are not animated yet are animated first,
+        which means that the canvas has to be drawn in full one time so that the
+        background can be cached without them."""
+
+        new = [artist for artist in artists if artist not in self.artists]
+        for artist in new: self.add(artist)
+
+        # Draw everything if the cached background cannot be used
+        if new or self.background is None or self.size != self.canvas.get_width_height():
+            self.canvas.draw()
+            return
+
+        # Otherwise, restore the background and only draw the animated artists
+        self.canvas.restore_region(self.background)
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def redraw(self):
+        """Draw the whole canvas once, so that the background is cached again after
+        something in it changed, e.g. a series was shown or hidden. Only overlays
+        such as the legend, crosshair and limit lines should ever be animated, since
+        every animated artist is redrawn on each update."""
+
+        # Don't restore the stale background before the canvas has been drawn
+        self.background = None
+        self.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        """Cache the background after the figure is drawn, then draw the animated
+        artists on top of it since matplotlib leaves them out."""
+
+        renderer = event.renderer
+        # Only cache drawings that are made to the screen, e.g. not when saving
+        if event.canvas is self.canvas and hasattr(renderer, 'copy_from_bbox'):
+            self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+            self.size = self.canvas.get_width_height()
+        # Draw the animated artists, which also includes them in saved figures
+        for artist in self.artists:
+            if artist.figure is not None: artist.draw(renderer)
+
+
+class BlittedLegend(DraggableLegend):
+    """A draggable legend that is redrawn on top of the cached background while it
+    is being dragged."""
+
+    def __init__(self, legend, blitter):
+        """Make the legend draggable and animate it."""
+
+        DraggableLegend.__init__(self, legend, use_blit=False)
+        self.blitter = blitter
+        self.blitter.add(legend)
+
+    def on_motion(self, event):
+        """Move the legend along with the mouse."""
+
+        if not self.got_artist: return
+        self.update_offset(event.x - self.mouse_x, event.y - self.mouse_y)
+        self.blitter.update()
+
+
+def make_draggable(legend, blitter):
+    """Make the legend draggable, using the blitter to redraw it while it moves.
+    The legend holds the reference to the draggable object, just as it would if
+    legend.set_draggable were used."""
+
+    legend._draggable = BlittedLegend(legend, blitter)
+    return legend._draggable
+
+
+class DraggableLine:
+    """Allows a limit line to be dragged across its axis. Only the line is redrawn
+    while it moves, and the callback is passed the line's new value once it is
+    released."""
+
+    def __init__(self, line, orientation, blitter, callback):
+        """Make the line pickable and listen for the mouse events that drag it."""
+
+        self.line = line
+        self.orientation = orientation
+        self.blitter = blitter
+        self.callback = callback
+        self.dragging = False
+
+        # Allow the line to be picked, and connect the events for the current page
+        self.line.set_picker(5)
+        self.blitter.connect('pick_event', self.on_pick)
+        self.blitter.connect('motion_notify_event', self.on_motion)
+        self.blitter.connect('button_release_event', self.on_release)
+
+    def on_pick(self, event):
+        """Start dragging the line if it was the artist that was picked."""
+
+        if event.artist is not self.line: return
+        self.dragging = True
+        self.blitter.update(self.line)
+
+    def on_motion(self, event):
+        """Move the line to the position of the mouse."""
+
+        if not self.dragging: return
+        # Convert the mouse position to the coordinates of the line's own axis,
+        # which might not be the axis that the mouse is reported to be in
+        x, y = self.line.axes.transData.inverted().transform((event.x, event.y))
+        if self.orientation == 'horizontal':
+            self.line.set_ydata([y, y])
+        elif self.orientation == 'vertical':
+            self.line.set_xdata([x, x])
+        self.blitter.update()
+
+    def on_release(self, event):
+        """Stop dragging the line and report its new value."""
+
+        if not self.dragging: return
+        self.dragging = False
+        if self.orientation == 'horizontal':
+            self.callback(self.line.get_ydata()[0])
+        elif self.orientation == 'vertical':
+            self.callback(self.line.get_xdata()[0])
+
+
+class SortedIndex:
+    """An index over the x-data of a plot that finds the sample nearest to any x
+    value by binary search. Built once when the plot is generated."""
+
+    def __init__(self, x):
+        """Sort the finite x values, remembering where each one came from."""
+
+        self.x = x = np.asarray(x, dtype=float)
+        valid = np.flatnonzero(np.isfinite(x))
+        values = x[valid]
+        # Most data is already sorted, in which case sorting can be skipped
+        if np.all(values[1:] >= values[:-1]):
+            self.order = valid
+        else:
+            self.order = valid[np.argsort(values, kind='mergesort')]
+        self.values = x[self.order]
+
+    def nearest(self, value):
+        """Return the position of the sample nearest to the value within the
+        original x-data, or None if there are no samples."""
+
+        if not len(self.values): return None
+        # Find the samples on either side of the value and pick the closer one
+        right = int(np.searchsorted(self.values, value))
+        right = min(max(right, 1), len(self.values) - 1)
+        left = right - 1
+        if abs(self.values[right] - value) < abs(value - self.values[left]):
+            return self.order[right]
+        return self.order[left]
+
+
+class Crosshair:
+    """A crosshair that snaps to the sample nearest to the mouse and shows the value
+    of every visible series at that sample.
+
+    The sample is found by binary search over the plot's sorted x index, and only
+    the crosshair is redrawn on top of the cached background, so the time it takes
+    to respond does not grow with the number of points."""
+
+    def __init__(self, blitter):
+        """Initialize the object's attributes."""
+
+        self.blitter = blitter
+        self.enabled = False
+
+        # Keep track of the current plot and the artists that make up the crosshair
+        self.plot = None
+        self.line = None
+        self.markers = []
+        self.text = None
+
+    def attach(self, plot, axis):
+        """Create the crosshair's artists for a plot that was just drawn on the axis.
+
+        The plot must have an x_index attribute holding a SortedIndex, as well as a
+        cursor_series attribute holding an (axis, label, values, line, scaling) tuple
+        for each series, where line is used to check whether the series is visible
+        and scaling is the Scaling that the series is drawn with."""
+
+        self.plot = plot
+
+        # Create a vertical line that spans the height of the axis
+        self.line = Line2D([0, 0], [0, 1], color='k', linewidth=0.8, visible=False,
+                           transform=axis.get_xaxis_transform())
+        axis.add_artist(self.line)
+
+        # Create a marker for each series, placed on the series's own axis
+        self.markers = []
+        for series_axis, _, _, _, scaling in getattr(plot, 'cursor_series', []):
+            marker = Line2D([], [], marker='o', markerfacecolor='w',
+                            markeredgecolor='k', linestyle='', visible=False,
+                            transform=scaling.transform(series_axis))
+            series_axis.add_artist(marker)
+            self.markers.append(marker)
+
+        # Create a text box that shows the values of the series
+        self.text = axis.text(0.01, 0.99, '', transform=axis.transAxes,
+                              ha='left', va='top', fontsize=9, visible=False,
+                              bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+        for artist in [self.line, self.text] + self.markers:
+            self.blitter.add(artist)
+
+    def hide(self):
+        """Hide the crosshair if it is currently shown."""
+
+        if self.line is None or not self.line.get_visible(): return
+        for artist in [self.line, self.text] + self.markers:
+            artist.set_visible(False)
+        self.blitter.update()
+
+    def on_motion(self, event):
+        """Snap the crosshair to the sample nearest to the mouse."""
+
+        if not self.enabled or self.line is None: return
+
+        # Hide the crosshair when the mouse leaves the plot
+        index = getattr(self.plot, 'x_index', None)
+        if event.inaxes is None or index is None:
+            self.hide()
+            return
+
+        # Find the sample nearest to the mouse, converting the position of the mouse
+        # from the values that are shown to the values of the data
+        series = getattr(self.plot, 'cursor_series', [])
+        if not series:
+            self.hide()
+            return
+        scaling = series[0][4]
+        x, _ = self.line.axes.transData.inverted().transform((event.x, event.y))
+        position = index.nearest(scaling.x_data(x))
+        if position is None:
+            self.hide()
+            return
+        x = float(index.x[position])
+
+        # Move the line and markers to the sample and list the shown value of each
+        # series; the markers are drawn with the same scaling as their series
+        self.line.set_xdata([scaling.x(x)] * 2)
+        self.line.set_visible(True)
+        readout = [f'x: {scaling.x(x):.3f}']
+        for marker, (_, label, values, line, scaling) in zip(self.markers, series):
+            y = values[position]
+            visible = (line is None or line.get_visible()) and np.isfinite(y)
+            marker.set_data([x], [y])
+            marker.set_visible(bool(visible))
+            if visible: readout.append(f'{label}: {scaling.y(y):.3f}')
+        self.text.set_text('\n'.join(readout))
+        self.text.set_visible(True)
+
+        self.blitter.update()
+
+
+def coordinates(current, other, secondary_exists):
+    """Return the function that formats the coordinates of the mouse for the
+    number of axes. Current is the axis that is being formatted; other is the axis
+    that is not being formatted; secondary_exists is True if a secondary axis
+    exists. Kept apart from the flipbook so that it works without Tk."""
+
+    if secondary_exists:
+        def format_coord(x, y):
+            """Create the appropriate coordinate formatting if both
+            axes exist, where x and y are data coordinates passed
+            to this function by the mouse event of matplotlib."""
+
+            # Secondary axis coordinates were passed as arguments
+            secondary = (x, y)
+            # Convert the secondary axis's coordinates from data to display
+            display = current.transData.transform(secondary)
+            # Invert the primary axis coordinates
+            inverted = other.transData.inverted()
+            # Convert to data coordinates w.r.t. the display coordinates
+            primary = inverted.transform(display)
+            # Combine the coordinates into a list
+            coords = [primary, secondary]
+            # Return the formatted string
+            return ('Primary: {:<}  |  Secondary: {:<}'
+                    .format(*['({:.3f}, {:.3f})'.format(x, y)
+                    for x, y in coords]))
+
+    else:
+        def format_coord(x, y):
+            """Create the appropriate coordinate formatting if only
+            the primary axis exists, where x and y are data
+            coordinates passed to this function by matplotlib."""
+
+            # Return the formatted string
+            return ('Primary: ({:<.3f}, {:<.3f})'.format(x, y))
+
+    # Return the approprate coordinates format function
+    return format_coord
@@ -1,8 +1,10 @@
 import math
+import multiprocessing
 import os
 import platform
 import random
 import re
+import time
 import tkinter as tk
 from tkinter import StringVar
 from tkinter import filedialog as fd
@@ -19,8 +21,15 @@ from matplotlib.backends.backend_tkagg import (FigureCanvasTkAgg,
 from matplotlib.figure import Figure
 from PIL import Image, ImageTk
 
+import api
+import catalog
+import export
+import interaction
+import report
+import styles
 from basic import BasicControls, BasicFile
 from peakvalley import PeakValleyControls, PeakValleyFile
+from placeholder import Placeholder, kind_of
 
 if platform.system() == 'Darwin':
     mpl.use("TkAgg") # On Mac, this must come before the pyplot import
@@ -45,6 +54,10 @@ class Application(gui.Application):
         # Initialize the inputs list
         self.inputs = []
 
+        # Keep a catalog of the labels of every input, which are read in the
+        # background so that columns can be checked and picked by name
+        self.catalog = catalog.Catalog()
+
         # Initialize the application using the lemons GUI module
         gui.Application.__init__(self, padding=PADDING)
         self.configure(
@@ -352,19 +365,28 @@ class Application(gui.Application):
         # Destroy everything in the primary frame
         for child in self.primary.winfo_children(): child.destroy()
 
-        # Place a notebook in the primary frame
+        # Place a notebook in the primary frame, building each tab once selected
         self.notebook = ttk.Notebook(self.primary, takefocus=0)
         self.notebook.grid(row=0, column=0, sticky='NSEW')
+        self.notebook.bind('<<NotebookTabChanged>>', self.build_selected)
 
         # Initialize the files attribute
         self.files = []
 
-        # Create the appropriate type of file and append it to self.files
+        # The number of items in each section that are not plot subsections
+        header = {
+            'Basic': 5,
+            'Peak Valley': 8,
+        }
+
+        # Create a placeholder for the appropriate type of file, which holds the
+        # file's section of the preset until its tab is built, and append it to
+        # self.files
         for i, item in enumerate(types):
             if item == 'Basic':
-                file = BasicFile(self.notebook, self.inputs[i], self)
+                kind = BasicFile
             elif item == 'Peak Valley':
-                file = PeakValleyFile(self.notebook, self.inputs[i], self)
+                kind = PeakValleyFile
             else:
                 self.reset()
                 message = (
@@ -379,22 +401,15 @@ class Application(gui.Application):
                 )
                 msg.showinfo('Invalid type', message)
                 return # could use a more elegant approach without resetting
-            self.files.append(file)
-
-        # The number of items in each section that are not plot subsections
-        header = {
-            'Basic': 5,
-            'Peak Valley': 8,
-        }
-
-        # Grab the relevant info and pass it to the file's load_preset method
-        for i, file in enumerate(self.files):
-            # Add the appropriate number of rows to each tab/file
-            number_of_plots = len(preset[keys[i]]) - header[types[i]]
-            rows_needed = ( number_of_plots - 1 ) if number_of_plots > 0 else 0
-            # Pass the relevant information to the file's load_preset method
+            # Determine the number of rows that will need to be added to the tab
             info = preset[keys[i]]
-            file.load_preset(self, i, rows_needed, info)
+            number_of_plots = len(info) - header[item]
+            rows_needed = ( number_of_plots - 1 ) if number_of_plots > 0 else 0
+            self.files.append(Placeholder(self.notebook, kind, self.inputs[i], self,
+                                          info=info, rows=rows_needed))
+
+        # Build the first tab, since it is the one that is shown
+        self.build(0)
 
         # If a file could not be found, display a message
         if LOAD_ERROR:
@@ -486,20 +501,46 @@ class Application(gui.Application):
         # Destroy everything in the primary frame
         for child in self.primary.winfo_children(): child.destroy()
 
-        # Place a notebook in the primary frame
+        # Place a notebook in the primary frame, building each tab once selected
         self.notebook = ttk.Notebook(self.primary, takefocus=0)
         self.notebook.grid(row=0, column=0, sticky='NSEW')
+        self.notebook.bind('<<NotebookTabChanged>>', self.build_selected)
 
-        # Create a file object for each input and keep a reference to them
-        if not special:
-            self.files = [BasicFile(self.notebook, filepath, self) \
-                          for filepath in self.inputs]
-        elif special == 'Peak Valley':
-            self.files = [PeakValleyFile(self.notebook, filepath, self) \
-                          for filepath in self.inputs]
+        # Create a placeholder for each input and keep a reference to them
+        kind = PeakValleyFile if special == 'Peak Valley' else BasicFile
+        self.files = [Placeholder(self.notebook, kind, filepath, self) \
+                      for filepath in self.inputs]
 
         # Set cursor focus on the default field of the first tab for ease of use
-        self.files[0].set_default_focus()
+        self.build(0).set_default_focus()
+
+
+    def build(self, index):
+        """Return the file of the specified tab, building the tab first if
+        it is still a placeholder and loading the preset section that the
+        placeholder held."""
+
+        placeholder = self.files[index]
+        if not isinstance(placeholder, Placeholder): return placeholder
+
+        # Replace the placeholder before loading the preset, since loading it
+        # adds rows to the file through the list of files
+        file = placeholder.build()
+        self.files[index] = file
+        if placeholder.info is not None:
+            file.load_preset(self, index, placeholder.rows, placeholder.info)
+        # Keep the plots that were generated from the preset section, along
+        # with any settings that were changed in the flipbook
+        if placeholder.plots and len(placeholder.plots) == len(file.plots):
+            file.plots = placeholder.plots
+        return file
+
+
+    def build_selected(self, event=None):
+        """Build the selected tab if it is still a placeholder."""
+
+        if not self.files or not self.notebook.select(): return
+        self.build(self.notebook.index(self.notebook.select()))
 
 
     def plus_row(self, event=None, tab=None):
@@ -509,9 +550,9 @@ class Application(gui.Application):
             # If a tab is not specified, tab equals the current tab's index.
             # This is the case when clicking the 'create row' button on the GUI.
             # Otherwise, the tab parameter is used when loading presets, etc.
-            if not tab: tab = self.notebook.index(self.notebook.select())
+            if tab is None: tab = self.notebook.index(self.notebook.select())
             # Add a row to the tab
-            self.files[tab].add_row()
+            self.build(tab).add_row()
         except NameError: pass
 
 
@@ -522,9 +563,9 @@ class Application(gui.Application):
             # If a tab is not specified, tab equals the current tab's index.
             # This is the case when clicking the 'delete row' button on the GUI.
             # Otherwise, the tab parameter is used when loading presets, etc.
-            if not tab: tab = self.notebook.index(self.notebook.select())
+            if tab is None: tab = self.notebook.index(self.notebook.select())
             # Remove a row from the tab
-            self.files[tab].delete_row()
+            self.build(tab).delete_row()
         except NameError: pass
 
 
@@ -572,7 +613,7 @@ class Application(gui.Application):
             # Append it to the list of file objects
             self.files.append(file)
             # Set focus on the default field of the first tab for ease of use
-            self.files[0].set_default_focus()
+            self.build(0).set_default_focus()
 
         # Add the filepath to the listbox
         self.listbox.field['state'] = 'normal'
@@ -624,7 +665,7 @@ class Application(gui.Application):
             pass
         else:
             # If there was no error, set default focus for the file
-            self.files[destination].set_default_focus()
+            self.build(destination).set_default_focus()
 
 
     def switch_row(self, event, direction):
@@ -633,7 +674,7 @@ class Application(gui.Application):
 
         # Get a reference to the File object that is currently selected
         current = self.notebook.index(self.notebook.select())
-        file = self.files[current]
+        file = self.build(current)
 
         # Call the file's switch_row method
         file.switch_row(event, direction, app.root)
@@ -717,13 +758,11 @@ class Application(gui.Application):
         if self.FLIPBOOK: return
         # May be unnecessary since the main window is withdrawn anyways
 
-        # Reset parameters to avoid problems associated with using styles
-        mpl.rcParams.update(mpl.rcParamsDefault)
-
         # Check that the user's inputs are okay
         if not self.validate_inputs(): return
 
-        # Store all of the inputs in each tab
+        # Store all of the inputs in each tab, generating the plots of tabs that
+        # haven't been built yet straight from their preset sections
         for file in self.files: file.generate()
 
         # Hide the main window and open the flipbook object
@@ -753,7 +792,7 @@ class Application(gui.Application):
         current = self.notebook.index(self.notebook.select())
 
         # Exit the function if the currently selected file is not basic
-        if not isinstance(self.files[current], BasicFile):
+        if not isinstance(self.build(current), BasicFile):
             message = (
                 "The 'Paste (Selected File)' feature only works for basic "
                 "files."
@@ -761,34 +800,8 @@ class Application(gui.Application):
             msg.showinfo('Invalid type', message)
             return
 
-        # Clear the selected file
-        self.files[current].clear_all(delete_header=False)
-
-        # Iterate through the rows of the currently selected file and delete the
-        # contents of every field, then insert the contents of the clipboard.
-        for row in range(len(self.files[current]._rows)):
-            tab = self.files[current]
-            if self.clipboard['title']:
-                tab._titles[row].delete(0, 'end')
-                tab._titles[row].insert(0, self.clipboard['title'])
-            if self.clipboard['x column']:
-                tab._x_columns[row].delete(0, 'end')
-                tab._x_columns[row].insert(0, self.clipboard['x column'])
-            if self.clipboard['y1 columns']:
-                tab._y1_columns[row].delete(0, 'end')
-                tab._y1_columns[row].insert(0, self.clipboard['y1 columns'])
-            if self.clipboard['y2 columns']:
-                tab._y2_columns[row].delete(0, 'end')
-                tab._y2_columns[row].insert(0, self.clipboard['y2 columns'])
-            if self.clipboard['x label']:
-                tab._x_labels[row].delete(0, 'end')
-                tab._x_labels[row].insert(0, self.clipboard['x label'])
-            if self.clipboard['y1 label']:
-                tab._y1_labels[row].delete(0, 'end')
-                tab._y1_labels[row].insert(0, self.clipboard['y1 label'])
-            if self.clipboard['y2 label']:
-                tab._y2_labels[row].insert(0, self.clipboard['y2 label'])
-                tab._y2_labels[row].delete(0, 'end')
+        # Replace every row of the selected file with the contents of the clipboard
+        self.files[current].paste_all()
 
 
     def paste_all(self):
@@ -797,34 +810,11 @@ class Application(gui.Application):
         
         Intended to only work for basic files."""
 
-        # Iterate through the rows of each file and delete the contents of
-        # every field, then insert the contents of the clipboard.
+        # Replace every row of each basic file with the contents of the clipboard.
+        # Placeholders paste into the preset section that they hold instead.
         for tab in self.files:
-            if not isinstance(tab, BasicFile): continue
-            # Clear all files
-            tab.clear_all(delete_header=False)
-            for row in range(len(tab._rows)):
-                if self.clipboard['title']:
-                    tab._titles[row].delete(0, 'end')
-                    tab._titles[row].insert(0, self.clipboard['title'])
-                if self.clipboard['x column']:
-                    tab._x_columns[row].delete(0, 'end')
-                    tab._x_columns[row].insert(0, self.clipboard['x column'])
-                if self.clipboard['y1 columns']:
-                    tab._y1_columns[row].delete(0, 'end')
-                    tab._y1_columns[row].insert(0, self.clipboard['y1 columns'])
-                if self.clipboard['y2 columns']:
-                    tab._y2_columns[row].delete(0, 'end')
-                    tab._y2_columns[row].insert(0, self.clipboard['y2 columns'])
-                if self.clipboard['x label']:
-                    tab._x_labels[row].delete(0, 'end')
-                    tab._x_labels[row].insert(0, self.clipboard['x label'])
-                if self.clipboard['y1 label']:
-                    tab._y1_labels[row].delete(0, 'end')
-                    tab._y1_labels[row].insert(0, self.clipboard['y1 label'])
-                if self.clipboard['y2 label']:
-                    tab._y2_labels[row].delete(0, 'end')
-                    tab._y2_labels[row].insert(0, self.clipboard['y2 label'])
+            if kind_of(tab) is not BasicFile: continue
+            tab.paste_all()
 
 
     def clear_all(self):
@@ -879,6 +869,7 @@ class Flipbook(tk.Toplevel):
         self.page = 0 # Current page number
         self.pages = sum(file._count for file in info) - 1 # Index of last page
         self.secondary = None # Secondary axis
+        self.background = None # Figure-level background image layer
         self.controls = None # Controls window
 
         # Get a list of plots, files, and plot numbers.
@@ -939,6 +930,13 @@ class Flipbook(tk.Toplevel):
         self.canvas = FigureCanvasTkAgg(self.figure, middle)
         self.canvas.draw()
 
+        # Keep a cached copy of the canvas so that interactive elements can be
+        # redrawn without redrawing the data underneath them
+        self.blitter = interaction.Blitter(self.canvas)
+
+        # Create a crosshair that snaps to the data, redrawn using the blitter
+        self.crosshair = interaction.Crosshair(self.blitter)
+
         # Create a frame that will hold the toolbar and the controls button
         toolbar_frame = tk.Frame(middle)
         toolbar_frame.grid(row=0, column=0, sticky='NSEW')
@@ -959,9 +957,33 @@ class Flipbook(tk.Toplevel):
         controls_button = ttk.Button(toolbar_frame, text='Controls',
                                      takefocus=0, image=controls_image)
         controls_button['command'] = show_controls
-        controls_button.grid(row=0, column=1, sticky='E')
+        controls_button.grid(row=0, column=4, sticky='E')
         controls_button.image = controls_image
 
+        # Create a button that exports every page of the flipbook
+        export_button = ttk.Button(toolbar_frame, text='Export all pages',
+                                   takefocus=0, command=self.export_pages)
+        export_button.grid(row=0, column=2, padx=(0, 6), sticky='E')
+
+        # Create a button that writes every page to a single PDF report
+        report_button = ttk.Button(toolbar_frame, text='Report', takefocus=0,
+                                   command=self.write_report)
+        report_button.grid(row=0, column=3, padx=(0, 6), sticky='E')
+
+        def toggle_crosshair():
+            """Turn the crosshair on or off, hiding it when it is turned off."""
+
+            self.crosshair.enabled = bool(self.crosshair_enabled.get())
+            if not self.crosshair.enabled: self.crosshair.hide()
+
+        # Create a checkbutton that turns the data crosshair on and off
+        self.crosshair_enabled = tk.IntVar()
+        crosshair_checkbutton = ttk.Checkbutton(toolbar_frame, text='Crosshair',
+                                                takefocus=0,
+                                                variable=self.crosshair_enabled,
+                                                command=toggle_crosshair)
+        crosshair_checkbutton.grid(row=0, column=1, padx=(0, 6), sticky='E')
+
         # Create a label that displays the filename for the current plot
         self.filename = tk.StringVar()
         filename_label = tk.Label(middle, textvar=self.filename,
@@ -979,6 +1001,9 @@ class Flipbook(tk.Toplevel):
 
         # Call the on_click method when the user clicks on a clickable object
         self.figure.canvas.mpl_connect('pick_event', self.on_click)
+        # Move the crosshair along with the mouse
+        self.figure.canvas.mpl_connect('motion_notify_event',
+                                       self.crosshair.on_motion)
 
         # Update the arrows and the plot of the flipbook
         self.update_arrows()
@@ -1001,11 +1026,20 @@ class Flipbook(tk.Toplevel):
         file_number = self.files[self.page] # File index
         plot_number = self.numbers[self.page] # Plot number in file
 
-        # Update the plot using the plot object's update_plot method
-        current.update_plot(self, file_number, plot_number)
+        # Forget the interactive elements of the previous drawing
+        self.blitter.reset()
 
-        # Update the canvas
+        # Update the plot using the plot object's update_plot method, give the
+        # figure the plot's style, then update the canvas. The style is applied to
+        # the figure itself, so it doesn't change the style of any other page.
+        start = time.perf_counter()
+        current.update_plot(self, file_number, plot_number)
+        styles.apply(current.style, self.figure)
+        self.crosshair.attach(current, self.primary)
         self.canvas.draw()
+        # Record how long drawing took alongside the timings of the data pipeline
+        if hasattr(current, 'pipeline'):
+            current.pipeline.timings['render'] = time.perf_counter() - start
 
 
     def update_arrows(self):
@@ -1051,6 +1085,52 @@ class Flipbook(tk.Toplevel):
         return ('break')
 
 
+    def export_pages(self):
+        """Render every page of the flipbook to numbered image files,
+        using a pool of worker processes."""
+
+        # Ask the user where to save the pages; the chosen name is numbered
+        # for each page, and its extension determines the format
+        filetypes = [
+            ('PNG Images (*.png)', '*.png'),
+            ('SVG Images (*.svg)', '*.svg'),
+            ('PDF Files (*.pdf)', '*.pdf'),
+        ]
+        path = fd.asksaveasfilename(title='Export all pages',
+                                    defaultextension='.png',
+                                    filetypes=filetypes)
+        if not path: return
+
+        # Start rendering the pages and show the progress of the export
+        ExportProgress(self, export.Export(self.plots, path))
+
+
+    def write_report(self):
+        """Write every page of the flipbook to a single PDF, followed by
+        summaries of the pass/fail results and band violations."""
+
+        # Ask the user where to save the report
+        path = fd.asksaveasfilename(title='Write report',
+                                    defaultextension='.pdf',
+                                    filetypes=[('PDF Files (*.pdf)', '*.pdf')])
+        if not path: return
+
+        # Draw the pages offscreen so that the flipbook's figure is left alone,
+        # showing the page being written in the filename label
+        self.config(cursor='watch')
+        def progress(page, pages):
+            self.filename.set(f'Writing page {page} of {pages}...')
+            self.update_idletasks()
+        try:
+            report.write(path, api.OffscreenFlipbook(self.info), progress=progress)
+        except Exception as error:
+            msg.showerror('Report', f'Unable to write the report:\n{error}')
+        finally:
+            self.config(cursor='')
+            # Redraw the current page, which also restores its filename
+            self.update_plot()
+
+
     def on_click(self, event):
         """Hide or show a line when the corresponding object in the
         legend is clicked."""
@@ -1067,38 +1147,7 @@ class Flipbook(tk.Toplevel):
         is a boolean value, where True means that a secondary axis
         exists, while False means it does not."""
 
-        if secondary_exists:
-            def format_coord(x, y):
-                """Create the appropriate coordinate formatting if both
-                axes exist, where x and y are data coordinates passed
-                to this function by the mouse event of matplotlib."""
-
-                # Secondary axis coordinates were passed as arguments
-                secondary = (x, y)
-                # Convert the secondary axis's coordinates from data to display
-                display = current.transData.transform(secondary)
-                # Invert the primary axis coordinates
-                inverted = other.transData.inverted()
-                # Convert to data coordinates w.r.t. the display coordinates
-                primary = inverted.transform(display)
-                # Combine the coordinates into a list
-                coords = [primary, secondary]
-                # Return the formatted string
-                return ('Primary: {:<}  |  Secondary: {:<}'
-                        .format(*['({:.3f}, {:.3f})'.format(x, y)
-                        for x, y in coords]))
-
-        elif not secondary_exists:
-            def format_coord(x, y):
-                """Create the appropriate coordinate formatting if only
-                the primary axis exists, where x and y are data
-                coordinates passed to this function by matplotlib."""
-
-                # Return the formatted string
-                return ('Primary: ({:<.3f}, {:<.3f})'.format(x, y))
-
-        # Return the approprate coordinates format function
-        return format_coord
+        return interaction.coordinates(current, other, secondary_exists)
 
 
 class Controls(tk.Toplevel):
@@ -1130,9 +1179,9 @@ class Controls(tk.Toplevel):
         # switched between instead of deleted and recreated upon a page change
         self.notebooks = []
         for file in self.flipbook.info:
-            if isinstance(file, BasicFile):
+            if kind_of(file) is BasicFile:
                 notebook = BasicControls(self.primary, takefocus=0)
-            elif isinstance(file, PeakValleyFile):
+            elif kind_of(file) is PeakValleyFile:
                 notebook = PeakValleyControls(self.primary, takefocus=0)
             self.notebooks.append(notebook)
 
@@ -1189,6 +1238,86 @@ class Controls(tk.Toplevel):
         self.notebook.update()
 
 
+class ExportProgress(tk.Toplevel):
+    """Window that shows the progress of exporting every page of the
+    flipbook, and allows the export to be cancelled."""
+
+    def __init__(self, master, export):
+        """Create the window and start polling the export."""
+
+        self.export = export
+
+        tk.Toplevel.__init__(self, master)
+        self.title('Exporting')
+        self.resizable(width=False, height=False)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        frame = gui.PaddedFrame(self)
+        frame.grid(row=0, column=0, sticky='NSEW')
+
+        # Create a progress bar and a label that counts the finished pages
+        self.progress = ttk.Progressbar(frame, length=300,
+                                        maximum=max(export.total, 1))
+        self.progress.grid(row=0, column=0, sticky='EW')
+        self.status = tk.StringVar()
+        status_label = tk.Label(frame, textvariable=self.status, anchor='w')
+        status_label.grid(row=1, column=0, pady=(6, 0), sticky='EW')
+
+        # Create a button that cancels the pages that haven't started yet
+        self.cancel_button = ttk.Button(frame, text='Cancel', takefocus=0,
+                                        command=self.cancel)
+        self.cancel_button.grid(row=2, column=0, pady=(10, 0), sticky='E')
+
+        gui.CenterWindow(self)
+        self.poll()
+
+
+    def poll(self):
+        """Show the number of finished pages, checking again shortly
+        until every page is finished."""
+
+        completed = self.export.completed
+        self.progress['value'] = completed
+        self.status.set(f'{completed} of {self.export.total} pages finished')
+        if self.export.finished:
+            self.finish()
+        else:
+            self.after(100, self.poll)
+
+
+    def cancel(self):
+        """Cancel the pages that haven't started. The window closes once
+        the pages that are already rendering are finished."""
+
+        self.export.cancel()
+        self.cancel_button['state'] = 'disabled'
+        self.status.set('Cancelling...')
+
+
+    def finish(self):
+        """Close the window and report any pages that failed."""
+
+        self.grab_release()
+        self.destroy()
+        failures = self.export.failures
+        if failures:
+            details = '\n'.join(f' - {os.path.basename(path)}: {error}'
+                                for path, error in failures[:10])
+            message = (
+                f'{len(failures)} of {self.export.total} pages could not be '
+                f'exported:\n\n{details}'
+            )
+            msg.showwarning('Export finished', message)
+        elif self.export.cancelled:
+            message = (
+                f'The export was cancelled after '
+                f'{self.export.total - self.export.cancelled} of '
+                f'{self.export.total} pages.'
+            )
+            msg.showinfo('Export cancelled', message)
+
+
 class Help(tk.Toplevel):
     """Help window that displays useful information such as button
     information and keyboard shortcuts to the user."""
@@ -1804,12 +1933,18 @@ class Help(tk.Toplevel):
         gui.CenterWindow(self)
 
 
-if os.path.exists('qt.conf'):
-    os.remove('qt.conf')
+if __name__ == '__main__':
+    # The export's worker processes import this module, so only launch the
+    # application from the main process; also allow the workers to start
+    # when the program is frozen into an executable
+    multiprocessing.freeze_support()
+
+    if os.path.exists('qt.conf'):
+        os.remove('qt.conf')
 
-# Initialize the application
-app = Application()
-# Run a test function
-# app.after(100, app.test)
-# Launch the application
-app.mainloop()
+    # Initialize the application
+    app = Application()
+    # Run a test function
+    # app.after(100, app.test)
+    # Launch the application
+    app.mainloop()
@@ -11,6 +11,25 @@ a = Analysis(['main.py'],
                     ('controls.py', '.'),
                     ('basic.py', '.'),
                     ('peakvalley.py', '.'),
+                    ('backgrounds.py', '.'),
+                    ('styles.py', '.'),
+                    ('interaction.py', '.'),
+                    ('analysis.py', '.'),
+                    ('reference.py', '.'),
+                    ('pipeline.py', '.'),
+                    ('scaling.py', '.'),
+                    ('decimation.py', '.'),
+                    ('parsing.py', '.'),
+                    ('batch.py', '.'),
+                    ('export.py', '.'),
+                    ('report.py', '.'),
+                    ('basicplot.py', '.'),
+                    ('peakvalleyplot.py', '.'),
+                    ('api.py', '.'),
+                    ('server.py', '.'),
+                    ('watch.py', '.'),
+                    ('catalog.py', '.'),
+                    ('placeholder.py', '.'),
                     ('assets\\browse.png', 'assets'),
                     ('assets\\checking.png', 'assets'),
                     ('assets\\clear.png', 'assets'),
@@ -0,0 +1,209 @@
+import os
+import re
+
+import pandas as pd
+
+
+# =================
+# BASIC DATA FILES
+# =================
+
+def filetype(path):
+    """Determine the filetype of the input."""
+
+    _, extension = os.path.splitext(path)
+    if extension in ['.csv', '.dat']: return 'CSV'
+    elif extension in ['.xls', '.xlsx', '.xlsm']: return 'Excel'
+    else: raise TypeError(f'The .{extension} filetype is not supported.')
+
+
+def _row(path, kind, row):
+    """Grab the contents of a single row of the file as a list."""
+
+    # Grab the row using the appropriate method for the filetype
+    if kind == 'CSV':
+        values = pd.read_csv(path, skiprows=row-1, nrows=1, index_col=False,
+                             header=None)
+    elif kind == 'Excel':
+        values = pd.read_excel(path, skiprows=row-1, nrows=1, index_col=False,
+                               header=None, encoding='latin1')
+    # Convert the pandas dataframe to a list and return it
+    return list(values.values.flatten())
+
+
+def labels(path, kind, label_row):
+    """Grab the labels from the specified row."""
+
+    return _row(path, kind, label_row)
+
+
+def units(path, kind, unit_row):
+    """Grab the units from the specified row, or None if there is no unit row."""
+
+    # If the unit_row parameter is None, do not continue
+    if not unit_row: return None
+    return _row(path, kind, unit_row)
+
+
+def data(path, kind, data_start_row, names):
+    """Grab the appropriate data from the file, naming the columns with the
+    specified labels."""
+
+    # Read the file using the appropriate method for the filetype
+    if kind == 'CSV':
+        return pd.read_csv(path, skiprows=data_start_row-1, names=names,
+                           index_col=False, header=None)
+    elif kind == 'Excel':
+        return pd.read_excel(path, skiprows=data_start_row-1, names=names,
+                             index_col=False, header=None, encoding='latin1')
+
+
+def columns(text):
+    """Return the column numbers within the text of a columns field. Columns can
+    be separated by any character other than a number."""
+
+    return [int(item) for item in re.findall(r'\d+', text or '')]
+
+
+# =======================
+# PEAK VALLEY DATA FILES
+# =======================
+
+class Section:
+    """A single data acquisition section of a peak valley file, made up of a
+    header followed by the data."""
+
+    def __init__(self, section, raw_data):
+
+        self.raw_data = raw_data
+
+        self.section = section
+
+        self.header = None
+        self.data = None
+
+        self.date = None
+        self.time = None
+
+        self.labels = None
+        self.units = None
+        self.header_length = None
+        self.columns = None
+
+        self.counter = None
+
+    def parse_header(self, start, end):
+        self.header = pd.DataFrame(self.raw_data[start:end+1])
+        self.header_length = len(self.header.index)
+        self.parse_datetime()
+        self.parse_counter()
+
+    def parse_data(self, start, end):
+        self.data = pd.DataFrame(self.raw_data[start:end+1])
+        self.columns = len(self.data.columns)
+
+    def parse_labels(self, row):
+        self.labels = self.header.iloc[row-1, :]
+
+    def parse_units(self, row):
+        if row is not None:
+            self.units = self.header.iloc[row-1, :]
+
+    def parse_datetime(self):
+        datetime = r'(\d{1,2}:\d{1,2}(:\d{1,2}\s+((AM)|(PM)))?)'
+        date = r'(\d{1,2}/\d{1,2}/\d{4})'
+        time = r'(\d{1,2}:\d{1,2}(:\d{1,2}\s+((AM)|(PM)))?)'
+
+        header = list(self.header.values.tolist())
+        for row in header:
+            for item in row:
+                if re.search(datetime, str(item)):
+                    self.date = re.findall(date, item)[0]
+                    self.time = re.findall(time, item)[0][0]
+                    return
+
+    def parse_counter(self):
+        header = list(self.header.values.tolist())
+        for row in header:
+            if 'segments' in row:
+                self.counter = 'segments'
+            elif 'cycles' in row:
+                self.counter = 'cycles'
+            else:
+                self.counter = 'other'
+
+
+def delimiter_character(choice):
+    """Convert a delimiter choice, i.e. 'comma' or 'tab', to its character."""
+
+    if choice == 'comma': return ','
+    elif choice == 'tab': return '\t'
+    return choice
+
+
+def sections(path, delimiter):
+    """Read a peak valley file and split it into its sections."""
+
+    with open(path, 'rb') as file:
+        raw = [line.rstrip().decode('latin-1').split(delimiter) for line in file]
+
+    # Remove empty rows to avoid errors during parsing
+    to_remove = []
+    for r, row in enumerate(raw):
+        if len(row) == 1 and row[0] == '':
+            to_remove.append(r)
+    for row in sorted(to_remove, reverse=True):
+        del(raw[row])
+
+    # Determine the number of sections and where each section starts
+    header_starts = []
+    for r, row in enumerate(raw):
+        # Use the 'Data Acquisition' label to find headers/separate sections
+        if 'Data Acquisition' in row:
+            header_starts.append(r)
+        # Convert everything to a float to differentiate data from header
+        for i, item in enumerate(row):
+            try:
+                raw[r][i] = float(item)
+            except ValueError:
+                pass
+
+    data_starts = []
+    data_ends = []
+    header_ends = []
+    for i, index in enumerate(header_starts):
+        last_section = True if index == header_starts[-1] else False
+        last_index = header_starts[i+1] if not last_section else len(raw)
+        data_ends.append(last_index - 1)
+        for r, row in enumerate(raw[header_starts[i]:last_index]):
+            if all(isinstance(item, (int, float)) for item in row):
+                data_starts.append(index + r)
+                header_ends.append(index + r - 1)
+                break
+
+    parsed = []
+    for s in range(len(header_starts)):
+        section = Section(section=s+1, raw_data=raw)
+        section.parse_header(header_starts[s], header_ends[s])
+        section.parse_data(data_starts[s], data_ends[s])
+        parsed.append(section)
+    return parsed
+
+
+def criteria(text):
+    """Parse the text of a peak or valley criteria field. A single number is a
+    threshold, while two numbers separated by an arrow (->) are a range. Returns
+    None if nothing was entered."""
+
+    if not text: return None
+    try:
+        return [float(text)]
+    except ValueError:
+        return [float(item) for item in text.split('->') if item]
+
+
+def unit_row(text):
+    """Parse the text of a peak valley unit row field, which may be 'None'."""
+
+    if text not in ['', 'None', None]: return int(text)
+    return None
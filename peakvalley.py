@@ -1,18 +1,16 @@
 import math
-import re
 import tkinter as tk
 from tkinter import ttk
 
 import configobj
 import lemons.gui as gui
-import matplotlib as mpl
 import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
 
-from settings import pv_colors, pv_labels
+import api
+import parsing
+from peakvalleyplot import PeakValleyPlot
 
-from controls import ToolTip, AxisLimits, AxisTicks
+from controls import ToolTip, AxisLimits, AxisScaling, AxisTicks
 
 
 class PeakValleyFile(gui.ScrollableTab):
@@ -395,118 +393,14 @@ class PeakValleyFile(gui.ScrollableTab):
 
 
 	def read(self, event=None):
-		
-		class Section:
-
-			def __init__(self, section, raw_data):
-
-				self.raw_data = raw_data
-
-				self.section = section
-
-				self.header = None
-				self.data = None
-
-				self.date = None
-				self.time = None
-
-				self.labels = None
-				self.units = None
-				self.header_length = None
-				self.columns = None
-
-				self.counter = None
-
-			def parse_header(self, start, end):
-				self.header = pd.DataFrame(self.raw_data[start:end+1])
-				self.header_length = len(self.header.index)
-				self.parse_datetime()
-				self.parse_counter()
-
-			def parse_data(self, start, end):
-				self.data = pd.DataFrame(self.raw_data[start:end+1])
-				self.columns = len(self.data.columns)
-
-			def parse_labels(self, row):
-				self.labels = self.header.iloc[row-1, :]
-
-			def parse_units(self, row):
-				if row is not None:
-					self.units = self.header.iloc[row-1, :]
-
-			def parse_datetime(self):
-				datetime = r'(\d{1,2}:\d{1,2}(:\d{1,2}\s+((AM)|(PM)))?)'
-				date = r'(\d{1,2}/\d{1,2}/\d{4})'
-				time = r'(\d{1,2}:\d{1,2}(:\d{1,2}\s+((AM)|(PM)))?)'
-				
-				header = list(self.header.values.tolist())
-				for row in header:
-					for item in row:
-						if re.search(datetime, str(item)):
-							self.date = re.findall(date, item)[0]
-							self.time = re.findall(time, item)[0][0]
-							return
-							
-			def parse_counter(self):
-				header = list(self.header.values.tolist())
-				for row in header:
-					if 'segments' in row:
-						self.counter = 'segments'
-					elif 'cycles' in row:
-						self.counter = 'cycles'
-					else:
-						self.counter = 'other'
 
 		# Pull the delimiter from the appropriate combobox
-		delimiter = self.delimiter_combo.get()
-		if delimiter == 'comma': delimiter = ','
-		elif delimiter == 'tab': delimiter = '\t'
+		delimiter = parsing.delimiter_character(self.delimiter_combo.get())
 
-		with open(self.filepath, 'rb') as file:
-			raw = [line.rstrip().decode('latin-1').split(delimiter) for line in file]
-		
-		# Remove empty rows to avoid errors during parsing
-		to_remove = []
-		for r, row in enumerate(raw):
-			if  len(row) == 1 and row[0] == '':
-				to_remove.append(r)
-		for row in sorted(to_remove, reverse=True):
-			del(raw[row])
-
-		# Determine the number of sections and where each section starts
-		self.section_total = 0
-		header_starts = []
-		for r, row in enumerate(raw):
-			# Use the 'Data Acquisition' label to find headers/separate sections
-			if 'Data Acquisition' in row:
-				self.section_total += 1
-				header_starts.append(r)
-			# Convert everything to a float to differentiate data from header
-			for i, item in enumerate(row):
-				try:
-					raw[r][i] = float(item)
-				except ValueError:
-					pass
-
-		data_starts = []
-		data_ends = []
-		header_ends = []
-		for i, index in enumerate(header_starts):
-			last_section = True if index == header_starts[-1] else False
-			last_index = header_starts[i+1] if not last_section else len(raw)
-			data_ends.append(last_index - 1)
-			for r, row in enumerate(raw[header_starts[i]:last_index]):
-				if all(isinstance(item, (int, float)) for item in row):
-					data_starts.append(index + r)
-					header_ends.append(index + r - 1)
-					break
-
-		self.sections = []
-		for s in range(len(header_starts)):
-			section = Section(section=s+1, raw_data=raw)
-			section.parse_header(header_starts[s], header_ends[s])
-			section.parse_data(data_starts[s], data_ends[s])
-			self.sections.append(section)
+		# Split the file into its sections
+		self.sections = parsing.sections(self.filepath, delimiter)
+		self.section_total = len(self.sections)
+		self.delimiter = delimiter
 
 		self.READ_COMPLETE = True
 		self.add_row()
@@ -541,533 +435,32 @@ class PeakValleyFile(gui.ScrollableTab):
 		# upper = float(self.upper_entry.get()) if self.upper_entry.get() else None
 
 		# Parse and store the peak and valley entries
-		valley_entry = self.lower_entry.get()
-		if valley_entry:
-			try:
-				valley = [float(valley_entry)]
-			except ValueError:
-				valley = [float(item) for item in valley_entry.split('->') if item]
-
-		else:
-			valley = None
-		
-		peak_entry = self.upper_entry.get()
-		if peak_entry:
-			try:
-				peak = [float(peak_entry)]
-			except ValueError:
-				peak = [float(item) for item in peak_entry.split('->') if item]
-		else:
-			peak = None
+		valley = parsing.criteria(self.lower_entry.get())
+		peak = parsing.criteria(self.upper_entry.get())
 
 		print(valley)
 		print(peak)
 
+		# Generate the plots the same way that they are generated without the GUI,
+		# reusing the sections that were already read
+		source = api.PeakValleySource(self.filepath, self.delimiter, convert=convert,
+									  zero=zero, split=split, valley=valley, peak=peak)
+		source.sections = self.sections
+
 		for p, plot in enumerate(self.plots):
 			section_number = int(self._sections[p].get())
-			section = self.sections[section_number-1]
 
 			counter = self._counters[p].get()
 			label_row = int(self._labels[p].get())
-			# unit_row = int(self._units[p].get()) if self._units[p].get() else None
-
-			# if self._units[p].get() == 'None':
-			# 	unit_row = None
-			# elif self._units[p].get():
-			# 	unit_row = int(self._units[p].get())
-			# else:
-			# 	unit_row = None
-
-			if self._units[p].get() not in ['', 'None']:
-				unit_row = int(self._units[p].get())
-			else:
-				unit_row = None
+			unit_row = parsing.unit_row(self._units[p].get())
 
 			x_column = int(self._x_columns[p].get())
 			y_column = int(self._y_columns[p].get())
 
-			plot._generate(section, counter, label_row, x_column, y_column, unit_row)
-
-			# Determine how many failures there are before modifying plot.x
-			# and plot.y any further
-
-			# if (lower is not None and upper is not None) or convert:
-			# plot.get_pairings()
-
-			if convert and counter == 'segments': plot.convert()
-
-			# if lower is not None and upper is not None:
-			# 	plot.determine_failures(lower, upper)
-
-			if valley is not None and peak is not None:
-				plot.determine_failures(valley, peak)
-
-			if split: plot.split()
-			if zero: plot.zero()
-
-			plot.construct_labels()
-
-
-class PeakValleyPlot:
-	"""Object that holds information about a singular plot."""
-
-	def __init__(self):
-		# self.FAILURES_DETERMINED = False
-		# self.DATA_SPLIT = False
-		self.lower = None
-		self.upper = None
-
-		self.marker_size = 1.5 ** 2
-
-		# Keep track of original axis limits
-		self.x_lower_original = None
-		self.x_upper_original = None
-		self.y1_lower_original = None
-		self.y1_upper_original = None
-
-		# Keep track of axis limits
-		self.x_lower = None
-		self.x_upper = None
-		self.y1_lower = None
-		self.y1_upper = None
-
-		# Keep track of number of primary and secondary ticks
-		self.primary_ticks = None
-
-	def _x_data(self, x_column):
-		"""Pull the appropriate x-information from the data."""
-
-		return self.section.data.iloc[:, x_column-1].copy(deep=True)
+			source.add_plot(section_number, counter, label_row, x_column, y_column,
+							unit_row, plot=plot)
 
-	def _y_data(self, y_column):
-		"""Pull the appropriate y-information from the data."""
-
-		return self.section.data.iloc[:, y_column-1].copy(deep=True)
-
-	def _get_pairings(self):
-
-		average = self.y1_original.mean().item()
-		data = self.y1_original.values.flatten().tolist()
-
-		pairs = []
-		temporary = []
-		for i in range(len(data)):
-			if len(temporary) == 0:
-				temporary.append(data[i])
-				if data[i] > average:
-					pairs.append(temporary)
-					temporary = []
-			elif len(temporary) == 1:
-				if temporary[0] > average or data[i] <= average:
-					pairs.append(temporary)
-					temporary = []
-				temporary.append(data[i])
-			elif len(temporary) == 2:
-				pairs.append(temporary)
-				temporary = [data[i]]
-		else:
-			pairs.append(temporary)
-
-		return pairs, average
-
-	def convert(self):
-
-		self.x = self.x // 2
-
-		self.DATA_CONVERTED = True
-
-	def determine_failures(self, valley, peak):
-
-		self.valley_mode = 'range' if len(valley) == 2 else 'threshold'
-		self.peak_mode = 'range' if len(peak) == 2 else 'threshold'
-
-		if self.valley_mode == 'threshold':
-			self.valley_failed = self.y1[(max(valley) < self.y1)]
-		elif self.valley_mode == 'range':
-			self.valley_failed = self.y1[(max(valley) < self.y1) | (self.y1 < min(valley))]
-
-		if self.peak_mode == 'threshold':
-			self.peak_failed = self.y1[(self.y1 < min(peak))]
-		elif self.peak_mode == 'range':
-			self.peak_failed = self.y1[(self.y1 < min(peak)) | (self.y1 > max(peak))]
-
-		self.x_failed = self.x[(self.y1.isin(self.valley_failed)) & (self.y1.isin(self.peak_failed))]
-		self.y_failed = self.y1[(self.y1.isin(self.valley_failed)) & (self.y1.isin(self.peak_failed))]
-
-		self.x_passed = self.x[~self.y1.isin(self.y_failed)]
-		self.y_passed = self.y1[~self.y1.isin(self.y_failed)]
-
-		self.total = len(self.y1)
-		self.fail_count = len(self.y_failed)
-		self.pass_count = len(self.y_passed)
-
-		# print(f'Total: {self.total}\nPassed: {self.pass_count}\nFailed: {self.fail_count}')
-
-		self.x = [self.x_failed, self.x_passed]
-		self.y1 = [self.y_failed, self.y_passed]
-
-		self.FAILURES_DETERMINED = True
-		self.valley = valley
-		self.peak = peak
-		self.count_failures()
-
-	def count_counter(self):
-
-		pairs, _ = self._get_pairings()
-		data = self.y1_original.values.flatten().tolist()
-
-		self.total_segments = len(data)
-		self.total_cycles = len(pairs)
-
-	def count_failures(self):
-
-		pairs, average = self._get_pairings()
-		data = self.y1_original.values.flatten().tolist()
-
-		VALLEY = self.valley
-		PEAK = self.peak
-		booleans = []
-		for pair in pairs:
-		# print(pairs)
-		# for p, pair in enumerate(pairs):
-		# 	print(p)
-			
-			if len(pair) == 1:
-				
-				which = 'valley' if pair[0] < average else 'peak'
-
-				if which == 'valley':
-					if self.valley_mode == 'threshold':
-						# booleans.append(item <= max(VALLEY))
-						booleans.append(pair[0] <= max(VALLEY))
-					elif self.valley_mode == 'peak':
-						booleans.append(min(VALLEY) <= pair[0] <= max(VALLEY))
-				elif which == 'peak':
-					if self.peak_mode == 'threshold':
-						# booleans.append(item >= min(PEAK))
-						booleans.append(pair[0] >= min(PEAK))
-					elif self.peak_mode == 'range':
-						booleans.append(min(PEAK) <= pair[0] <= max(PEAK))
-
-			elif len(pair) == 2:
-				
-				temporary = []
-				for item in pair:
-					
-					which = 'valley' if item < average else 'peak'
-
-					if which == 'valley':
-						if self.valley_mode == 'threshold':
-							temporary.append(item <= max(VALLEY))
-						elif self.valley_mode == 'range':
-							temporary.append(min(VALLEY) <= item <= max(VALLEY))
-					elif which == 'peak':
-						if self.peak_mode == 'threshold':
-							temporary.append(item >= min(PEAK))
-						elif self.peak_mode == 'range':
-							temporary.append(min(PEAK) <= item <= max(PEAK))
-					
-				if all(item is True for item in temporary):
-					booleans.append(True)
-				else:
-					booleans.append(False)
-
-		self.total_segments = len(data)
-		self.total_cycles = len(pairs)
-
-		self.passed_segments = self.pass_count
-		self.failed_segments = self.fail_count
-
-		self.passed_cycles = booleans.count(True)
-		self.failed_cycles = booleans.count(False)
-		
-		# print(f'self.total_segments: {self.total_segments}')
-		# print(f'self.total_cycles: {self.total_cycles}')
-		# print(f'self.passed_segments: {self.passed_segments}')
-		# print(f'self.failed_segments: {self.failed_segments}')
-		# print(f'self.passed_cycles: {self.passed_cycles}')
-		# print(f'self.failed_cycles: {self.failed_cycles}')
-
-	def split(self):
-
-		average = sum(self.y1_original) / len(self.y1_original)
-		if not self.FAILURES_DETERMINED:
-			x_valleys = self.x[self.y1 < average]
-			x_peaks = self.x[self.y1 > average]
-			y_valleys = self.y1[self.y1 < average]
-			y_peaks = self.y1[self.y1 > average]
-			self.x = [x_valleys, x_peaks]
-			self.y1 = [y_valleys, y_peaks]
-		else:
-			x_valleys = self.x[1][self.y1[1] < average]
-			x_peaks = self.x[1][self.y1[1] > average]
-			y_valleys = self.y1[1][self.y1[1] < average]
-			y_peaks = self.y1[1][self.y1[1] > average]
-			self.x = [self.x[0], x_valleys, x_peaks]
-			self.y1 = [self.y1[0], y_valleys, y_peaks]
-
-		self.DATA_SPLIT = True
-
-	def zero(self):
-
-		first = None
-		if isinstance(self.x, list):
-			for item in self.x:
-				if item.empty: continue
-				minimum = min(item)
-				if first is None:
-					first = minimum
-				else:
-					if minimum < first:
-						first = minimum
-		elif isinstance(self.x, pd.Series):
-			first = min(self.x)
-
-		for i in range(len(self.x)):
-			self.x[i] = self.x[i] - first + 1
-
-		self.DATA_ZEROED = True
-
-	def _generate(self, section, counter, labels,
-					x_column, y_column, units=None):
-		"""The main function for the object which stores the inputs and calls
-		other relevant functions."""
-
-		# Reset certain variables each time this function runs
-		# (typically when the plot button is pressed)
-		self.FAILURES_DETERMINED = False
-		self.DATA_CONVERTED = False
-		self.DATA_SPLIT = False
-		self.DATA_ZEROED = False
-
-		# Store the inputs as instance variables
-		self.section = section
-		self.counter = counter
-		self.labels = labels
-		# self.units = units # Rename due to conflict? Necessary?
-		self.unit_row = units # Rename due to conflict? Necessary?
-		self.x_column = x_column
-		self.y_column = y_column
-
-		# Grab the relevant data and store as instance variables
-		self.x = self._x_data(self.x_column)
-		self.y1 = self._y_data(self.y_column)
-		self.x_original = self.x.copy()
-		self.y1_original = self.y1.copy()
-
-		self.section.parse_labels(labels)
-		self.labels = self.section.labels
-		self.section.parse_units(units)
-		self.units = self.section.units if units is not None else None
-
-		self.count_counter()
-
-	def construct_labels(self):
-		x_label = self.labels.iloc[self.x_column - 1]
-		x_unit = self.units.iloc[self.x_column - 1] if self.units is not None else None
-		self.x_label = f'{x_label} ({x_unit})' if x_unit else f'{x_label}'
-
-		y1_label = self.labels.iloc[self.y_column - 1]
-		y1_unit = self.units.iloc[self.y_column - 1] if self.units is not None else None
-		self.y1_label = f'{y1_label} ({y1_unit})' if y1_unit else f'{y1_label}'
-
-		date = self.section.date
-		time = self.section.time
-
-		if self.counter == 'cycles' or self.DATA_CONVERTED:
-			counter_type = 'Cycles'
-		elif self.counter == 'segments':
-			counter_type = 'Segments'
-		elif self.counter == 'other':
-			counter_type = 'Count'
-
-		# total = self.total_cycles if self.DATA_CONVERTED and self.counter == 'segments' else self.total_segments
-		total = self.total_cycles if self.DATA_CONVERTED or self.counter == 'cycles' else self.total_segments
-		self.title = (
-			f'{date} {time}\n'
-			f'{counter_type} 1 to {total}\n'
-			f'{y1_label} vs. {x_label}'
-		)
-
-		self.title_original = self.title
-		self.x_label_original = self.x_label
-		self.y1_label_original = self.y1_label
-
-	def update_plot(self, flipbook, file_number, plot_number):
-
-		# Create a reference to the flipbook's primary axis for shorthand
-		primary = flipbook.primary
-
-		# Reset style to default to avoid weird changes on update
-		plt.style.use('default')
-
-		# Display the filename of the current plot
-		filename = flipbook.info[file_number].filename
-		flipbook.filename.set(f'{filename} - Plot {plot_number + 1}')
-
-		# Essentially reset the secondary axis by clearing and turning it off if it exists,
-		# then setting the self.secondary variable to None
-		if flipbook.secondary:
-			flipbook.secondary.clear()
-			flipbook.secondary.axis('off')
-		flipbook.secondary = None
-
-		# Clear the primary axis as well
-		primary.clear()
-
-		# Set the appropriate coordinates format to display on the flipbook
-		primary.set_zorder(1000)
-		primary.format_coord = flipbook._coordinates(flipbook.primary, None, False)
-
-		# Plot the data as a scatterplot
-		if not self.FAILURES_DETERMINED and not self.DATA_SPLIT:
-			primary.scatter(self.x, self.y1, c=pv_colors['general'], s=self.marker_size, edgecolors='k', linewidth=0.10, label=pv_labels['general'])
-		elif self.FAILURES_DETERMINED and self.DATA_SPLIT:
-			primary.scatter(self.x[0], self.y1[0], c=pv_colors['fail'], s=self.marker_size, edgecolors='k', linewidth=0.10, label=pv_labels['fail'])
-			primary.scatter(self.x[1], self.y1[1], c=pv_colors['valley'], s=self.marker_size, edgecolors='k', linewidth=0.10, label=pv_labels['valley'])
-			primary.scatter(self.x[2], self.y1[2], c=pv_colors['peak'], s=self.marker_size, edgecolors='k', linewidth=0.10, label=pv_labels['peak'])
-		elif self.FAILURES_DETERMINED and not self.DATA_SPLIT:
-			primary.scatter(self.x[0], self.y1[0], c=pv_colors['fail'], s=self.marker_size, edgecolors='k', linewidth=0.10, label=pv_labels['fail'])
-			primary.scatter(self.x[1], self.y1[1], c=pv_colors['pass'], s=self.marker_size, edgecolors='k', linewidth=0.10, label=pv_labels['pass'])
-		elif not self.FAILURES_DETERMINED and self.DATA_SPLIT:
-			primary.scatter(self.x[0], self.y1[0], c=pv_colors['valley'], s=self.marker_size, edgecolors='k', linewidth=0.10, label=pv_labels['valley'])
-			primary.scatter(self.x[1], self.y1[1], c=pv_colors['peak'], s=self.marker_size, edgecolors='k', linewidth=0.10, label=pv_labels['peak'])
-
-		# Determine the minimum and maximum values of the x data
-		min_x = None
-		max_x = None
-		if isinstance(self.x, list):
-			for item in self.x:
-				if item.empty: continue
-				minimum = min(item.dropna())
-				if min_x is None or minimum < min_x:
-					min_x = minimum
-				maximum = max(item.dropna())
-				if max_x is None or maximum > max_x:
-					max_x = maximum
-		elif isinstance(self.x, pd.Series):
-			min_x = min(self.x.dropna())
-			max_x = max(self.x.dropna())
-		# Determine adequate padding for the x-axis and set the x-axis limits accordingly.
-		padding = (max_x - min_x) * (100/90) * (0.05)
-		# Store the original x-axis limits to allow the user to revert to them if desired.
-		self.x_lower_original = min_x - padding
-		self.x_upper_original = max_x + padding
-		primary.set_xlim(self.x_lower_original, self.x_upper_original)
-		# Store the original y-axis limits to allow the user to revert to them if desired.
-		self.y1_lower_original = primary.get_ylim()[0]
-		self.y1_upper_original = primary.get_ylim()[1]
-
-		# Set each axis limit to the user-specified value
-		if self.x_lower: flipbook.primary.set_xlim(left=self.x_lower)
-		if self.x_upper: flipbook.primary.set_xlim(right=self.x_upper)
-		if self.y1_lower: flipbook.primary.set_ylim(bottom=self.y1_lower)
-		if self.y1_upper: flipbook.primary.set_ylim(top=self.y1_upper)
-
-		# Set a standard number of axis ticks to make it easier to line up the gridlines
-		if self.primary_ticks:
-			PRIMARY = flipbook.primary.get_ylim()
-			flipbook.primary.set_yticks(np.linspace(PRIMARY[0], PRIMARY[1],
-										int(self.primary_ticks)))
-
-		# Plot horizontal lines showing pass/fail criteria
-		if self.FAILURES_DETERMINED:
-			# Visual pass/fail criteria indication for valley
-			if self.valley_mode == 'threshold':
-				primary.axhline(y=max(self.valley), color='r', linestyle='--', alpha=0.3)
-			elif self.valley_mode == 'range':
-				primary.fill_between(primary.get_xlim(), min(self.valley), max(self.valley), color='b', alpha=0.3)
-			# Visual pass/fail criteria indication for peak
-			if self.peak_mode == 'threshold':
-				primary.axhline(y=max(self.peak), color='r', linestyle='--', alpha=0.3)
-			elif self.peak_mode == 'range':
-				primary.fill_between(primary.get_xlim(), min(self.peak), max(self.peak), color='b', alpha=0.3)
-
-		# Turn the grid on, with both major and minor gridlines
-		primary.grid(b=True, which='major', color='#666666', linestyle='-', alpha=0.5)
-		primary.minorticks_on()
-		primary.grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
-
-		# Set the title
-		print('About to show this title:', self.title)
-		flipbook.figure.suptitle(self.title, fontweight='bold', fontsize=12)
-		# Construct the axis labels further if necessary
-		if self.counter == 'segments' and self.DATA_CONVERTED:
-			self.x_label = self.x_label.replace('segments', 'cycles')
-		# Set the axis labels
-		primary.set_xlabel(self.x_label)
-		primary.set_ylabel(self.y1_label)
-
-		# If pass/fail criteria were specified...
-		if self.FAILURES_DETERMINED:
-			if self.counter != 'other':
-				# Add a text box listing the number of passes and fails
-				props = dict(boxstyle='round', facecolor='white', alpha=0.5)
-				if self.counter == 'cycles' or self.DATA_CONVERTED:
-					counter_type = 'Cycles'
-					failed = self.failed_cycles
-					passed = self.passed_cycles
-				elif self.counter == 'segments':
-					counter_type = 'Segments'
-					failed = self.failed_segments
-					passed = self.passed_segments
-				elif self.counter == 'other':
-					counter_type = ''
-					failed = self.failed_segments
-					passed = self.passed_segments
-				# text = f'{failed} Failed {counter_type}' + '\n' \
-				# 	f'{passed} Passed {counter_type}'
-				text = f'{passed} Passed {counter_type}'
-				primary.text(0.80, 1.05, text, transform=primary.transAxes,
-							fontsize=12, bbox=props)
-			# Add text boxes describing the limit lines
-			upper_y = float(min(self.peak)) - 0.05*(primary.get_ylim()[1]-primary.get_ylim()[0])
-			x_position = primary.get_xlim()[0] + (primary.get_xlim()[1]-primary.get_xlim()[0])/2
-			# if len(self.peak) == 1:
-			if self.peak_mode == 'threshold':
-				peak_string = f'Minimum Peak: {min(self.peak)}'
-			# elif len(self.peak) == 2:
-			elif self.peak_mode == 'range':
-				peak_string = f'Valid Peak Range: {min(self.peak)} --> {max(self.peak)}'
-			primary.text(x_position, upper_y,
-						peak_string,
-						fontsize=10, bbox=props, ha='center', va='top')
-			lower_y = float(max(self.valley)) + 0.05*(primary.get_ylim()[1]-primary.get_ylim()[0])
-			# if len(self.valley) == 1:
-			if self.valley_mode == 'threshold':
-				valley_string = f'Maximum Valley: {max(self.valley)}'
-			# elif len(self.valley) == 2:
-			elif self.valley_mode == 'range':
-				valley_string = f'Valid Valley Range: {min(self.valley)} --> {max(self.valley)}'
-			primary.text(x_position, lower_y,
-						valley_string,
-						fontsize=10, bbox=props, ha='center', va='bottom')
-
-		# Determine the maximum number of columns in the legend
-		columns = len(self.x) if isinstance(self.x, list) else 1
-		# Create the legend
-		legend = flipbook.primary.legend(
-						loc = 'lower left',
-						fancybox = True,
-						shadow = True,
-						ncol = columns,
-						mode = 'expand',
-						bbox_to_anchor = (-0.15, -0.2, 1.265, 0.1),
-			)
-		# Make the legend draggable (possibly a control in the future)
-		legend.set_draggable(state=True)
-
-		# Use the seaborn plot style
-		plt.style.use('seaborn')
-
-		# Load the Tactair image and display it on the plot
-		image = plt.imread(gui.ResourcePath('assets\\tactair.bmp'))
-		x_low, x_high = primary.get_xlim()
-		y_low, y_high = primary.get_ylim()
-		primary.imshow(image, extent=[x_low, x_high, y_low, y_high], aspect='auto')
-
-	def on_click(self, event, flipbook):
-		pass
+		source.generate()
 
 
 class PeakValleyControls(ttk.Notebook):
@@ -1104,6 +497,16 @@ class PeakValleyControls(ttk.Notebook):
 		self.axis_ticks.secondary_ticks_entry['state'] = 'disabled'
 		self.axis_ticks.grid(row=2, column=0, padx=20, pady=20, sticky='NSEW')
 
+		# Add a separator
+		separator = gui.Separator(figure, orientation='horizontal', padding=(0, (10, 0)))
+		separator.grid(row=3, column=0, sticky='NSEW')
+
+		# Create the scaling frame
+		self.axis_scaling = AxisScaling(figure)
+		self.axis_scaling.y2_scale_entry['state'] = 'disabled'
+		self.axis_scaling.y2_offset_entry['state'] = 'disabled'
+		self.axis_scaling.grid(row=4, column=0, padx=20, pady=20, sticky='NSEW')
+
 		# ==============
 		# APPEARANCE TAB
 		# ==============
@@ -1133,14 +536,25 @@ class PeakValleyControls(ttk.Notebook):
 		self.axis_labels.y1_label = (current.y1_label, current.y1_label_original)
 
 		# Fill in each field with their respective values
-		self.axis_limits.x_lower = (current.x_lower, current.x_lower_original)
-		self.axis_limits.x_upper = (current.x_upper, current.x_upper_original)
-		self.axis_limits.y1_lower = (current.y1_lower, current.y1_lower_original)
-		self.axis_limits.y1_upper = (current.y1_upper, current.y1_upper_original)
+		# Show the limits in the same units as the axes
+		scaling = current.scaling()
+		x_lower, x_upper = scaling.x_limits(current.x_lower, current.x_upper)
+		y1_lower, y1_upper = scaling.y_limits(current.y1_lower, current.y1_upper)
+		self.axis_limits.x_lower = (x_lower, current.x_lower_original)
+		self.axis_limits.x_upper = (x_upper, current.x_upper_original)
+		self.axis_limits.y1_lower = (y1_lower, current.y1_lower_original)
+		self.axis_limits.y1_upper = (y1_upper, current.y1_upper_original)
 
 		# Fill in each field with their respective values
 		self.axis_ticks.primary_ticks = (current.primary_ticks, '')
 
+		# Fill in each field with their respective values
+		self.axis_scaling.x_scale = current.x_scale
+		self.axis_scaling.x_offset = current.x_offset
+		self.axis_scaling.y1_scale = current.y1_scale
+		self.axis_scaling.y1_offset = current.y1_offset
+		self.axis_scaling.zero_x = current.zero_x
+
 		self.scatterplot_properties.marker_size = current.marker_size
 
 
@@ -1161,15 +575,26 @@ class PeakValleyControls(ttk.Notebook):
 
 			return float(value if value else original)
 
-		# Store the axes limits values in the corresponding plot object attributes
-		current.x_lower = update_axis(self.axis_limits.x_lower, current.x_lower_original)
-		current.x_upper = update_axis(self.axis_limits.x_upper, current.x_upper_original)
-		current.y1_lower = update_axis(self.axis_limits.y1_lower, current.y1_lower_original)
-		current.y1_upper = update_axis(self.axis_limits.y1_upper, current.y1_upper_original)
+		# Store the axes limits values in the corresponding plot object attributes,
+		# converting them back to the units of the data before the scaling changes
+		scaling = current.scaling()
+		current.x_lower, current.x_upper = scaling.x_data_limits(
+			update_axis(self.axis_limits.x_lower, current.x_lower_original),
+			update_axis(self.axis_limits.x_upper, current.x_upper_original))
+		current.y1_lower, current.y1_upper = scaling.y_data_limits(
+			update_axis(self.axis_limits.y1_lower, current.y1_lower_original),
+			update_axis(self.axis_limits.y1_upper, current.y1_upper_original))
 
 		# Store the values in the primary and secondary tick fields
 		current.primary_ticks = self.axis_ticks.primary_ticks
 
+		# Store the scale factors and offsets, ignoring scale factors of zero
+		current.x_scale = self.axis_scaling.x_scale or 1
+		current.x_offset = self.axis_scaling.x_offset
+		current.y1_scale = self.axis_scaling.y1_scale or 1
+		current.y1_offset = self.axis_scaling.y1_offset
+		current.zero_x = self.axis_scaling.zero_x
+
 		current.marker_size = self.scatterplot_properties.marker_size
 
 		# Update the plot and refresh the controls window
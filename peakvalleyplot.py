@@ -0,0 +1,616 @@
+import os
+
+import matplotlib as mpl
+import numpy as np
+
+import analysis
+import backgrounds
+import interaction
+import scaling
+from settings import pv_colors, pv_labels
+
+
+class PeakValleyPlot:
+	"""Object that holds information about a singular plot."""
+
+	def __init__(self):
+		# self.FAILURES_DETERMINED = False
+		# self.DATA_SPLIT = False
+		self.lower = None
+		self.upper = None
+
+		self.marker_size = 1.5 ** 2
+
+		# Keep track of how many points can be drawn before they are rasterized, and
+		# before they are aggregated into a density image instead
+		self.rasterize_above = 50000
+		self.density_above = 2000000
+
+		# Keep track of the style, which is applied by the flipbook
+		self.style = 'Default'
+
+		# Keep track of the sorted x index and the series that the crosshair uses
+		self.x_index = None
+		self.cursor_series = []
+
+		# Keep track of the statistics of the combined x and y data
+		self.statistics = None
+
+		# Keep track of original axis limits
+		self.x_lower_original = None
+		self.x_upper_original = None
+		self.y1_lower_original = None
+		self.y1_upper_original = None
+
+		# Keep track of axis limits, in the units of the data
+		self.x_lower = None
+		self.x_upper = None
+		self.y1_lower = None
+		self.y1_upper = None
+
+		# Keep track of number of primary and secondary ticks
+		self.primary_ticks = None
+
+		# Keep track of the scale factors and offsets that the data is shown with,
+		# and whether the x-axis should be zeroed
+		self.x_scale = 1
+		self.x_offset = 0
+		self.y1_scale = 1
+		self.y1_offset = 0
+		self.zero_x = False
+
+	def __getstate__(self):
+		"""Return the attributes to copy when the plot is pickled, e.g. to render it
+		in another process. The section holds the whole file, and the crosshair's
+		series hold artists, so both are left out."""
+
+		state = dict(self.__dict__)
+		for name in ['section', 'cursor_series']:
+			state.pop(name, None)
+		return state
+
+	def __setstate__(self, state):
+		"""Restore the pickled attributes and recreate the ones that were left out."""
+
+		self.__dict__.update(state)
+		self.section = None
+		self.cursor_series = []
+
+	def _x_data(self, x_column):
+		"""Pull the appropriate x-information from the data."""
+
+		return self.section.data.iloc[:, x_column-1].copy(deep=True)
+
+	def _y_data(self, y_column):
+		"""Pull the appropriate y-information from the data."""
+
+		return self.section.data.iloc[:, y_column-1].copy(deep=True)
+
+	def _get_pairings(self):
+
+		average = self.y1_original.mean().item()
+		data = self.y1_original.values.flatten().tolist()
+
+		pairs = []
+		temporary = []
+		for i in range(len(data)):
+			if len(temporary) == 0:
+				temporary.append(data[i])
+				if data[i] > average:
+					pairs.append(temporary)
+					temporary = []
+			elif len(temporary) == 1:
+				if temporary[0] > average or data[i] <= average:
+					pairs.append(temporary)
+					temporary = []
+				temporary.append(data[i])
+			elif len(temporary) == 2:
+				pairs.append(temporary)
+				temporary = [data[i]]
+		else:
+			pairs.append(temporary)
+
+		return pairs, average
+
+	def convert(self):
+
+		self.x = self.x // 2
+
+		self.DATA_CONVERTED = True
+
+	def determine_failures(self, valley, peak):
+
+		self.valley_mode = 'range' if len(valley) == 2 else 'threshold'
+		self.peak_mode = 'range' if len(peak) == 2 else 'threshold'
+
+		if self.valley_mode == 'threshold':
+			self.valley_failed = self.y1[(max(valley) < self.y1)]
+		elif self.valley_mode == 'range':
+			self.valley_failed = self.y1[(max(valley) < self.y1) | (self.y1 < min(valley))]
+
+		if self.peak_mode == 'threshold':
+			self.peak_failed = self.y1[(self.y1 < min(peak))]
+		elif self.peak_mode == 'range':
+			self.peak_failed = self.y1[(self.y1 < min(peak)) | (self.y1 > max(peak))]
+
+		self.x_failed = self.x[(self.y1.isin(self.valley_failed)) & (self.y1.isin(self.peak_failed))]
+		self.y_failed = self.y1[(self.y1.isin(self.valley_failed)) & (self.y1.isin(self.peak_failed))]
+
+		self.x_passed = self.x[~self.y1.isin(self.y_failed)]
+		self.y_passed = self.y1[~self.y1.isin(self.y_failed)]
+
+		self.total = len(self.y1)
+		self.fail_count = len(self.y_failed)
+		self.pass_count = len(self.y_passed)
+
+		# print(f'Total: {self.total}\nPassed: {self.pass_count}\nFailed: {self.fail_count}')
+
+		self.x = [self.x_failed, self.x_passed]
+		self.y1 = [self.y_failed, self.y_passed]
+
+		self.FAILURES_DETERMINED = True
+		self.valley = valley
+		self.peak = peak
+		self.count_failures()
+
+	def count_counter(self):
+
+		pairs, _ = self._get_pairings()
+		data = self.y1_original.values.flatten().tolist()
+
+		self.total_segments = len(data)
+		self.total_cycles = len(pairs)
+
+	def count_failures(self):
+
+		pairs, average = self._get_pairings()
+		data = self.y1_original.values.flatten().tolist()
+
+		VALLEY = self.valley
+		PEAK = self.peak
+		booleans = []
+		for pair in pairs:
+		# print(pairs)
+		# for p, pair in enumerate(pairs):
+		# 	print(p)
+			
+			if len(pair) == 1:
+				
+				which = 'valley' if pair[0] < average else 'peak'
+
+				if which == 'valley':
+					if self.valley_mode == 'threshold':
+						# booleans.append(item <= max(VALLEY))
+						booleans.append(pair[0] <= max(VALLEY))
+					elif self.valley_mode == 'peak':
+						booleans.append(min(VALLEY) <= pair[0] <= max(VALLEY))
+				elif which == 'peak':
+					if self.peak_mode == 'threshold':
+						# booleans.append(item >= min(PEAK))
+						booleans.append(pair[0] >= min(PEAK))
+					elif self.peak_mode == 'range':
+						booleans.append(min(PEAK) <= pair[0] <= max(PEAK))
+
+			elif len(pair) == 2:
+				
+				temporary = []
+				for item in pair:
+					
+					which = 'valley' if item < average else 'peak'
+
+					if which == 'valley':
+						if self.valley_mode == 'threshold':
+							temporary.append(item <= max(VALLEY))
+						elif self.valley_mode == 'range':
+							temporary.append(min(VALLEY) <= item <= max(VALLEY))
+					elif which == 'peak':
+						if self.peak_mode == 'threshold':
+							temporary.append(item >= min(PEAK))
+						elif self.peak_mode == 'range':
+							temporary.append(min(PEAK) <= item <= max(PEAK))
+					
+				if all(item is True for item in temporary):
+					booleans.append(True)
+				else:
+					booleans.append(False)
+
+		self.total_segments = len(data)
+		self.total_cycles = len(pairs)
+
+		self.passed_segments = self.pass_count
+		self.failed_segments = self.fail_count
+
+		self.passed_cycles = booleans.count(True)
+		self.failed_cycles = booleans.count(False)
+		
+		# print(f'self.total_segments: {self.total_segments}')
+		# print(f'self.total_cycles: {self.total_cycles}')
+		# print(f'self.passed_segments: {self.passed_segments}')
+		# print(f'self.failed_segments: {self.failed_segments}')
+		# print(f'self.passed_cycles: {self.passed_cycles}')
+		# print(f'self.failed_cycles: {self.failed_cycles}')
+
+	def summary(self):
+		"""Return the number of passed and failed cycles or segments, counted the
+		same way that the plot shows them, or None if no pass/fail criteria were
+		specified."""
+
+		if not self.FAILURES_DETERMINED: return None
+		if self.counter == 'cycles' or self.DATA_CONVERTED:
+			return {'counter': 'Cycles', 'total': self.total_cycles,
+					'passed': self.passed_cycles, 'failed': self.failed_cycles}
+		return {'counter': 'Segments', 'total': self.total_segments,
+				'passed': self.passed_segments, 'failed': self.failed_segments}
+
+	def split(self):
+
+		average = sum(self.y1_original) / len(self.y1_original)
+		if not self.FAILURES_DETERMINED:
+			x_valleys = self.x[self.y1 < average]
+			x_peaks = self.x[self.y1 > average]
+			y_valleys = self.y1[self.y1 < average]
+			y_peaks = self.y1[self.y1 > average]
+			self.x = [x_valleys, x_peaks]
+			self.y1 = [y_valleys, y_peaks]
+		else:
+			x_valleys = self.x[1][self.y1[1] < average]
+			x_peaks = self.x[1][self.y1[1] > average]
+			y_valleys = self.y1[1][self.y1[1] < average]
+			y_peaks = self.y1[1][self.y1[1] > average]
+			self.x = [self.x[0], x_valleys, x_peaks]
+			self.y1 = [self.y1[0], y_valleys, y_peaks]
+
+		self.DATA_SPLIT = True
+
+	def zero(self):
+		"""Zero the x-axis so that it starts at one. The data is left alone, and the
+		offset is applied when the data is drawn instead."""
+
+		self.zero_x = True
+		self.DATA_ZEROED = True
+
+	def scaling(self):
+		"""Return the Scaling that the data is shown with. Zeroing the x-axis replaces
+		the x-offset with the offset that moves the start of the x-data to one."""
+
+		x_offset = self.x_offset
+		if self.zero_x: x_offset = 1 - self.statistics['min'].iloc[0] * self.x_scale
+		return scaling.Scaling(self.x_scale, x_offset, self.y1_scale, self.y1_offset)
+
+	def _generate(self, section, counter, labels,
+					x_column, y_column, units=None):
+		"""The main function for the object which stores the inputs and calls
+		other relevant functions."""
+
+		# Reset certain variables each time this function runs
+		# (typically when the plot button is pressed)
+		self.FAILURES_DETERMINED = False
+		self.DATA_CONVERTED = False
+		self.DATA_SPLIT = False
+		self.DATA_ZEROED = False
+		self.zero_x = False
+
+		# Clear the combined points, which are recreated the next time they are drawn
+		self._points = None
+
+		# Store the inputs as instance variables
+		self.section = section
+		self.counter = counter
+		self.labels = labels
+		# self.units = units # Rename due to conflict? Necessary?
+		self.unit_row = units # Rename due to conflict? Necessary?
+		self.x_column = x_column
+		self.y_column = y_column
+
+		# Grab the relevant data and store as instance variables
+		self.x = self._x_data(self.x_column)
+		self.y1 = self._y_data(self.y_column)
+		self.x_original = self.x.copy()
+		self.y1_original = self.y1.copy()
+
+		self.section.parse_labels(labels)
+		self.labels = self.section.labels
+		self.section.parse_units(units)
+		self.units = self.section.units if units is not None else None
+
+		self.count_counter()
+
+	def generate(self, section, counter, label_row, x_column, y_column,
+				 unit_row=None, convert=False, zero=False, split=False,
+				 valley=None, peak=None):
+		"""Pull the data of the plot from the section and process it according to
+		the file's options. Doesn't rely on any widgets, so that plots can also be
+		generated without the GUI."""
+
+		self._generate(section, counter, label_row, x_column, y_column, unit_row)
+
+		# Determine how many failures there are before modifying plot.x
+		# and plot.y any further
+		if convert and counter == 'segments': self.convert()
+
+		if valley is not None and peak is not None:
+			self.determine_failures(valley, peak)
+
+		if split: self.split()
+		if zero: self.zero()
+
+		self.construct_labels()
+		self.index()
+
+	def index(self):
+		"""Index the combined data once it has been modified, so that the crosshair
+		can find the point nearest to the mouse by binary search, and compute its
+		statistics so that they don't have to be recomputed for every redraw."""
+
+		x, y, _, _ = self._combine()
+		self.x_index = interaction.SortedIndex(x)
+		self.statistics = analysis.statistics([self.x_label, self.y1_label], [x, y])
+
+	def construct_labels(self):
+		x_label = self.labels.iloc[self.x_column - 1]
+		x_unit = self.units.iloc[self.x_column - 1] if self.units is not None else None
+		self.x_label = f'{x_label} ({x_unit})' if x_unit else f'{x_label}'
+
+		y1_label = self.labels.iloc[self.y_column - 1]
+		y1_unit = self.units.iloc[self.y_column - 1] if self.units is not None else None
+		self.y1_label = f'{y1_label} ({y1_unit})' if y1_unit else f'{y1_label}'
+
+		date = self.section.date
+		time = self.section.time
+
+		if self.counter == 'cycles' or self.DATA_CONVERTED:
+			counter_type = 'Cycles'
+		elif self.counter == 'segments':
+			counter_type = 'Segments'
+		elif self.counter == 'other':
+			counter_type = 'Count'
+
+		# total = self.total_cycles if self.DATA_CONVERTED and self.counter == 'segments' else self.total_segments
+		total = self.total_cycles if self.DATA_CONVERTED or self.counter == 'cycles' else self.total_segments
+		self.title = (
+			f'{date} {time}\n'
+			f'{counter_type} 1 to {total}\n'
+			f'{y1_label} vs. {x_label}'
+		)
+
+		self.title_original = self.title
+		self.x_label_original = self.x_label
+		self.y1_label_original = self.y1_label
+
+	def update_plot(self, flipbook, file_number, plot_number):
+
+		# Create a reference to the flipbook's primary axis for shorthand
+		primary = flipbook.primary
+
+		# Display the filename of the current plot
+		filename = flipbook.info[file_number].filename
+		flipbook.filename.set(f'{filename} - Plot {plot_number + 1}')
+
+		# Essentially reset the secondary axis by clearing and turning it off if it exists,
+		# then setting the self.secondary variable to None
+		if flipbook.secondary:
+			flipbook.secondary.clear()
+			flipbook.secondary.axis('off')
+		flipbook.secondary = None
+
+		# Clear the primary axis as well
+		primary.clear()
+
+		# Set the appropriate coordinates format to display on the flipbook
+		primary.set_zorder(1000)
+		primary.format_coord = flipbook._coordinates(flipbook.primary, None, False)
+
+		# Plot all of the data as a single artist, colored by each point's category,
+		# letting the transform scale and offset the data as it is drawn
+		x, y, codes, categories = self._combine()
+		colors = [pv_colors[category] for category in categories]
+		scaling = self.scaling()
+		if len(x) > self.density_above:
+			self._draw_density(primary, x, y, codes, colors, scaling)
+		else:
+			colormap = mpl.colors.ListedColormap(colors)
+			primary.scatter(x, y, c=codes, cmap=colormap, vmin=-0.5,
+							vmax=len(colors) - 0.5, s=self.marker_size, linewidths=0,
+							rasterized=len(x) > self.rasterize_above,
+							transform=scaling.transform(primary))
+		# Let the crosshair look up the y-value of the point nearest to the mouse
+		self.cursor_series = [(primary, self.y1_label, y, None, scaling)]
+		# The legend needs an entry for each category, which are only used as handles
+		handles = [mpl.lines.Line2D([], [], color=color, marker='o', linestyle='',
+									label=pv_labels[category])
+				   for color, category in zip(colors, categories)]
+
+		# Look up the minimum and maximum values of the x data as they are shown
+		min_x, max_x = scaling.x_extent(self.statistics['min'].iloc[0],
+										self.statistics['max'].iloc[0])
+		# Determine adequate padding for the x-axis and set the x-axis limits accordingly.
+		padding = (max_x - min_x) * (100/90) * (0.05)
+		# Store the original x-axis limits to allow the user to revert to them if desired.
+		self.x_lower_original = min_x - padding
+		self.x_upper_original = max_x + padding
+		primary.set_xlim(self.x_lower_original, self.x_upper_original)
+		# Store the original y-axis limits to allow the user to revert to them if desired.
+		self.y1_lower_original = primary.get_ylim()[0]
+		self.y1_upper_original = primary.get_ylim()[1]
+
+		# Set each axis limit to the user-specified value. The limits are kept in
+		# the units of the data, so they are scaled just like the data is
+		x_lower, x_upper = scaling.x_limits(self.x_lower, self.x_upper)
+		y1_lower, y1_upper = scaling.y_limits(self.y1_lower, self.y1_upper)
+		if x_lower is not None: flipbook.primary.set_xlim(left=x_lower)
+		if x_upper is not None: flipbook.primary.set_xlim(right=x_upper)
+		if y1_lower is not None: flipbook.primary.set_ylim(bottom=y1_lower)
+		if y1_upper is not None: flipbook.primary.set_ylim(top=y1_upper)
+
+		# Set a standard number of axis ticks to make it easier to line up the gridlines
+		if self.primary_ticks:
+			PRIMARY = flipbook.primary.get_ylim()
+			flipbook.primary.set_yticks(np.linspace(PRIMARY[0], PRIMARY[1],
+										int(self.primary_ticks)))
+
+		# Plot horizontal lines showing pass/fail criteria, which are given in the
+		# units of the data and so are scaled the same way
+		if self.FAILURES_DETERMINED:
+			# Visual pass/fail criteria indication for valley
+			if self.valley_mode == 'threshold':
+				primary.axhline(y=scaling.y(max(self.valley)), color='r', linestyle='--', alpha=0.3)
+			elif self.valley_mode == 'range':
+				primary.fill_between(primary.get_xlim(), scaling.y(min(self.valley)), scaling.y(max(self.valley)), color='b', alpha=0.3)
+			# Visual pass/fail criteria indication for peak
+			if self.peak_mode == 'threshold':
+				primary.axhline(y=scaling.y(max(self.peak)), color='r', linestyle='--', alpha=0.3)
+			elif self.peak_mode == 'range':
+				primary.fill_between(primary.get_xlim(), scaling.y(min(self.peak)), scaling.y(max(self.peak)), color='b', alpha=0.3)
+
+		# Turn the grid on, with both major and minor gridlines
+		primary.grid(b=True, which='major', color='#666666', linestyle='-', alpha=0.5)
+		primary.minorticks_on()
+		primary.grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
+
+		# Set the title
+		print('About to show this title:', self.title)
+		flipbook.figure.suptitle(self.title, fontweight='bold', fontsize=12)
+		# Construct the axis labels further if necessary
+		if self.counter == 'segments' and self.DATA_CONVERTED:
+			self.x_label = self.x_label.replace('segments', 'cycles')
+		# Set the axis labels
+		primary.set_xlabel(self.x_label)
+		primary.set_ylabel(self.y1_label)
+
+		# If pass/fail criteria were specified...
+		if self.FAILURES_DETERMINED:
+			if self.counter != 'other':
+				# Add a text box listing the number of passes and fails
+				props = dict(boxstyle='round', facecolor='white', alpha=0.5)
+				if self.counter == 'cycles' or self.DATA_CONVERTED:
+					counter_type = 'Cycles'
+					failed = self.failed_cycles
+					passed = self.passed_cycles
+				elif self.counter == 'segments':
+					counter_type = 'Segments'
+					failed = self.failed_segments
+					passed = self.passed_segments
+				elif self.counter == 'other':
+					counter_type = ''
+					failed = self.failed_segments
+					passed = self.passed_segments
+				# text = f'{failed} Failed {counter_type}' + '\n' \
+				# 	f'{passed} Passed {counter_type}'
+				text = f'{passed} Passed {counter_type}'
+				primary.text(0.80, 1.05, text, transform=primary.transAxes,
+							fontsize=12, bbox=props)
+			# Add text boxes describing the limit lines
+			upper_y = scaling.y(float(min(self.peak))) - 0.05*(primary.get_ylim()[1]-primary.get_ylim()[0])
+			x_position = primary.get_xlim()[0] + (primary.get_xlim()[1]-primary.get_xlim()[0])/2
+			# if len(self.peak) == 1:
+			if self.peak_mode == 'threshold':
+				peak_string = f'Minimum Peak: {min(self.peak)}'
+			# elif len(self.peak) == 2:
+			elif self.peak_mode == 'range':
+				peak_string = f'Valid Peak Range: {min(self.peak)} --> {max(self.peak)}'
+			primary.text(x_position, upper_y,
+						peak_string,
+						fontsize=10, bbox=props, ha='center', va='top')
+			lower_y = scaling.y(float(max(self.valley))) + 0.05*(primary.get_ylim()[1]-primary.get_ylim()[0])
+			# if len(self.valley) == 1:
+			if self.valley_mode == 'threshold':
+				valley_string = f'Maximum Valley: {max(self.valley)}'
+			# elif len(self.valley) == 2:
+			elif self.valley_mode == 'range':
+				valley_string = f'Valid Valley Range: {min(self.valley)} --> {max(self.valley)}'
+			primary.text(x_position, lower_y,
+						valley_string,
+						fontsize=10, bbox=props, ha='center', va='bottom')
+
+		# Determine the maximum number of columns in the legend
+		columns = len(self.x) if isinstance(self.x, list) else 1
+		# Create the legend
+		legend = flipbook.primary.legend(
+						handles = handles,
+						loc = 'lower left',
+						fancybox = True,
+						shadow = True,
+						ncol = columns,
+						mode = 'expand',
+						bbox_to_anchor = (-0.15, -0.2, 1.265, 0.1),
+			)
+		# Make the legend draggable (possibly a control in the future)
+		interaction.make_draggable(legend, flipbook.blitter)
+
+		# Draw the cached Tactair image as a layer behind the plot
+		flipbook.background = backgrounds.draw(flipbook.figure, primary,
+			backgrounds.resource(os.path.join('Assets', 'tactair.bmp')), flipbook.background)
+
+	def _combine(self):
+		"""Combine the x and y data of every category into single arrays, along with
+		an array that holds the category code of each point. The categories are
+		returned in the order that their codes refer to them.
+
+		The arrays are only combined the first time they are drawn after the plot is
+		generated."""
+
+		if self._points is None:
+			# Determine which categories the data has been separated into
+			if not self.FAILURES_DETERMINED and not self.DATA_SPLIT:
+				categories = ['general']
+			elif self.FAILURES_DETERMINED and self.DATA_SPLIT:
+				categories = ['fail', 'valley', 'peak']
+			elif self.FAILURES_DETERMINED and not self.DATA_SPLIT:
+				categories = ['fail', 'pass']
+			elif not self.FAILURES_DETERMINED and self.DATA_SPLIT:
+				categories = ['valley', 'peak']
+			# Put the data in lists, even if there is only one category
+			xs = self.x if isinstance(self.x, list) else [self.x]
+			ys = self.y1 if isinstance(self.y1, list) else [self.y1]
+			# Concatenate the data and label each point with the code of its category
+			x = np.concatenate([np.asarray(item, dtype=float) for item in xs])
+			y = np.concatenate([np.asarray(item, dtype=float) for item in ys])
+			codes = np.repeat(np.arange(len(ys), dtype=np.uint8),
+							  [len(item) for item in ys])
+			self._points = (x, y, codes, categories)
+		return self._points
+
+	def _draw_density(self, axis, x, y, codes, colors, scaling):
+		"""Aggregate the points into a grid with roughly one cell per pixel and draw
+		the grid as a single image. Each cell takes the color of the last category
+		that falls within it, just as overlapping markers would, and its opacity
+		increases with the number of points it holds. The image is placed over the
+		scaled extent of the data."""
+
+		# Determine the size of the grid from the size of the axis in pixels
+		bbox = axis.get_window_extent()
+		width, height = max(int(bbox.width), 1), max(int(bbox.height), 1)
+
+		# Ignore any points that cannot be placed on the grid
+		valid = np.isfinite(x) & np.isfinite(y)
+		x, y, codes = x[valid], y[valid], codes[valid]
+		if not len(x): return
+
+		# Determine which cell each point belongs to
+		x_low, x_high = x.min(), x.max()
+		y_low, y_high = y.min(), y.max()
+		x_range = (x_high - x_low) or 1
+		y_range = (y_high - y_low) or 1
+		columns = ((x - x_low) / x_range * (width - 1)).astype(np.int64)
+		rows = ((y - y_low) / y_range * (height - 1)).astype(np.int64)
+		cells = rows * width + columns
+
+		# Color each cell according to the categories in the order they are drawn
+		image = np.zeros((height * width, 4))
+		for code, color in enumerate(colors):
+			occupied = np.bincount(cells[codes == code], minlength=height*width) > 0
+			image[occupied] = mpl.colors.to_rgba(color)
+		# Scale the opacity of each cell logarithmically with its number of points
+		counts = np.bincount(cells, minlength=height*width)
+		opacity = np.log1p(counts) / np.log1p(counts.max())
+		image[:, 3] = np.where(counts > 0, 0.35 + 0.65 * opacity, 0)
+
+		# Draw the grid over the extent of the data, which flips the image along with
+		# any negative scale factors
+		extent = [scaling.x(x_low), scaling.x(x_high), scaling.y(y_low), scaling.y(y_high)]
+		axis.imshow(image.reshape(height, width, 4), origin='lower', aspect='auto',
+					interpolation='nearest', extent=extent)
+		axis.autoscale_view()
+
+	def on_click(self, event, flipbook):
+		pass
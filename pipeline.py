@@ -0,0 +1,66 @@
+import contextlib
+import time
+
+
+class Pipeline:
+    """A sequence of named stages that each take the output of the stage before
+    them, along with their own settings, and return their own output.
+
+    The output of each stage is remembered along with a fingerprint of everything
+    that went into it, which is the stage's settings combined with the fingerprint
+    of the stage before it. When the pipeline is run again, every stage whose
+    fingerprint has not changed reuses its output, so changing the settings of a
+    late stage never recomputes the stages before it. Only the most recent output
+    of each stage is kept.
+
+    The settings of each stage must be hashable and cheap to compare, e.g. tuples
+    of numbers and strings. Data that is too large to compare, such as the file's
+    DataFrame, should be represented by a counter that changes along with it."""
+
+    def __init__(self, *stages):
+        """Store the stages, which are (name, function) tuples in the order that
+        they are run. Each function is called as function(data, settings)."""
+
+        self.stages = list(stages)
+
+        # Keep track of the fingerprint and output of each stage
+        self.cache = {}
+        # Keep track of how long each stage took the last time it was computed
+        self.timings = {}
+
+    def run(self, settings, until=None):
+        """Run the stages in order, stopping after the stage named until if it is
+        specified, and return the output of the last stage that was run. Settings
+        is a dictionary of each stage's settings, keyed by the stage's name."""
+
+        fingerprint = ()
+        data = None
+        for name, function in self.stages:
+            # Combine the stage's settings with the fingerprint of the stage before
+            fingerprint = (fingerprint, settings.get(name))
+            cached = self.cache.get(name)
+            if cached is not None and cached[0] == fingerprint:
+                data = cached[1]
+            else:
+                with self.timed(name):
+                    data = function(data, settings.get(name))
+                self.cache[name] = (fingerprint, data)
+            if name == until: break
+        return data
+
+    def clear(self):
+        """Forget the output of every stage."""
+
+        self.cache = {}
+
+    @contextlib.contextmanager
+    def timed(self, name):
+        """Record how long the code within the context takes under the specified
+        name. Used for the stages, as well as for steps outside of the pipeline
+        such as rendering, so that each can be benchmarked separately."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
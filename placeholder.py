@@ -0,0 +1,185 @@
+import re
+import tkinter as tk
+
+import configobj
+
+import api
+import parsing
+from basic import BasicFile, PlotRow
+
+
+def kind_of(file):
+    """Return the class of a file's tab, whether or not the tab has been built."""
+
+    return file.kind if isinstance(file, Placeholder) else type(file)
+
+
+class Placeholder:
+    """Stands in for a file's notebook tab until the tab is first selected, so that
+    hundreds of files can be loaded without creating their widgets or reading any
+    of them. The placeholder only has an empty tab with the file's name, and holds
+    the file's section of the preset, if there is one, until the real tab is built.
+
+    Saving a preset, pasting into or clearing every row of a basic file, and
+    validating and generating the plots for the flipbook are all done on the held
+    section, so plotting doesn't build any tabs. Anything else builds the real tab
+    first."""
+
+    def __init__(self, notebook, kind, filepath, app, info=None, rows=0):
+        """Add an empty tab for the file. The kind is the class of the file's tab,
+        and rows is the number of rows that need to be added to it when the
+        preset section is loaded, just like the file's load_preset method takes."""
+
+        self.notebook = notebook
+        self.kind = kind
+        self.filepath = filepath
+        self.filename = self.filepath.split('/')[-1]
+        self.app = app
+        self.info = info
+        self.rows = rows
+
+        # Keep track of the source that the plots are generated from, and the plots
+        # themselves, which keep their settings between openings of the flipbook and
+        # are handed to the real tab once it is built
+        self.source = None
+        self.plots = []
+        self.labels = None
+        self.data = None
+
+        # Add an empty tab with the file's name, which the real tab replaces
+        self.tab = tk.Frame(notebook)
+        notebook.add(self.tab, text=self.filename)
+
+    @property
+    def _count(self):
+        """The number of plots in the file."""
+
+        return len(self.plots)
+
+    def build(self):
+        """Create the real tab in place of the placeholder and return the file. The
+        preset section is loaded by the application once the file has taken the
+        placeholder's place in its list of files."""
+
+        index = self.notebook.index(self.tab)
+        selected = self.notebook.select() == str(self.tab)
+
+        # The new tab is added at the end, so move it to where the placeholder is,
+        # then select it before removing the placeholder so focus stays put
+        file = self.kind(self.notebook, self.filepath, self.app)
+        self.notebook.insert(index, self.notebook.tabs()[-1])
+        if selected: self.notebook.select(index)
+        self.notebook.forget(self.tab)
+        self.tab.destroy()
+        return file
+
+    def _built(self):
+        """Build the real tab and return the file, for when the held section isn't
+        enough."""
+
+        return self.app.build(self.app.files.index(self))
+
+    def _plots(self):
+        """Return the plot subsections of the held section."""
+
+        return [value for value in self.info.values()
+                if isinstance(value, configobj.Section)]
+
+    def paste_all(self):
+        """Pastes the contents of the clipboard into every row."""
+
+        if self.kind is not BasicFile or self.info is None:
+            self._built().paste_all()
+            return
+        for plot in self._plots():
+            for key, value in PlotRow.from_section(self.app.clipboard).section().items():
+                plot[key] = value
+
+    def clear_all(self, delete_header=True):
+        """Clear the contents of every field. A file without a preset section
+        hasn't been filled in yet, so there is nothing to clear."""
+
+        if self.info is None: return
+        if self.kind is not BasicFile:
+            self._built().clear_all()
+            return
+        if delete_header:
+            for key in ['data start', 'label row', 'unit row']:
+                self.info[key] = ''
+        for plot in self._plots():
+            for key, value in PlotRow().section().items():
+                plot[key] = value
+
+    def save_preset(self, preset, file, filepath, file_index):
+        """Record the held section in the preset, or the real tab's fields if
+        there isn't one."""
+
+        if self.info is None:
+            built = self._built()
+            built.save_preset(preset, built, filepath, file_index)
+            return
+        preset[f'File {file_index+1}'] = self.info.dict()
+        preset[f'File {file_index+1}']['filepath'] = filepath
+
+    def _check_basic(self):
+        """Check the held section of a basic file the same way that the tab checks
+        its fields, returning True or the kind of problem that was found."""
+
+        info, plots = self.info, self._plots()
+
+        # Make sure that the required fields were filled in
+        required = [info['data start'], info['label row']]
+        for plot in plots:
+            required += [plot['x column'], plot['y1 columns']]
+        if not all(required): return 'blanks'
+
+        # Make sure that single rows and columns were given a single number
+        singles = [info['data start'], info['label row']]
+        singles += [plot['x column'] for plot in plots]
+        if any(len(re.findall(r'\d+', text)) > 1 for text in singles): return 'length'
+
+        # Make sure that the label and unit rows come before the data
+        data, label = int(info['data start']), int(info['label row'])
+        if label > data: return 'rows'
+        if info['unit row'] and int(info['unit row']) > data: return 'rows'
+
+        # Count the columns from the labels alone, so the data doesn't need to be read
+        columns = self.app.catalog.header(self.filepath, label).columns
+        for plot in plots:
+            used = [int(plot['x column'])] + parsing.columns(plot['y1 columns']) \
+                   + parsing.columns(plot['y2 columns'])
+            if any(not 1 <= column <= columns for column in used): return 'columns'
+
+        return True
+
+    def validate_inputs(self):
+        """Check the held section, returning True or the kind of problem that was
+        found. A file without a preset section hasn't been filled in yet."""
+
+        if self.info is None: return 'blanks'
+        if self.kind is BasicFile: return self._check_basic()
+        return True
+
+    def reset(self):
+        """Forget the source, just like a tab forgets its data."""
+
+        self.source = None
+        self.labels = None
+        self.data = None
+
+    def generate(self):
+        """Generate the plots straight from the held section, the same way that a
+        preset is plotted without the GUI."""
+
+        self.source = api.preset_source(self.info)
+        # Keep the plots from the last time, along with their settings, as long as
+        # the plots haven't changed since
+        if len(self.plots) == len(self.source.plots):
+            self.source.plots = self.plots
+        self.plots = self.source.plots
+        self.source.generate()
+
+        # Basic files are compared against each other by their labels and data
+        if self.kind is BasicFile:
+            self.labels = self.source.labels
+            self.data = self.source.data
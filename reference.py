@@ -0,0 +1,192 @@
+import os
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import filedialog as fd
+from tkinter import ttk
+
+import lemons.gui as gui
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+import analysis
+
+
+class Comparison:
+    """Holds the result of comparing one column of one file against the envelope
+    around the reference column."""
+
+    def __init__(self, filename, label, x, y, reference, upper, lower):
+        """Store the aligned data and find the excursions from the envelope."""
+
+        self.filename = filename
+        self.label = label
+        self.x = x
+        self.y = y
+        self.reference = reference
+        self.upper = upper
+        self.lower = lower
+
+        # The residual is what is left of the data after the reference is removed
+        self.residual = y - reference
+        self.events = analysis.excursions(x, y, upper, lower)
+        self.passed = self.events.empty
+
+
+def _column(file, label):
+    """Return the data of the column with the specified label as a float array, or
+    None if the file does not have that column."""
+
+    if label not in file.labels: return None
+    values = file.data.iloc[:, file.labels.index(label)]
+    return np.asarray(pd.to_numeric(values, errors='coerce'), dtype=float)
+
+
+def _compare(file, x_label, label, reference_x, reference_y, plus, minus, lag):
+    """Compare a single column of a single file against the reference. Returns
+    None if the file does not have the x column or the column being compared."""
+
+    x = _column(file, x_label)
+    y = _column(file, label)
+    if x is None or y is None: return None
+
+    # Move the reference onto this file's x-grid and build the envelope around it
+    reference = analysis.align(reference_x, reference_y, x)
+    upper, lower = analysis.envelope(x, reference, plus, minus, lag)
+    return Comparison(file.filename, label, x, y, reference, upper, lower)
+
+
+def evaluate(reference, files, x_label, labels, plus, minus, lag):
+    """Compare each of the labeled columns of every file against the same columns
+    of the reference file. Columns are matched by their labels, so the files do
+    not need to have their columns in the same order.
+
+    The comparisons are independent of each other and spend most of their time in
+    numpy, which releases the GIL, so they are run on a pool of threads. Returns
+    the list of comparisons along with a pass/fail matrix that has a row for each
+    file and a column for each label."""
+
+    # Grab the reference data once, rather than once per comparison
+    reference_x = _column(reference, x_label)
+    references = {label: _column(reference, label) for label in labels}
+    others = [file for file in files if file is not reference]
+
+    # Run every comparison on the thread pool
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(_compare, file, x_label, label, reference_x,
+                                   references[label], plus, minus, lag)
+                   for file in others for label in labels]
+        comparisons = [future.result() for future in futures]
+    comparisons = [comparison for comparison in comparisons if comparison]
+
+    # Fill in the matrix, leaving it blank where a file is missing a column
+    matrix = pd.DataFrame('', index=[file.filename for file in others],
+                          columns=labels)
+    for comparison in comparisons:
+        matrix.loc[comparison.filename, comparison.label] = \
+            'PASS' if comparison.passed else 'FAIL'
+
+    return comparisons, matrix
+
+
+class ReferenceWindow(tk.Toplevel):
+    """A window that shows the pass/fail matrix of a reference comparison, as well
+    as a page with the residual of each comparison."""
+
+    def __init__(self, master, reference, comparisons, matrix):
+        """Create the window and show the first residual page."""
+
+        tk.Toplevel.__init__(self, master)
+        self.title(f'Reference Comparison - {reference}')
+        self.columnconfigure(0, weight=1)
+
+        self.comparisons = comparisons
+        self.matrix = matrix
+        self.page = 0
+
+        frame = gui.PaddedFrame(self)
+        frame.grid(row=0, column=0, sticky='NSEW')
+        frame.columnconfigure(0, weight=1)
+
+        # Show the pass/fail matrix, with a row for each file
+        columns = list(matrix.columns)
+        self.tree = ttk.Treeview(frame, columns=columns, height=min(len(matrix), 8))
+        self.tree.heading('#0', text='File')
+        for column in columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=90, anchor='center')
+        for filename, row in matrix.iterrows():
+            self.tree.insert('', 'end', text=filename, values=list(row))
+        self.tree.grid(row=0, column=0, columnspan=4, sticky='NSEW')
+
+        # Create the buttons that flip between the residual pages
+        previous_button = ttk.Button(frame, text='◀', width=3, takefocus=0,
+                                     command=lambda: self.flip_page(-1))
+        previous_button.grid(row=1, column=1, pady=10)
+        next_button = ttk.Button(frame, text='▶', width=3, takefocus=0,
+                                 command=lambda: self.flip_page(1))
+        next_button.grid(row=1, column=2, pady=10)
+
+        # Create a button that exports the matrix
+        export_button = ttk.Button(frame, text='Export', takefocus=0,
+                                   command=self.export)
+        export_button.grid(row=1, column=3, pady=10, sticky='E')
+
+        # Create the figure that the residual pages are drawn on
+        self.figure = Figure(figsize=(9, 6), dpi=100)
+        self.data_axis = self.figure.add_subplot(211)
+        self.residual_axis = self.figure.add_subplot(212, sharex=self.data_axis)
+        self.canvas = FigureCanvasTkAgg(self.figure, frame)
+        self.canvas.get_tk_widget().grid(row=2, column=0, columnspan=4, sticky='NSEW')
+
+        self.update_page()
+
+    def flip_page(self, step):
+        """Move to the previous or next residual page."""
+
+        if not self.comparisons: return
+        self.page = (self.page + step) % len(self.comparisons)
+        self.update_page()
+
+    def update_page(self):
+        """Draw the current comparison and its residual."""
+
+        self.data_axis.clear()
+        self.residual_axis.clear()
+        if not self.comparisons:
+            self.figure.suptitle('No files had matching columns to compare')
+            self.canvas.draw()
+            return
+
+        current = self.comparisons[self.page]
+        status = 'PASS' if current.passed else 'FAIL'
+        self.figure.suptitle(f'{current.filename} - {current.label} ({status})',
+                             fontweight='bold')
+
+        # Draw the data within the envelope around the reference
+        self.data_axis.plot(current.x, current.y, 'k', label=current.label)
+        self.data_axis.plot(current.x, current.reference, 'b', alpha=0.5,
+                            label='Reference')
+        self.data_axis.fill_between(current.x, current.lower, current.upper,
+                                    color='b', alpha=0.15, label='Envelope')
+        self.data_axis.legend(loc='upper right')
+        self.data_axis.grid(b=True, alpha=0.5)
+
+        # Draw the residual, with each excursion highlighted
+        self.residual_axis.plot(current.x, current.residual, 'k')
+        self.residual_axis.axhline(0, color='b', alpha=0.5)
+        for start, end in zip(current.events['start'], current.events['end']):
+            self.residual_axis.axvspan(start, end, color='r', alpha=0.3)
+        self.residual_axis.set_ylabel('Residual')
+        self.residual_axis.grid(b=True, alpha=0.5)
+
+        self.canvas.draw()
+
+    def export(self):
+        """Save the pass/fail matrix to a CSV file."""
+
+        path = fd.asksaveasfilename(title='Export pass/fail matrix',
+                                    defaultextension='.csv',
+                                    filetypes=[('CSV files', '*.csv')])
+        if path: self.matrix.to_csv(path, index_label='File')
@@ -0,0 +1,129 @@
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+from basicplot import BasicPlot
+from peakvalleyplot import PeakValleyPlot
+
+
+# Artists with more points than this are rasterized within the vector pages
+RASTERIZE_ABOVE = 20000
+
+# The number of rows that fit in a summary table on a single page
+ROWS_PER_PAGE = 25
+
+
+def _points(artist):
+    """Return the number of points that an artist draws."""
+
+    if isinstance(artist, Line2D):
+        return len(artist.get_xdata(orig=False))
+    elif isinstance(artist, LineCollection):
+        return sum(len(segment) for segment in artist.get_segments())
+    return len(artist.get_offsets())
+
+
+def rasterize_dense(figure, threshold=RASTERIZE_ABOVE):
+    """Rasterize every line and collection in the figure that has more points than
+    the threshold. The rest of the page, e.g. the text, axes and legend, is kept as
+    vectors, so the page stays sharp while dense data doesn't bloat the file."""
+
+    for axis in figure.axes:
+        for artist in list(axis.lines) + list(axis.collections):
+            artist.set_rasterized(_points(artist) > threshold)
+
+
+def pass_fail_rows(flipbook):
+    """Return a row for every peak valley page that had pass/fail criteria,
+    counting cycles or segments just as the page does."""
+
+    rows = []
+    for page, plot in enumerate(flipbook.plots):
+        if not isinstance(plot, PeakValleyPlot): continue
+        summary = plot.summary()
+        if summary is None: continue
+        total, passed = summary['total'], summary['passed']
+        rate = f'{100*passed/total:.1f}%' if total else '-'
+        rows.append([page+1, flipbook.info[flipbook.files[page]].filename,
+                     flipbook.numbers[page]+1, summary['counter'], total, passed,
+                     summary['failed'], rate])
+    return rows
+
+
+def band_rows(flipbook):
+    """Return a row for every band and series of each basic page whose series left
+    its tolerance bands, counting the excursions on each side of the band."""
+
+    rows = []
+    for page, plot in enumerate(flipbook.plots):
+        if not isinstance(plot, BasicPlot) or plot.band_events is None: continue
+        for (band, series), events in plot.band_events.groupby(['band', 'series'],
+                                                               sort=False):
+            above = int((events['side'] == 'above').sum())
+            below = int((events['side'] == 'below').sum())
+            rows.append([page+1, flipbook.info[flipbook.files[page]].filename,
+                         flipbook.numbers[page]+1, band, series, above, below,
+                         f'{events["duration"].sum():.4g}',
+                         f'{events["peak excursion"].max():.4g}'])
+    return rows
+
+
+# The title, column headers and rows of each summary
+SUMMARIES = [
+    ('Pass/Fail Summary',
+     ['Page', 'File', 'Plot', 'Counter', 'Total', 'Passed', 'Failed', 'Pass Rate'],
+     pass_fail_rows),
+    ('Tolerance Band Violations',
+     ['Page', 'File', 'Plot', 'Band', 'Series', 'Above', 'Below',
+      'Total Duration', 'Largest Excursion'],
+     band_rows),
+]
+
+
+def _tables(pdf, title, columns, rows, figsize):
+    """Draw the rows as tables, starting a new page whenever a page fills up."""
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    for start in range(0, len(rows), ROWS_PER_PAGE):
+        figure.clear()
+        continued = ' (continued)' if start else ''
+        figure.suptitle(title + continued, fontweight='bold', fontsize=14)
+        axis = figure.add_subplot(111)
+        axis.axis('off')
+        table = axis.table(cellText=rows[start:start+ROWS_PER_PAGE],
+                           colLabels=columns, loc='upper center',
+                           cellLoc='center')
+        table.auto_set_font_size(False)
+        table.set_fontsize(9)
+        table.scale(1, 1.4)
+        pdf.savefig(figure)
+
+
+def write(path, flipbook, dpi=150, threshold=RASTERIZE_ABOVE, progress=None):
+    """Write every page of an offscreen flipbook to a single PDF, followed by
+    tables that summarize the pass/fail results and tolerance band violations.
+
+    Each page is drawn on the flipbook's figure and written to the file before the
+    next page is drawn, so only one page is ever held in memory, no matter how
+    many pages there are. The dpi only applies to the rasterized artists. If a
+    progress function is given, it is called with the number of pages written and
+    the total number of plot pages after each one."""
+
+    with PdfPages(path) as pdf:
+        # Stream the plots into the file one page at a time
+        def output(figure):
+            rasterize_dense(figure, threshold)
+            pdf.savefig(figure, dpi=dpi)
+
+        for page in range(flipbook.pages):
+            flipbook.render(page, output)
+            if progress: progress(page+1, flipbook.pages)
+
+        # Add the summaries after the plots, leaving out any that are empty
+        figsize = flipbook.figure.get_size_inches()
+        for title, columns, summarize in SUMMARIES:
+            rows = summarize(flipbook)
+            if rows: _tables(pdf, title, columns, rows, figsize)
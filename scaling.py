@@ -0,0 +1,91 @@
+from matplotlib.transforms import Affine2D
+
+
+class Scaling:
+    """The scale factors and offsets that are applied to an axis's data when it is
+    shown, so that each shown value is the data's value times the scale plus the
+    offset.
+
+    The data itself is never modified. Instead, the scaling is drawn as an affine
+    transform in front of the axis's data transform, so changing it only changes a
+    3x3 matrix, no matter how many points are plotted. The same scaling converts
+    values between the data and what is shown, e.g. for readouts and limits.
+    Axis limits are kept in the units of the data, so they stay with the data when
+    the scaling changes."""
+
+    def __init__(self, x_scale=1, x_offset=0, y_scale=1, y_offset=0):
+        """Store the scale factors and offsets."""
+
+        self.x_scale = x_scale
+        self.x_offset = x_offset
+        self.y_scale = y_scale
+        self.y_offset = y_offset
+
+    def transform(self, axis):
+        """Return the transform that draws data on the axis with the scaling."""
+
+        affine = Affine2D().scale(self.x_scale, self.y_scale) \
+                           .translate(self.x_offset, self.y_offset)
+        return affine + axis.transData
+
+    def x(self, value):
+        """Convert an x-value of the data to the value that is shown."""
+
+        # Leave values alone when there is no scaling, since they might not be numbers
+        if (self.x_scale, self.x_offset) == (1, 0): return value
+        return value * self.x_scale + self.x_offset
+
+    def y(self, value):
+        """Convert a y-value of the data to the value that is shown."""
+
+        return value * self.y_scale + self.y_offset
+
+    def x_data(self, value):
+        """Convert an x-value that is shown back to the value of the data."""
+
+        if (self.x_scale, self.x_offset) == (1, 0): return value
+        return (value - self.x_offset) / self.x_scale
+
+    def y_data(self, value):
+        """Convert a y-value that is shown back to the value of the data."""
+
+        return (value - self.y_offset) / self.y_scale
+
+    def x_extent(self, low, high):
+        """Return the shown extent of the data's x-extent, lowest value first."""
+
+        return tuple(sorted((self.x(low), self.x(high))))
+
+    def y_extent(self, low, high):
+        """Return the shown extent of the data's y-extent, lowest value first."""
+
+        return tuple(sorted((self.y(low), self.y(high))))
+
+    def _limits(self, convert, scale, low, high):
+        """Convert a pair of limits with the function, lowest value first, leaving
+        limits that are None unset."""
+
+        limits = [None if value is None else convert(value) for value in (low, high)]
+        # A negative scale factor flips the axis, so the lower limit becomes the upper
+        if scale < 0: limits.reverse()
+        return tuple(limits)
+
+    def x_limits(self, low, high):
+        """Convert x-limits of the data to the x-limits that are shown."""
+
+        return self._limits(self.x, self.x_scale, low, high)
+
+    def y_limits(self, low, high):
+        """Convert y-limits of the data to the y-limits that are shown."""
+
+        return self._limits(self.y, self.y_scale, low, high)
+
+    def x_data_limits(self, low, high):
+        """Convert x-limits that are shown back to x-limits of the data."""
+
+        return self._limits(self.x_data, self.x_scale, low, high)
+
+    def y_data_limits(self, low, high):
+        """Convert y-limits that are shown back to y-limits of the data."""
+
+        return self._limits(self.y_data, self.y_scale, low, high)
@@ -0,0 +1,301 @@
+import argparse
+import collections
+import io
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import configobj
+import matplotlib as mpl
+
+import api
+
+
+# Image formats that pages can be rendered to, along with their content types
+FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+# Sources that each worker process has already generated, keyed by (preset, file
+# key), along with the modification times that they were generated from
+_sources = {}
+
+
+def _modified(path):
+    """Return the modification time of the file, or None if it cannot be found."""
+
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _source(preset, key):
+    """Return the generated source of a file in the preset. Runs in a worker
+    process, which keeps the source until the preset or the file is modified, so
+    every page of a file only reads the file once."""
+
+    info = configobj.ConfigObj(preset)[key]
+    stamp = (_modified(preset), _modified(info['filepath']))
+    if (preset, key) not in _sources or _sources[(preset, key)][0] != stamp:
+        source = api.preset_source(info)
+        source.generate()
+        _sources[(preset, key)] = (stamp, source)
+    return _sources[(preset, key)][1]
+
+
+def _render(preset, key, number, extension, dpi):
+    """Draw a plot of a file in the preset and return the image's bytes. Runs in a
+    worker process."""
+
+    flipbook = api.OffscreenFlipbook([_source(preset, key)], dpi=dpi)
+    buffer = io.BytesIO()
+    flipbook.render(number, lambda figure: figure.savefig(buffer, format=extension))
+    return buffer.getvalue()
+
+
+def _summarize(preset, keys):
+    """Return the pass/fail summary of every peak valley plot of the specified
+    files in the preset. Runs in a worker process."""
+
+    summaries = []
+    for key in keys:
+        source = _source(preset, key)
+        for number, plot in enumerate(source.plots):
+            summary = api.analyze(plot)
+            if summary is None: continue
+            summaries.append({
+                'file': source.filename,
+                'plot': number + 1,
+                'counter': summary['counter'],
+                'total': int(summary['total']),
+                'passed': int(summary['passed']),
+                'failed': int(summary['failed']),
+            })
+    return summaries
+
+
+def _settings(info, definition):
+    """Return the settings of a plot, i.e. its file's settings along with its own,
+    as text that can be compared between requests."""
+
+    scalars = {key: value for key, value in info.items()
+               if not isinstance(value, configobj.Section)}
+    return json.dumps([scalars, definition.dict()], sort_keys=True)
+
+
+def pages(path):
+    """Return a dictionary for each page of the preset, in the same order as the
+    flipbook, with the file and plot number of the page along with the key that its
+    image is cached by. Files that don't exist or have an invalid type are left
+    out, just as they are when the preset is rendered in a batch."""
+
+    listed = []
+    for key, info in configobj.ConfigObj(path).items():
+        modified = _modified(info['filepath'])
+        if modified is None or info['type'] not in api.TYPES: continue
+        definitions = [value for value in info.values()
+                       if isinstance(value, configobj.Section)]
+        for number, definition in enumerate(definitions):
+            listed.append({
+                'key': key,
+                'type': info['type'],
+                'file': info['filepath'].split('/')[-1],
+                'plot': number + 1,
+                'cache': (info['filepath'], modified, _settings(info, definition)),
+            })
+    return listed
+
+
+class NotFound(Exception):
+    """Raised when a request names a preset or page that doesn't exist."""
+
+
+class RenderService:
+    """Renders the pages of presets on a bounded pool of worker processes, and
+    keeps the most recently rendered images in memory.
+
+    Images are cached by the data file's modification time and the settings of
+    the plot, so an image is only rendered again once its file or its part of the
+    preset changes. Concurrent requests for the same image share a single render."""
+
+    def __init__(self, presets, workers=None, cache_size=256):
+        """Store the presets by name and start the worker processes."""
+
+        self.presets = {os.path.splitext(os.path.basename(path))[0]: path
+                        for path in presets}
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                            initializer=mpl.use, initargs=('Agg',))
+        self.cache = collections.OrderedDict()
+        self.cache_size = cache_size
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def index(self):
+        """Return the pages of every preset."""
+
+        index = {}
+        for name, path in self.presets.items():
+            index[name] = [{key: page[key] for key in ['type', 'file', 'plot']}
+                           for page in pages(path)]
+        return index
+
+    def _cached(self, key, function, *args):
+        """Return the cached result of the key, or submit the function to the
+        workers and cache its result. Returns the result and whether it was cached."""
+
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key], True
+            # Share a render that is already running for the same key
+            if key not in self.pending:
+                self.pending[key] = self.executor.submit(function, *args)
+            future = self.pending[key]
+
+        try:
+            result = future.result()
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+        # Keep the result, forgetting the least recently used results once the
+        # cache is full
+        with self.lock:
+            self.cache[key] = result
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return result, False
+
+    def image(self, name, page, extension, dpi=100):
+        """Return the image of a page of a preset, numbered from 1, along with
+        whether it came from the cache. Raises NotFound if there is no such preset
+        or page."""
+
+        if name not in self.presets: raise NotFound(name)
+        path = self.presets[name]
+        listed = pages(path)
+        if not 1 <= page <= len(listed): raise NotFound(page)
+        page = listed[page-1]
+        key = ('image', page['cache'], extension, dpi)
+        return self._cached(key, _render, path, page['key'], page['plot']-1,
+                            extension, dpi)
+
+    def summary(self, name):
+        """Return the pass/fail summaries of every peak valley plot of a preset,
+        along with whether they came from the cache. Raises NotFound if there is no
+        such preset."""
+
+        if name not in self.presets: raise NotFound(name)
+        path = self.presets[name]
+        listed = [page for page in pages(path) if page['type'] == 'Peak Valley']
+        keys = list(dict.fromkeys(page['key'] for page in listed))
+        key = ('summary', tuple(page['cache'] for page in listed))
+        return self._cached(key, _summarize, path, keys)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+
+        self.executor.shutdown(wait=False)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves the pages and summaries of the render service.
+
+    GET /                           the pages of every preset, as JSON
+    GET /<preset>/<page>.png|svg    the image of a page, numbered from 1
+    GET /<preset>/summary           the pass/fail summaries of a preset, as JSON"""
+
+    def _send(self, status, content, content_type, cached=None):
+        """Send a response with the specified content."""
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if cached is not None:
+            self.send_header('X-Cache', 'hit' if cached else 'miss')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _json(self, status, value, cached=None):
+        """Send a response with the value as JSON."""
+
+        content = json.dumps(value, indent=2).encode('utf-8')
+        self._send(status, content, 'application/json', cached)
+
+    def do_GET(self):
+        """Route the request to the service."""
+
+        service = self.server.service
+        path = self.path.split('?')[0].rstrip('/')
+
+        try:
+            if not path:
+                self._json(200, service.index())
+                return
+
+            match = re.fullmatch(r'/([^/]+)/(\d+)\.(png|svg)', path)
+            if match:
+                name, page, extension = match.groups()
+                image, cached = service.image(name, int(page), extension,
+                                              self.server.dpi)
+                self._send(200, image, FORMATS[extension], cached)
+                return
+
+            match = re.fullmatch(r'/([^/]+)/summary', path)
+            if match:
+                summaries, cached = service.summary(match.group(1))
+                self._json(200, summaries, cached)
+                return
+
+            self._json(404, {'error': f'{path} was not found'})
+        except NotFound:
+            self._json(404, {'error': f'{path} was not found'})
+        except Exception as error:
+            self._json(500, {'error': str(error)})
+
+
+def main(arguments=None):
+    """Serve the pages of each preset from the command line."""
+
+    parser = argparse.ArgumentParser(
+        description='Serve the pages of one or more presets over HTTP, rendering '
+                    'them on request and caching them until their data changes.')
+    parser.add_argument('presets', nargs='+', help='preset (.ini) files to serve')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('-p', '--port', type=int, default=8050,
+                        help='port to listen on (default: 8050)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes (default: one per core)')
+    parser.add_argument('--cache', type=int, default=256,
+                        help='number of rendered images to keep (default: 256)')
+    parser.add_argument('--dpi', type=int, default=100,
+                        help='resolution of the images (default: 100)')
+    arguments = parser.parse_args(arguments)
+
+    # Make sure that nothing tries to open a window, just like the batch renderer
+    mpl.use('Agg')
+
+    service = RenderService(arguments.presets, arguments.workers, arguments.cache)
+    server = ThreadingHTTPServer((arguments.host, arguments.port), Handler)
+    server.service = service
+    server.dpi = arguments.dpi
+    print(f'Serving {", ".join(service.presets)} at '
+          f'http://{arguments.host}:{arguments.port}/', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import warnings
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb
+from matplotlib.style.core import STYLE_BLACKLIST
+from matplotlib.text import Text
+
+
+# Styles as they appear in the controls window, mapped to the matplotlib
+# styles they correspond to. Newer versions of matplotlib renamed some of the
+# styles, so the first name that matplotlib knows about is used.
+choices = {
+    'Default': ['default'],
+    'Classic': ['classic'],
+    'Seaborn': ['seaborn', 'seaborn-v0_8'],
+    'Fivethirtyeight': ['fivethirtyeight'],
+}
+
+# Parameters of each style that differ from the defaults, keyed by the style's choice
+_resolved = {}
+
+
+def resolve(choice):
+    """Return the parameters of the specified style choice that differ from
+    matplotlib's defaults. Styles are only resolved the first time they are
+    requested."""
+
+    if choice not in _resolved:
+        # Find the name that the installed version of matplotlib uses
+        names = choices.get(choice, ['default'])
+        name = next((name for name in names if name in plt.style.library),
+                    'default')
+        style = plt.style.library[name] if name != 'default' else {}
+        # Only keep what the style changes
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', mpl.MatplotlibDeprecationWarning)
+            _resolved[choice] = {key: value for key, value in style.items()
+                                 if key not in STYLE_BLACKLIST
+                                 and value != mpl.rcParamsDefault.get(key)}
+    return _resolved[choice]
+
+
+def _points(size, base):
+    """Return a font size in points, which may be given relative to the base size,
+    e.g. 'large'."""
+
+    if isinstance(size, str): return font_manager.font_scalings[size] * base
+    return float(size)
+
+
+def _same_color(a, b):
+    """Return whether the colors are the same, ignoring their transparency, which
+    is set separately, e.g. by the frame alpha of a legend."""
+
+    return to_rgb(a) == to_rgb(b)
+
+
+def apply(choice, figure):
+    """Give the figure of a page, along with its axes and everything that the page
+    drew on them, the look of the specified style choice.
+
+    Pages are drawn with the global parameters, which are never changed, so the
+    style is applied to the figure's own artists instead. The style then stays with
+    the figure however it is redrawn, e.g. when the window is resized or the figure
+    is saved from the toolbar. The size and layout of the figure are left alone."""
+
+    rc = resolve(choice)
+    default = mpl.rcParams
+
+    def get(key):
+        """Return the style's value of the parameter, or the global value."""
+
+        return rc.get(key, default[key])
+
+    # The figure and its axes are kept from page to page, so their look is always
+    # set, which also removes the style of the previous page
+    figure.set_facecolor(get('figure.facecolor'))
+    figure.set_edgecolor(get('figure.edgecolor'))
+    for axis in figure.axes:
+        axis.set_facecolor(get('axes.facecolor'))
+        axis.set_axisbelow(get('axes.axisbelow'))
+        axis.set_prop_cycle(get('axes.prop_cycle'))
+        for spine in axis.spines.values():
+            spine.set_edgecolor(get('axes.edgecolor'))
+            spine.set_linewidth(get('axes.linewidth'))
+
+        # Ticks are created whenever the axis is redrawn, so set the parameters
+        # that new ticks are created with rather than styling the ticks themselves
+        for name in ['x', 'y']:
+            for which in ['major', 'minor']:
+                axis.tick_params(axis=name, which=which,
+                                 direction=get(f'{name}tick.direction'),
+                                 length=get(f'{name}tick.{which}.size'),
+                                 width=get(f'{name}tick.{which}.width'),
+                                 pad=get(f'{name}tick.{which}.pad'),
+                                 grid_linewidth=get('grid.linewidth'))
+            labelcolor = get(f'{name}tick.labelcolor')
+            if labelcolor == 'inherit': labelcolor = get(f'{name}tick.color')
+            axis.tick_params(axis=name, which='both', color=get(f'{name}tick.color'),
+                             labelcolor=labelcolor,
+                             labelsize=_points(get(f'{name}tick.labelsize'),
+                                               get('font.size')))
+        # A secondary axis keeps its ticks on the right
+        if axis.yaxis.get_label_position() == 'left':
+            axis.tick_params(top=get('xtick.top'), right=get('ytick.right'))
+
+    # Everything else was drawn by the page, so only restyle the properties that
+    # the page didn't choose itself, i.e. the ones that still have the global value
+    # or the value that a style gave them on an earlier page
+    looks = [{}] + list(_resolved.values())
+
+    def unchanged(value, compute, compare=lambda a, b: a == b):
+        """Return whether the value is what the global parameters, or any style,
+        give the property, using the function to compute it from a getter."""
+
+        return any(compare(value, compute(lambda key, look=look: look.get(key, default[key])))
+                   for look in looks)
+
+    def restyle(value, compute, set, compare=lambda a, b: a == b):
+        """Set the property to the style's value if the page didn't choose it."""
+
+        if unchanged(value, compute, compare): set(compute(get))
+
+    handled = set()
+
+    # Axis labels. The sizes of the labels, the title and any other text are left
+    # alone, since the pages size them from their own font controls.
+    for axis in figure.axes:
+        for label in [axis.xaxis.label, axis.yaxis.label]:
+            restyle(label.get_color(), lambda get: get('axes.labelcolor'),
+                    label.set_color, _same_color)
+            handled.add(label)
+
+    # Lines, including the ones in the legends, which copy the lines they represent
+    legends = [axis.get_legend() for axis in figure.axes if axis.get_legend()]
+    legends += figure.legends
+    lines = [line for axis in figure.axes for line in axis.get_lines()]
+    lines += [line for legend in legends for line in legend.get_lines()]
+    for line in lines:
+        restyle(line.get_linewidth(), lambda get: get('lines.linewidth'),
+                line.set_linewidth)
+        restyle(line.get_solid_capstyle(), lambda get: get('lines.solid_capstyle'),
+                line.set_solid_capstyle)
+        restyle(line.get_markersize(), lambda get: get('lines.markersize'),
+                line.set_markersize)
+        restyle(line.get_markeredgewidth(), lambda get: get('lines.markeredgewidth'),
+                line.set_markeredgewidth)
+    # Plots with many series draw all of them as a single collection
+    for axis in figure.axes:
+        for collection in axis.collections:
+            if not isinstance(collection, LineCollection): continue
+            widths = set(collection.get_linewidths())
+            if len(widths) == 1:
+                restyle(widths.pop(), lambda get: get('lines.linewidth'),
+                        collection.set_linewidth)
+
+    # Legends, whose colors may be inherited from the axes
+    def inherit(get, key, parent):
+        value = get(key)
+        return get(parent) if value == 'inherit' else value
+
+    legend_size = lambda get: _points(get('legend.fontsize'), get('font.size'))
+    for legend in legends:
+        for text in legend.get_texts():
+            restyle(text.get_size(), legend_size, text.set_size)
+            handled.add(text)
+        frame = legend.get_frame()
+        restyle(legend.get_frame_on(), lambda get: get('legend.frameon'),
+                legend.set_frame_on)
+        restyle(frame.get_edgecolor(),
+                lambda get: inherit(get, 'legend.edgecolor', 'axes.edgecolor'),
+                frame.set_edgecolor, _same_color)
+        restyle(frame.get_facecolor(),
+                lambda get: inherit(get, 'legend.facecolor', 'axes.facecolor'),
+                frame.set_facecolor, _same_color)
+        restyle(frame.get_alpha(), lambda get: get('legend.framealpha'), frame.set_alpha)
+
+    # The color of any other text, such as the title, as well as the font family of
+    # all text, which is otherwise looked up from the global parameters whenever it
+    # is drawn
+    generics = ['serif', 'sans-serif', 'cursive', 'fantasy', 'monospace']
+    for text in figure.findobj(Text):
+        for generic in generics:
+            family = lambda get, generic=generic: \
+                [generic] if get(f'font.{generic}') == default[f'font.{generic}'] \
+                else list(get(f'font.{generic}'))
+            if unchanged(text.get_fontfamily(), family):
+                text.set_fontfamily(family(get))
+                break
+        if text in handled: continue
+        restyle(text.get_color(), lambda get: get('text.color'), text.set_color,
+                _same_color)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import analysis
+
+
+def windowed_reference(x, values, lag, function):
+    """Apply the function over each trailing window by brute force, i.e. over every
+    earlier sample whose x-value lies within lag of the current sample's."""
+
+    result = np.full(len(values), np.nan)
+    for i in range(len(values)):
+        if x[i] - lag < x[0]: continue
+        window = [values[j] for j in range(i + 1)
+                  if x[j] >= x[i] - lag and not np.isnan(values[j])]
+        if window: result[i] = function(window)
+    return result
+
+
+@pytest.mark.parametrize('lag', [0, 1, 2, 2.6, 3, 7.5])
+def test_windowed_uniform_matches_general(lag):
+    x = np.arange(20, dtype=float)
+    values = -x
+    uniform = analysis.windowed_max(x, values, lag)
+
+    # Moving a single sample slightly sends the data down the general path
+    nudged = x.copy()
+    nudged[10] += 1e-3
+    general = analysis.windowed_max(nudged, values, lag)
+
+    np.testing.assert_array_equal(uniform, windowed_reference(x, values, lag, max))
+    np.testing.assert_array_equal(general, windowed_reference(nudged, values, lag, max))
+    np.testing.assert_array_equal(np.isnan(uniform), np.isnan(general))
+
+
+def rolling_reference(values, window, function):
+    """Apply the function over each trailing window of samples by brute force."""
+
+    result = np.full(len(values), np.nan)
+    for i in range(window - 1, len(values)):
+        window_values = [value for value in values[i-window+1:i+1] if not np.isnan(value)]
+        if window_values: result[i] = function(window_values)
+    return result
+
+
+@pytest.mark.parametrize('window', [1, 2, 3, 7, 19, 20, 21])
+def test_rolling_matches_brute_force(window):
+    values = np.random.default_rng(0).normal(size=20)
+    values[[4, 5, 6, 12]] = np.nan
+    np.testing.assert_array_equal(analysis.rolling_max(values, window),
+                                  rolling_reference(values, window, max))
+    np.testing.assert_array_equal(analysis.rolling_min(values, window),
+                                  rolling_reference(values, window, min))
+
+
+@pytest.mark.parametrize('uniform', [True, False])
+@pytest.mark.parametrize('lag', [0, 0.5, 1, 4.2, 30])
+def test_windowed_matches_brute_force(uniform, lag):
+    rng = np.random.default_rng(1)
+    x = np.arange(40, dtype=float) if uniform else np.cumsum(rng.uniform(0.1, 2, 40))
+    values = rng.normal(size=40)
+    values[[3, 17, 18]] = np.nan
+    np.testing.assert_array_equal(analysis.windowed_max(x, values, lag),
+                                  windowed_reference(x, values, lag, max))
+    np.testing.assert_array_equal(analysis.windowed_min(x, values, lag),
+                                  windowed_reference(x, values, lag, min))
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from basicplot import BasicPlot
+
+
+def spiked_plot():
+    """Return a plot of 1000 samples with a single spike that every 10th sample
+    decimation skips over."""
+
+    y = np.zeros(1000)
+    y[505] = 10
+    data = pd.DataFrame({'time': np.arange(1000, dtype=float), 'value': y})
+    plot = BasicPlot()
+    plot.decimation, plot.decimation_points = 'Every Nth', 100
+    plot.generate(data, ['time', 'value'], 1, [2])
+    return plot
+
+
+def test_decimation_only_changes_what_is_drawn():
+    plot = spiked_plot()
+
+    # The spike isn't drawn, but the full data is kept alongside the drawn data
+    assert len(plot.x) < 1000 and plot.y1[0].max() == 0
+    assert len(plot.x_full) == 1000 and plot.y1_full[0].max() == 10
+    assert plot.statistics['max'].iloc[1] == 10
+
+    # Data computed from the full data is drawn at the same samples as the series
+    assert len(plot._drawn(np.arange(1000))) == len(plot.x)
+
+
+def test_exceedance_statistics_use_all_of_the_data():
+    plot = spiked_plot()
+    plot.line_orientation, plot.line_axis, plot.line_value = ['horizontal'], ['primary'], ['5']
+    (label, statistics), = plot.limit_statistics(0)
+    assert label == 'value'
+    assert statistics['crossings'] == 2
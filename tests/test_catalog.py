@@ -0,0 +1,22 @@
+import os
+
+from catalog import Catalog
+
+
+def test_header_is_read_again_when_the_file_changes(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('time,pressure\n0,1\n')
+    catalog = Catalog(workers=2)
+
+    header = catalog.header(str(path), 1)
+    assert header.labels == ['time', 'pressure']
+    assert catalog.header(str(path), 1) is header
+
+    # Rewrite the file and move its modification time along
+    path.write_text('time,pressure,temperature\n0,1,2\n')
+    modified = os.path.getmtime(path) + 10
+    os.utime(path, (modified, modified))
+
+    header = catalog.header(str(path), 1)
+    assert header.labels == ['time', 'pressure', 'temperature']
+    assert header.find('temperature') == [3]
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import decimation
+
+
+@pytest.mark.parametrize('points', [0, -1, -500, None])
+def test_decimate_without_positive_points_keeps_everything(points):
+    x = np.arange(100, dtype=float)
+    for mode in decimation.MODES:
+        assert decimation.decimate(x, [np.sin(x)], mode, points) is None
+
+
+@pytest.mark.parametrize('count, points', [(10, 10), (10, 1), (1, 1), (101, 7)])
+def test_stride_keeps_the_ends_and_at_most_the_points_asked_for(count, points):
+    indices = decimation.stride(count, points)
+    assert indices[0] == 0
+    assert indices[-1] == count - 1
+    assert np.all(np.diff(indices) > 0)
+    # The last sample is added on top of the points if the stride skips past it
+    assert len(indices) <= points + 1
+    if count == points:
+        np.testing.assert_array_equal(indices, np.arange(count))
+
+
+@pytest.fixture
+def signal():
+    rng = np.random.default_rng(2)
+    x = np.cumsum(rng.uniform(0.5, 1.5, 1000))
+    y = rng.normal(size=1000)
+    y[[123, 777]] = [50, -50]
+    return x, y
+
+
+def test_min_max_keeps_the_ends_and_extrema(signal):
+    x, y = signal
+    indices = decimation.min_max(y, 50)
+    assert len(indices) < len(y)
+    assert {0, len(y) - 1, 123, 777} <= set(indices)
+
+
+def test_lttb_keeps_the_ends_and_extrema(signal):
+    x, y = signal
+    indices = decimation.lttb(x, y, 50)
+    assert len(indices) <= 50
+    assert {0, len(y) - 1, 123, 777} <= set(indices)
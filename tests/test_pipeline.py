@@ -0,0 +1,33 @@
+from pipeline import Pipeline
+
+
+def test_only_the_stages_after_a_changed_input_are_recomputed():
+    calls = []
+
+    def stage(name):
+        def function(data, settings):
+            calls.append(name)
+            return (data, settings)
+        return name, function
+
+    pipeline = Pipeline(stage('read'), stage('scale'), stage('decimate'))
+    settings = {'read': 1, 'scale': (2, 0), 'decimate': ('LTTB', 100)}
+    first = pipeline.run(settings)
+    assert calls == ['read', 'scale', 'decimate']
+
+    # Running with the same inputs reuses every stage
+    calls.clear()
+    assert pipeline.run(dict(settings)) is first
+    assert calls == []
+
+    # Changing an input recomputes its stage and every stage after it
+    calls.clear()
+    settings['scale'] = (3, 0)
+    assert pipeline.run(settings) == (((None, 1), (3, 0)), ('LTTB', 100))
+    assert calls == ['scale', 'decimate']
+
+    # Clearing the pipeline forgets everything
+    calls.clear()
+    pipeline.clear()
+    pipeline.run(settings)
+    assert calls == ['read', 'scale', 'decimate']
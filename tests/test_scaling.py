@@ -0,0 +1,20 @@
+import pytest
+
+from scaling import Scaling
+
+
+@pytest.mark.parametrize('scale, offset', [(1, 0), (2.5, -3), (-4, 10)])
+def test_limits_round_trip_between_data_and_display(scale, offset):
+    scaling = Scaling(x_scale=scale, x_offset=offset, y_scale=scale, y_offset=offset)
+
+    for shown, data in [(scaling.x_limits, scaling.x_data_limits),
+                        (scaling.y_limits, scaling.y_data_limits)]:
+        low, high = shown(-2, 7)
+        assert low < high
+        assert data(low, high) == pytest.approx((-2, 7))
+
+
+def test_limits_that_are_not_set_stay_unset():
+    scaling = Scaling(x_scale=-2, x_offset=1, y_scale=3, y_offset=1)
+    assert scaling.x_limits(None, 4) == (-7, None)
+    assert scaling.y_data_limits(None, 4) == (None, 1)
@@ -0,0 +1,42 @@
+import matplotlib as mpl
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+
+import styles
+
+
+def draw():
+    figure = Figure()
+    axis = figure.add_subplot(111)
+    axis.plot([0, 1], [0, 1], label='series')
+    axis.plot([0, 1], [1, 0], linewidth=7)
+    axis.legend()
+    return figure, axis
+
+
+def test_styles_are_applied_to_the_figure_without_touching_rcparams():
+    before = {key: str(value) for key, value in mpl.rcParams.items()}
+    figure, axis = draw()
+
+    styles.apply('Fivethirtyeight', figure)
+    assert to_hex(figure.get_facecolor()) == '#f0f0f0'
+    assert to_hex(axis.get_facecolor()) == '#f0f0f0'
+    assert axis.get_lines()[0].get_linewidth() == 4
+    assert axis.get_legend().get_lines()[0].get_linewidth() == 4
+    # Lines that the page drew with their own width keep it
+    assert axis.get_lines()[1].get_linewidth() == 7
+
+    # Applying the default style afterwards undoes the previous one
+    styles.apply('Default', figure)
+    assert to_hex(figure.get_facecolor()) == to_hex(mpl.rcParams['figure.facecolor'])
+    assert axis.get_lines()[0].get_linewidth() == mpl.rcParams['lines.linewidth']
+    assert axis.get_lines()[1].get_linewidth() == 7
+
+    assert {key: str(value) for key, value in mpl.rcParams.items()} == before
+
+
+def test_resolved_styles_only_hold_what_they_change():
+    assert styles.resolve('Default') == {}
+    changed = styles.resolve('Fivethirtyeight')
+    assert 'axes.facecolor' in changed
+    assert all(value != mpl.rcParamsDefault[key] for key, value in changed.items())
@@ -0,0 +1,372 @@
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import configobj
+import matplotlib as mpl
+
+import api
+import parsing
+
+
+# Files that are picked up from the watched directory unless told otherwise
+PATTERNS = ['*.csv', '*.dat', '*.xls', '*.xlsx', '*.xlsm', '*.txt']
+
+
+def _definitions(info):
+    """Return the plot subsections of a file's section of a preset."""
+
+    return [value for value in info.values() if isinstance(value, configobj.Section)]
+
+
+def _row_labels(values):
+    """Return the labels of a row as stripped text, so they can be compared."""
+
+    return [str(value).strip() for value in values]
+
+
+def labels(info, filepath=None):
+    """Return the column labels that the plots of a file's section of a preset
+    refer to, read from the specified file or the section's own file.
+
+    A basic file has a single list of labels, while a peak valley file has a list
+    of labels for each (section, label row) that its plots use."""
+
+    filepath = filepath or info['filepath']
+    if info['type'] == 'Basic':
+        kind = parsing.filetype(filepath)
+        return _row_labels(parsing.labels(filepath, kind, int(info['label row'])))
+
+    sections = parsing.sections(filepath, parsing.delimiter_character(info['delimiter']))
+    found = {}
+    for definition in _definitions(info):
+        number, row = int(definition['section']), int(definition['label row'])
+        sections[number-1].parse_labels(row)
+        found[(number, row)] = _row_labels(sections[number-1].labels)
+    return found
+
+
+def _renumber(column, old, new, filename):
+    """Return the number of the column in the new labels that has the same label as
+    the column in the old labels."""
+
+    label = old[column-1]
+    if label not in new:
+        raise LookupError(f'{filename} has no column labeled {label!r}')
+    return new.index(label) + 1
+
+
+def retarget(info, template, filepath):
+    """Return a copy of a file's section of a preset that applies its plots to
+    another file. Every column is renumbered so that it refers to the column with
+    the same label in the other file, using the labels of the template's file. If
+    there are no template labels, the columns are used as they are."""
+
+    config = configobj.ConfigObj()
+    config['file'] = dict(info)
+    target = config['file']
+    target['filepath'] = filepath
+    if template is None: return target
+
+    filename = os.path.basename(filepath)
+    found = labels(target)
+    for definition in _definitions(target):
+        if target['type'] == 'Basic':
+            old, new = template, found
+            definition['x column'] = str(_renumber(int(definition['x column']), old,
+                                                   new, filename))
+            for field in ['y1 columns', 'y2 columns']:
+                columns = [_renumber(column, old, new, filename)
+                           for column in parsing.columns(definition[field])]
+                definition[field] = ', '.join(str(column) for column in columns)
+        else:
+            key = (int(definition['section']), int(definition['label row']))
+            old, new = template[key], found[key]
+            for field in ['x column', 'y column']:
+                definition[field] = str(_renumber(int(definition[field]), old, new,
+                                                  filename))
+    return target
+
+
+def _summary(source):
+    """Return the analysis of every plot of a generated source, in a form that can
+    be saved as JSON."""
+
+    summaries = []
+    for number, plot in enumerate(source.plots):
+        analysis = api.analyze(plot)
+        # Peak valley plots are summarized by counts, and basic plots by a table of
+        # statistics with a row per series
+        if isinstance(analysis, dict):
+            analysis = {key: value if isinstance(value, str) else int(value)
+                        for key, value in analysis.items()}
+        elif analysis is not None:
+            analysis = analysis.to_dict(orient='index')
+        summaries.append({'plot': number + 1, 'title': plot.title,
+                          'analysis': analysis})
+    return summaries
+
+
+def process(info, template, filepath, output, dpi=100):
+    """Apply the plots of a file's section of a preset to another file, then save
+    an image of each plot and a JSON summary of their analysis to a folder named
+    after the file. Runs in a worker process, and returns the paths that were
+    written."""
+
+    target = retarget(info, template, filepath)
+    source = api.preset_source(target)
+    source.generate()
+
+    # Save everything in a folder named after the file
+    stem = os.path.splitext(source.filename)[0]
+    folder = os.path.join(output, stem)
+    os.makedirs(folder, exist_ok=True)
+
+    paths = []
+    flipbook = api.OffscreenFlipbook([source], dpi=dpi)
+    for page in range(flipbook.pages):
+        path = os.path.join(folder, f'{stem}_plot{page+1}.png')
+        flipbook.save(page, [path])
+        paths.append(path)
+
+    path = os.path.join(folder, f'{stem}_summary.json')
+    with open(path, 'w') as file:
+        json.dump(_summary(source), file, indent=2, default=str)
+    paths.append(path)
+    return paths
+
+
+class Ledger:
+    """The files that have been processed or have failed, saved as JSON so that a
+    restarted watcher doesn't process them again. Each file is recorded along with
+    its size and modification time, so a file is processed again if it changes."""
+
+    def __init__(self, path):
+        """Load the ledger if it exists."""
+
+        self.path = path
+        self.entries = {}
+        if os.path.isfile(path):
+            with open(path) as file:
+                self.entries = json.load(file)
+
+    def finished(self, filepath, stamp):
+        """Return whether the file has already been processed or has run out of
+        retries since it last changed."""
+
+        entry = self.entries.get(filepath)
+        return entry is not None and entry['stamp'] == stamp
+
+    def record(self, filepath, stamp, status, attempts, outputs=None, error=None):
+        """Record the outcome of a file and save the ledger."""
+
+        self.entries[filepath] = {
+            'stamp': stamp,
+            'status': status,
+            'attempts': attempts,
+            'outputs': outputs or [],
+            'error': error,
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        # Write to a temporary file first so that the ledger is never left half
+        # written if the watcher is stopped
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(self.entries, file, indent=2)
+        os.replace(temporary, self.path)
+
+
+class Watcher:
+    """Watches a directory for new data files and processes each one on a pool of
+    worker processes, using a file's section of a preset as the template.
+
+    The directory is polled rather than watched for events, since events aren't
+    reliable on network shares. A file is only processed once its size and
+    modification time are the same on two polls in a row, so files that are still
+    being copied are left alone. Each file is only ever queued once at a time,
+    failures are retried with an increasing delay, and every outcome is recorded
+    in the ledger."""
+
+    def __init__(self, info, template, directory, output, ledger, patterns=PATTERNS,
+                 workers=None, retries=3, delay=5, dpi=100):
+        """Store the template and start the worker processes."""
+
+        self.info = info.dict()
+        self.template = template
+        self.directory = directory
+        self.output = output
+        self.ledger = ledger
+        self.patterns = patterns
+        self.retries = retries
+        self.delay = delay
+        self.dpi = dpi
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                            initializer=mpl.use, initargs=('Agg',))
+
+        # Keep track of the stamp of each file on the previous poll, the files that
+        # are being processed, and the failures of each file since it last changed
+        self.seen = {}
+        self.running = {}
+        self.failures = {}
+
+    @property
+    def idle(self):
+        """Whether no files are being processed or waiting to be retried."""
+
+        return not self.running and not self.failures
+
+    def _stamp(self, entry):
+        """Return the size and modification time of a directory entry."""
+
+        stat = entry.stat()
+        return [stat.st_size, stat.st_mtime]
+
+    def _ready(self):
+        """Return the path and stamp of every file that should be processed now."""
+
+        ready = []
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if not entry.is_file(): continue
+            if not any(fnmatch.fnmatch(entry.name, pattern) for pattern in self.patterns):
+                continue
+            path = os.path.abspath(entry.path)
+            stamp = self._stamp(entry)
+            previous, self.seen[path] = self.seen.get(path), stamp
+
+            # Wait for the file to stop changing, and never queue it twice
+            if stamp != previous or path in self.running: continue
+            if self.ledger.finished(path, stamp): continue
+
+            # Wait for the delay after a failure, forgetting the failures of a file
+            # once it has changed
+            failure = self.failures.get(path)
+            if failure and failure['stamp'] != stamp:
+                del(self.failures[path])
+            elif failure and now < failure['retry']:
+                continue
+            ready.append((path, stamp))
+        return ready
+
+    def _collect(self):
+        """Record every file that has finished processing, scheduling a retry for
+        those that failed."""
+
+        for path, (future, stamp) in list(self.running.items()):
+            if not future.done(): continue
+            del(self.running[path])
+            failure = self.failures.get(path, {'attempts': 0})
+            attempts = failure['attempts'] + 1
+
+            error = future.exception()
+            if error is None:
+                self.failures.pop(path, None)
+                self.ledger.record(path, stamp, 'processed', attempts, future.result())
+                print(f'{path}: processed', file=sys.stderr)
+            elif attempts > self.retries:
+                self.failures.pop(path, None)
+                self.ledger.record(path, stamp, 'failed', attempts, error=str(error))
+                print(f'{path}: failed after {attempts} attempts: {error}',
+                      file=sys.stderr)
+            else:
+                # Wait twice as long before each retry
+                retry = time.time() + self.delay * 2 ** (attempts - 1)
+                self.failures[path] = {'stamp': stamp, 'attempts': attempts,
+                                       'retry': retry}
+                print(f'{path}: attempt {attempts} failed, retrying: {error}',
+                      file=sys.stderr)
+
+    def poll(self):
+        """Record the files that have finished and queue the files that are ready."""
+
+        self._collect()
+        for path, stamp in self._ready():
+            future = self.executor.submit(process, self.info, self.template, path,
+                                          self.output, self.dpi)
+            self.running[path] = (future, stamp)
+
+    def shutdown(self):
+        """Stop the worker processes, letting the files being processed finish."""
+
+        self.executor.shutdown(wait=True)
+        self._collect()
+
+
+def main(arguments=None):
+    """Watch a directory from the command line."""
+
+    parser = argparse.ArgumentParser(
+        description='Watch a directory for new data files and plot each one with '
+                    'the plots of a file in a preset, matching columns by label.')
+    parser.add_argument('preset', help='preset (.ini) file to use as the template')
+    parser.add_argument('directory', help='directory to watch')
+    parser.add_argument('-o', '--output', default='.',
+                        help='directory to write the images and summaries to')
+    parser.add_argument('--file', default=None,
+                        help='section of the preset to use (default: the first file)')
+    parser.add_argument('--pattern', action='append', dest='patterns',
+                        help='filename pattern to pick up; may be repeated '
+                             '(default: common data file extensions)')
+    parser.add_argument('--ledger', default=None,
+                        help='ledger of processed files (default: '
+                             'processed.json in the output directory)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes (default: one per core)')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='number of times to retry a file (default: 3)')
+    parser.add_argument('--interval', type=float, default=5,
+                        help='seconds between polls (default: 5)')
+    parser.add_argument('--dpi', type=int, default=100,
+                        help='resolution of the images (default: 100)')
+    parser.add_argument('--once', action='store_true',
+                        help='process the files that are there and then exit')
+    arguments = parser.parse_args(arguments)
+
+    # Make sure that nothing tries to open a window, just like the batch renderer
+    mpl.use('Agg')
+
+    # Pick the file of the preset to use as the template
+    preset = configobj.ConfigObj(arguments.preset)
+    key = arguments.file or next(iter(preset), None)
+    if key not in preset:
+        print(f'{arguments.preset} has no file named {key}', file=sys.stderr)
+        return 1
+    info = preset[key]
+
+    # Read the labels of the template's columns, which can only be matched by number
+    # if its file is gone
+    try:
+        template = labels(info)
+    except Exception as error:
+        print(f'{info["filepath"]}: unable to read the column labels, so columns '
+              f'will be matched by number: {error}', file=sys.stderr)
+        template = None
+
+    os.makedirs(arguments.output, exist_ok=True)
+    ledger = Ledger(arguments.ledger or os.path.join(arguments.output, 'processed.json'))
+    watcher = Watcher(info, template, arguments.directory, arguments.output, ledger,
+                      arguments.patterns or PATTERNS, arguments.workers,
+                      arguments.retries, arguments.interval, arguments.dpi)
+
+    # Files need to look the same on two polls before they are processed, so poll
+    # at least twice before stopping when only processing the files once
+    polls = 0
+    try:
+        while True:
+            watcher.poll()
+            polls += 1
+            if arguments.once and polls >= 2 and watcher.idle: break
+            time.sleep(arguments.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())